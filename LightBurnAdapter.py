@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 
 import argparse
+import asyncio
 import os
-import socket
 import subprocess as subp
 import sys
 from textwrap import dedent
@@ -10,9 +10,9 @@ from textwrap import dedent
 from serial import Serial
 
 from StreamLineReader import StreamLineReader
-from xtm1 import XTM1, GcodeTranslator, UnexpectedGcodeError
-
-TIMEOUT_SECONDS = 1
+from lightburn import HotFolder, LightBurnServer, receive_job
+from xtm1 import XTM1
+from xtm1_cache import TranslationCache
 
 parser = argparse.ArgumentParser(
     description=dedent('''
@@ -29,15 +29,25 @@ def positive_integer(s: str) -> int:
     if i < 0: raise ValueError()
     return i
 
+def at_least_one(s: str) -> int:
+    i = int(s)
+    if i < 1: raise ValueError()
+    return i
+
 input_args = parser.add_mutually_exclusive_group(required=True)
 input_args.add_argument('--watch', '-w', nargs=1, metavar='DIR',
     help='Watch directory DIR for new G-code files to upload to laser cutter.')
 streaming_args = input_args.add_mutually_exclusive_group(required=False)
 streaming_args.add_argument('--tcp', '-t', type=positive_integer, metavar='PORT', nargs='?', const=2323,
-    help='Listen for grbl-TCP connection from LightBurn on port PORT (default = 2323). PORT==0 will use tcp_bridge.')
+    help='Listen for grbl-TCP connections from LightBurn on port PORT (default = 2323), several at once. PORT==0 will use tcp_bridge.')
 streaming_args.add_argument('--serial', '-s', nargs=1, metavar='PORT',
     help='Open the serial port PORT. Most likely this should be one port of a virtual serial port pair like com0com or tty0tty.')
 
+parser.add_argument('--jobs', '-j', type=at_least_one, metavar='N',
+    help='Translate up to N files from the --watch directory at once (default = number of CPUs).')
+parser.add_argument('--no-raw', action='store_true',
+    help='Only keep the translated G-code of received jobs, not the G-code as sent by LightBurn.')
+
 target_device_args = parser.add_mutually_exclusive_group(required=True)
 target_device_args.add_argument('--ip',
     help='IP address of the laser cutter device.')
@@ -51,80 +61,38 @@ stream = None
 if ARGS.tcp == 0: # --tcp==0 means 'use tcp_bridge'
     tcp_process = subp.Popen('tcp_bridge/tcp_bridge', stdin=subp.PIPE, stdout=subp.PIPE)
     stream = StreamLineReader(tcp_process)
-elif ARGS.tcp: # --tcp was given with a positive port number
-    port = ARGS.tcp
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    sock.bind(('127.0.0.1', port))
-    print(f'Waiting for TCP connection on port {port}...')
-    sock.listen(1)
-    client_connection, _client_ddr = sock.accept()
-    stream = StreamLineReader(client_connection)
 elif ARGS.serial:
     serial = Serial(ARGS.serial)
     stream = StreamLineReader(serial)
-elif ARGS.watch:
-    print('Sorry, --watch is not implemeted yet.')
-    sys.exit(1)
 
-assert stream
+m1 = XTM1(ARGS.ip, cache=TranslationCache())
+
+if ARGS.watch:
+    try:
+        HotFolder(ARGS.watch[0], m1, workers=ARGS.jobs).run()
+    except KeyboardInterrupt:
+        print('\nShutting down because of keyboard interrupt.')
+    sys.exit(0)
+
 assert ARGS.ip
 
 gcode_dir = 'gcode'
 if not os.path.exists(gcode_dir):
     os.mkdir(gcode_dir)
 
-def filename(i):
-    return f'{gcode_dir}/output-{i:04}.gcode'
-
-
-m1 = XTM1(ARGS.ip)
-
-i = 0
-
 def receive_gcode_transmission():
-    global i
-    print("\nWaiting for LASER_JOB_START... Stop with Ctrl+C")
-    line: bytes = stream.readline() # Wait forever for the first line
-    stream.write_flush(b'ok\n')
-    while not b'LASER_JOB_START' in line:
-        print(f'Received G-code {line.strip()} ... skipping')
-        # TODO: Check G-code line and possibly execute on machine immediately?
-        line = stream.readline() # Wait forever for the first line
-        stream.write_flush(b'ok\n')
-
-    while os.path.exists(filename(i)) and (not os.path.isfile(filename(i))
-                                            or os.path.getsize(filename(i)) > 0):
-        i += 1 # Skip all names which exist and are either non-empty or not normal files
-    total_lines = 0
-    with open(filename(i), 'wb') as f:
-        print(f'{filename(i)}: starting')
-        while True:
-            line = stream.readline(timeout=TIMEOUT_SECONDS)
-            stream.write(b'ok\n')
-            #print(line)
-
-            if len(line) == 0:
-                break # Timeout while receiving commands, assume that file is done
-            if b'LASER_JOB_END' in line: # You can put this into "End G-code" in LightBurn, followed by a newline, to mark the end of the file.
-                break # End of transmission
-
-            total_lines += 1
-            f.write(line)
-
-    if total_lines < 4: # Filter out bogus files
-        print("Not enough lines, deleting file.")
-        os.unlink(filename(i))
-        return # On to the next file
-
-    print(f'Wrote {total_lines} lines to {filename(i)}. Now converting...')
-    translator = GcodeTranslator()
-    try:
-        translated_file = translator.translate_file(filename(i))
-    except UnexpectedGcodeError as e:
-        print(e.args[0])
+    # The job is translated while it is received, so it is ready to upload right away
+    job = receive_job(stream, gcode_dir, keep_raw=not ARGS.no_raw)
+    if job is not None:
+        handle_job(job)
+
+def handle_job(job):
+    if job.error is not None:
+        print(job.error.args[0])
         return
-    
+    print(f'Received and converted {job.lines} lines to {job.filename}.')
+    translated_file = job.filename
+
     print(f'Preparing to upload {translated_file} to laser cutter...')
     print('Please enter material thickness in millimeters (or none/auto/cancel/delete).')
     print('  "none" will not modify the Z height in the G-code.')
@@ -149,9 +117,8 @@ def receive_gcode_transmission():
                 print(f'Did not understand value: {answer}, please try again')
                 answer = '' # Repeat while loop
     if answer == 'delete':
-        print(f'Okay, deleting 2 files {filename(i)} and {translated_file}.')
-        os.unlink(filename(i))
-        os.unlink(translated_file)
+        print(f'Okay, deleting {translated_file} and the received G-code.')
+        job.discard()
     elif answer == 'cancel':
         print(f'Okay, not uploading {translated_file}.')
     else:
@@ -161,7 +128,21 @@ def receive_gcode_transmission():
         print('Press the button on the M1 when it lights blue to execute the file.')
         m1.upload_gcode_file(translated_file, material_thickness=thickness)
 
+async def serve_tcp(port):
+    server = LightBurnServer(gcode_dir, keep_raw=not ARGS.no_raw)
+    await server.start('127.0.0.1', port)
+    print(f'Waiting for TCP connections on port {port}... Stop with Ctrl+C')
+    loop = asyncio.get_running_loop()
+    while True:
+        job = await server.jobs.get()
+        # Jobs from all connections are handled one after another, handle_job() asks for input
+        await loop.run_in_executor(None, handle_job, job)
+        print(server.report())
+
 try:
+    if ARGS.tcp: # --tcp was given with a positive port number
+        asyncio.run(serve_tcp(ARGS.tcp))
+    assert stream
     while True:
         receive_gcode_transmission()
 except KeyboardInterrupt:
@@ -6,7 +6,8 @@ from socket import socket
 from time import time
 
 from serial import Serial
-from sympy import O
+
+from xtm1_metrics import metrics
 
 class FileDescriptor:
     def __init__(self, fd) -> None:
@@ -23,9 +24,19 @@ class FileDescriptor:
 
 
 class StreamLineReader:
-    """readline() with a timeout for different types of communication channel"""
+    """readline() with a timeout for different types of communication channel
+
+    Reads are adaptive: the read size doubles (up to max_read_size) while reads
+    fill it and halves (down to min_read_size) when they return much less.
+    Consumed data is only removed from the buffer once it makes up most of it.
+    """
+    min_read_size = 128
+    max_read_size = 1024 * 1024
+    compact_size = 64 * 1024 # Consumed bytes are only removed beyond this size
+
     def __init__(self, channel_object, write_channel=None):
-        self.read_size = 128
+        self.read_size = self.min_read_size
+        self._channel_type = 'fd' if type(channel_object) is int else type(channel_object).__name__ # Metrics label
 
         self._in_stream = channel_object
 
@@ -33,7 +44,7 @@ class StreamLineReader:
             channel_object.timeout = 0 # Never do blocking reads
             self._in_stream: Serial = channel_object
             self._out_stream: Serial = channel_object
-            self._read = self._serial.read
+            self._read = channel_object.read
         elif type(channel_object) is Popen:
             self._in_stream: BufferedReader = channel_object.stdout
             self._out_stream: BufferedWriter = channel_object.stdin
@@ -57,6 +68,9 @@ class StreamLineReader:
         if hasattr(self._out_stream, 'flush'):
             self.flush = self._out_stream.flush
         self._buffer = bytearray()
+        self._start = 0 # Data before this index has been consumed
+        self._scanned = 0 # No separator starts before this index (if it is > self._start)
+        self.eof = False
 
     def _read(self, length: int) -> bytes: ...
     def write(self, data: bytes) -> int: ...
@@ -67,32 +81,83 @@ class StreamLineReader:
         self.flush()
         return count
 
+    def _fill(self, timeout, min_size=0) -> bool:
+        "Wait up to timeout seconds for data and append it to the buffer. Returns False if nothing arrived."
+        readable, _w, _e = select.select([self._in_stream], [], [], timeout)
+        if not readable:
+            return False
+        data = self._read(max(self.read_size, min_size))
+        if not data:
+            self.eof = True # Readable without data means the other side closed the channel
+            return False
+        if metrics.enabled:
+            metrics.count('xtm1_stream_read_bytes_total', len(data), channel=self._channel_type)
+        if len(data) >= self.read_size:
+            self.read_size = min(self.read_size * 2, self.max_read_size)
+        elif len(data) < self.read_size // 4:
+            self.read_size = max(self.read_size // 2, self.min_read_size)
+        if self._start >= self.compact_size and self._start * 2 >= len(self._buffer):
+            del self._buffer[:self._start]
+            self._scanned -= self._start
+            self._start = 0
+        self._buffer += data
+        return True
+
+    def _consume(self, end: int) -> bytes:
+        data = bytes(self._buffer[self._start:end])
+        self._start = end
+        if self._start == len(self._buffer):
+            self._buffer.clear()
+            self._start = self._scanned = 0
+        return data
+
+    def _find(self, separator: bytes) -> int:
+        "Index of the next separator in the buffer, or -1. Remembers how far the buffer was searched."
+        index = self._buffer.find(separator, max(self._scanned, self._start))
+        if index < 0:
+            self._scanned = max(len(self._buffer) - len(separator) + 1, self._start)
+        return index
+
     def read(self, length: int, timeout=None) -> bytes:
-        if len(self._buffer) == 0: # wait for new data only if no data is buffered
-            readable, _w, _e = select.select([self._in_stream], [], [], timeout)
-            if readable:
-                self._buffer.extend(self._read(max(self.read_size, length)))
-        if len(self._buffer) > 0: # If there is buffered data, return it immediately
-            line = self._buffer[:length]
-            del self._buffer[:length]
-            return line
-        return b''
+        if self._start == len(self._buffer): # wait for new data only if no data is buffered
+            self._fill(timeout, length)
+        # If there is buffered data, return it immediately
+        return self._consume(min(self._start + length, len(self._buffer)))
 
-    
-    def readline(self, timeout=None, separator=b'\n') -> bytes: 
+    def readline(self, timeout=None, separator=b'\n') -> bytes:
         start = time()
         total_timeout = timeout
-        while separator not in self._buffer:
+        while (index := self._find(separator)) < 0:
             if timeout is not None:
                 timeout = total_timeout - (time() - start)
                 if timeout < 0:
                     return b'' # Timeout, return nothing (not even newline)
-            readable, _w, _e = select.select([self._in_stream], [], [], timeout)
-            if not readable:
+            if not self._fill(timeout):
                 return b'' # Timeout, return nothing (not even newline)
-            self._buffer.extend(self._read(self.read_size))
-        # Now we know that we have a separator
-        sep_index = self._buffer.index(separator)
-        line = bytes(self._buffer[:sep_index+1])
-        del self._buffer[:sep_index+1]
+        line = self._consume(index + len(separator))
+        if metrics.enabled:
+            metrics.count('xtm1_stream_lines_total', channel=self._channel_type)
         return line.replace(b'\r\n', b'\n') # TTYs on Linux may add carriage returns before newlines. We don't want that
+
+    def readlines(self, timeout=None, separator=b'\n') -> list:
+        """Wait like readline() for a line and return it with all further complete lines already buffered.
+
+        Returns an empty list on timeout.
+        """
+        line = self.readline(timeout, separator)
+        if not line:
+            return []
+        lines = [line]
+        while (index := self._find(separator)) >= 0:
+            lines.append(self._consume(index + len(separator)).replace(b'\r\n', b'\n'))
+        if metrics.enabled:
+            metrics.count('xtm1_stream_lines_total', len(lines) - 1, channel=self._channel_type) # The first one was counted by readline()
+        return lines
+
+    def __iter__(self):
+        "Iterate over lines until the channel is closed."
+        while True:
+            lines = self.readlines()
+            if not lines:
+                return
+            yield from lines
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Benchmarks of the hot paths with synthetic workloads, see README.md.
+
+Every case runs in a fresh process, so the peak memory (max RSS) is that of the case alone.
+Results can be stored as a baseline, and later runs are compared against it.
+"""
+import argparse
+import fnmatch
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+sys.path.insert(0, current_dir)
+import workloads
+
+DEFAULT_BASELINE = os.path.join(current_dir, 'baseline.json')
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'xtm1-bench')
+DEFAULT_SIZES = ['1164x874', '2000x1500', '4000x3000']
+DEFAULT_CHUNK_SIZES = [64, 4096, 65536]
+MEMORY_SLACK_MB = 16 # Peak memory may grow by this much in addition to the tolerance
+
+
+def translate(options, kind):
+    "GcodeTranslator.translate_file_content() of a whole job in memory."
+    from xtm1 import GcodeTranslator
+    with open(workloads.job_file(kind, options['lines'], options['data_dir']), 'rb') as f:
+        data = f.read()
+    translator = GcodeTranslator()
+    return (lambda: translator.translate_file_content(data)), data.count(b'\n'), len(data)
+
+
+def translate_stream(options, kind):
+    "GcodeTranslator.translate_stream() from the file to /dev/null, with constant memory."
+    from xtm1 import GcodeTranslator
+    filename = workloads.job_file(kind, options['lines'], options['data_dir'])
+    def work():
+        with open(filename, 'rb') as f, open(os.devnull, 'wb') as out:
+            GcodeTranslator().translate_stream(f, out)
+    with open(filename, 'rb') as f:
+        lines = sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1024 * 1024), b''))
+    return work, lines, os.path.getsize(filename)
+
+
+def frame(options, kind):
+    "GcodeFramer.calculate_frame_file()"
+    from gcode import GcodeFramer
+    filename = workloads.job_file(kind, options['lines'], options['data_dir'])
+    with open(filename, 'rb') as f:
+        lines = sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1024 * 1024), b''))
+    return (lambda: GcodeFramer().calculate_frame_file(filename)), lines, os.path.getsize(filename)
+
+
+def readline(options, channel, chunk_size):
+    "StreamLineReader.readline() of a raster job that another thread writes into a pipe or socket in pieces of chunk_size."
+    from StreamLineReader import StreamLineReader
+    with open(workloads.job_file('raster', options['lines'], options['data_dir']), 'rb') as f:
+        data = f.read(options['stream_bytes'])
+    data = data[:data.rfind(b'\n') + 1]
+    def work():
+        reader_end, thread = workloads.feed_channel(channel, data, chunk_size)
+        reader = StreamLineReader(reader_end)
+        try:
+            while reader.readline(timeout=10) or not reader.eof:
+                pass
+        finally:
+            thread.join()
+            reader_end.close() if channel == 'socket' else os.close(reader_end)
+    return work, data.count(b'\n'), len(data)
+
+
+def undistort(options, width, height):
+    "xtm1_camera.undistort() of a full size camera image, with the remap maps already computed."
+    import xtm1_camera
+    from fake_m1 import calibration_points
+    from PIL import Image
+    xtm1_camera.REMAP_CACHE_DIR = None # Neither use nor fill the user's cache
+    points = calibration_points()
+    image = Image.fromarray(workloads.camera_image())
+    xtm1_camera.get_remap_maps(points, (width, height))
+    return (lambda: xtm1_camera.undistort(image, points, (width, height))), 1, width * height * 3
+
+
+def client(options, kind):
+    "XTM1 requests to a FakeM1 in the same process: status polls, uploads of a raster job or camera images."
+    from fake_m1 import FakeM1
+    fake = FakeM1(latency=options['latency'], bandwidth=options['bandwidth'], job_seconds=0).start()
+    m1 = fake.client()
+    if kind == 'status':
+        requests = 200
+        return (lambda: [m1.get_status() for _ in range(requests)]), requests, 0
+    if kind == 'upload':
+        filename = workloads.job_file('raster', options['stream_lines'], options['data_dir'])
+        def work():
+            if m1.upload_gcode_file(filename) is False:
+                raise RuntimeError('The fake M1 was not idle')
+        with open(filename, 'rb') as f:
+            lines = sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1024 * 1024), b''))
+        return work, lines, os.path.getsize(filename)
+    frames = 10
+    size = len(m1.get_camera_image())
+    return (lambda: [m1.get_camera_image() for _ in range(frames)]), frames, frames * size
+
+
+def case_names(options) -> list:
+    names = []
+    for lines in options['line_counts']:
+        for kind in ('raster', 'vector'):
+            names += [f'translate/{kind}-{lines}', f'translate-stream/{kind}-{lines}', f'frame/{kind}-{lines}']
+    for channel in ('pipe', 'socket'):
+        names += [f'readline/{channel}-{chunk_size}' for chunk_size in options['chunk_sizes']]
+    names += [f'undistort/{size}' for size in options['sizes']]
+    names += ['client/status', 'client/upload', 'client/camera']
+    return names
+
+
+def setup_case(name: str, options: dict):
+    "Returns the work function, the number of units (lines or frames) and bytes that one call processes, and the unit."
+    function, argument = name.split('/')
+    if function == 'readline':
+        channel, chunk_size = argument.split('-')
+        return readline(dict(options, lines=options['stream_lines']), channel, int(chunk_size)) + ('lines',)
+    if function == 'client':
+        return client(options, argument) + ({'status': 'requests', 'upload': 'lines', 'camera': 'frames'}[argument],)
+    if function == 'undistort':
+        width, height = map(int, argument.split('x'))
+        return undistort(options, width, height) + ('frames',)
+    kind, lines = argument.split('-')
+    setup = {'translate': translate, 'translate-stream': translate_stream, 'frame': frame}[function]
+    return setup(dict(options, lines=int(lines)), kind) + ('lines',)
+
+
+def max_rss_mb() -> float:
+    "Peak resident memory of this process so far."
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024) # bytes on macOS, KiB on Linux
+
+
+def run_case(name: str, options: dict) -> dict:
+    "Run a case repeat times and return the best throughput and the peak memory."
+    work, units, size, unit = setup_case(name, options)
+    setup_rss = max_rss_mb()
+    seconds = []
+    for _ in range(options['repeat']):
+        start = time.perf_counter()
+        work()
+        seconds.append(time.perf_counter() - start)
+    best = min(seconds)
+    peak_rss = max_rss_mb()
+    return {
+        'unit': unit,
+        'units': units,
+        'bytes': size,
+        'seconds': best,
+        'throughput': units / best,
+        'mb_per_s': size / best / 1e6,
+        'peak_rss_mb': peak_rss,
+        'work_rss_mb': peak_rss - setup_rss, # Growth of the peak beyond what the setup (reading inputs) needed
+    }
+
+
+def run_isolated(name: str, options: dict) -> dict:
+    "run_case() in a new process"
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run_case, (name, options))
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    "Descriptions of the regressions of results against the baseline: slower or using more memory than tolerance allows."
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result['throughput'] < reference['throughput'] * (1 - tolerance):
+            regressions.append(f'{name}: {result["throughput"]:.4g} {result["unit"]}/s, '
+                               f'baseline {reference["throughput"]:.4g} ({result["throughput"] / reference["throughput"] - 1:+.0%})')
+        if result['peak_rss_mb'] > reference['peak_rss_mb'] * (1 + tolerance) + MEMORY_SLACK_MB:
+            regressions.append(f'{name}: peak memory {result["peak_rss_mb"]:.0f} MB, baseline {reference["peak_rss_mb"]:.0f} MB')
+    return regressions
+
+
+def format_result(name: str, result: dict, reference=None) -> str:
+    line = (f'{name:32} {result["throughput"]:12.4g} {result["unit"] + "/s":9} {result["mb_per_s"]:9.1f} MB/s '
+            f'{result["peak_rss_mb"]:7.0f} MB peak {result["work_rss_mb"]:+7.0f} MB')
+    if reference is not None:
+        line += f'  {result["throughput"] / reference["throughput"] - 1:+6.0%} vs baseline'
+    return line
+
+
+def parse_count(text: str) -> int:
+    "1000, 10K, 1M or 50M"
+    factor = {'K': 1000, 'M': 1000 ** 2}.get(text[-1:].upper(), 1)
+    return int(float(text[:-1] if factor > 1 else text) * factor)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('cases', nargs='*', help='Patterns of the cases to run, e.g. "translate/*" (default all)')
+    parser.add_argument('--lines', default='1M', help='Comma separated sizes of the G-code jobs, e.g. 1M,10M,50M')
+    parser.add_argument('--stream-lines', default='1M', help='Size of the job that is read through pipes and sockets')
+    parser.add_argument('--stream-bytes', type=int, default=16 * 1024 * 1024, help='At most this much of it is streamed')
+    parser.add_argument('--chunk-sizes', default=','.join(map(str, DEFAULT_CHUNK_SIZES)), help='Sizes of the writes into pipes and sockets')
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help='Output sizes of undistort')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds that the fake M1 of the client cases waits before replies')
+    parser.add_argument('--bandwidth', type=parse_count, help='Bytes per second of the fake M1, e.g. 1M')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case, the fastest counts')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='Where generated jobs are kept')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown and memory growth')
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--list', action='store_true', help='Only list the cases')
+    args = parser.parse_args(argv)
+
+    options = {
+        'line_counts': [parse_count(count) for count in args.lines.split(',')],
+        'stream_lines': parse_count(args.stream_lines),
+        'stream_bytes': args.stream_bytes,
+        'chunk_sizes': [parse_count(size) for size in args.chunk_sizes.split(',')],
+        'sizes': args.sizes.split(','),
+        'latency': args.latency,
+        'bandwidth': args.bandwidth,
+        'repeat': args.repeat,
+        'data_dir': args.data_dir,
+    }
+    names = [name for name in case_names(options)
+             if not args.cases or any(fnmatch.fnmatch(name, pattern) for pattern in args.cases)]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    print(f'Python {platform.python_version()} on {platform.machine()}, {os.cpu_count()} CPUs')
+    results = {}
+    for name in names:
+        results[name] = run_isolated(name, options)
+        print(format_result(name, results[name], baseline.get(name)), flush=True)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'results': results}, f, indent=1)
+    if args.save_baseline:
+        if os.path.exists(args.baseline): # Keep the cases that were not run this time
+            with open(args.baseline) as f:
+                results = dict(json.load(f)['results'], **results)
+        with open(args.baseline, 'w') as f:
+            json.dump({'machine': platform.platform(), 'python': platform.python_version(), 'results': results}, f, indent=1)
+        print(f'Saved baseline {args.baseline}')
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Synthetic, reproducible inputs for the benchmarks.
+
+Jobs are written to files in blocks, so the 50M line sizes do not need the whole job in memory.
+The same arguments always give the same bytes.
+"""
+import os
+import socket
+import threading
+
+import numpy as np
+
+RASTER_HEADER = b'''; LightBurn 1.2.01
+; Marlin device profile, absolute coords
+; Synthetic raster job
+G21
+G90
+; Scan @ 60 mm/sec, 50% power
+M8
+M05
+G0 X203.12 Y164.35 F0
+G0 Z0
+; Layer C00 Pass 1 of 1
+G91
+G1 X-1.5 F3600 I S0
+'''
+RASTER_FOOTER = b'''G90
+G0 Z0
+M9
+M05
+G90
+; return to user-defined finish pos
+G0 X0 Y0 F0
+'''
+VECTOR_HEADER = b'''; LightBurn 1.2.01
+; Marlin device profile, absolute coords
+; Synthetic vector job
+G21
+G90
+M8
+M05
+G0 X0 Y0 F0
+'''
+VECTOR_FOOTER = b'''M9
+M05
+G0 X0 Y0 F0
+'''
+BLOCK_ROWS = 2000
+
+
+def write_raster_job(filename: str, lines: int, seed=0, width=40.0, power=500) -> None:
+    """A G91 scan like lasse.gcode with about the given number of lines.
+
+    Every row goes back and forth over width mm: overscan, alternating burning and
+    skipped segments of random length, overscan and a step to the next row.
+    """
+    body_lines = max(lines - RASTER_HEADER.count(b'\n') - RASTER_FOOTER.count(b'\n'), 0)
+    with open(filename, 'wb') as f:
+        f.write(RASTER_HEADER)
+        written = 0
+        block = 0
+        while written < body_lines:
+            rng = np.random.default_rng((seed, block))
+            segments = rng.integers(2, 40, BLOCK_ROWS)
+            out = []
+            for row, count in enumerate(segments.tolist()):
+                direction = -1 if (block * BLOCK_ROWS + row) % 2 else 1
+                lengths = rng.exponential(1.0, count)
+                lengths *= width / lengths.sum()
+                out.append(b'G1 X%.3f I S0' % (1.5 * direction))
+                out += [b'G1 X%.3f I S%d' % (length * direction, power if i % 2 == 0 else 0)
+                        for i, length in enumerate(lengths.tolist())]
+                out.append(b'G1 X%.3f I S0' % (1.5 * direction))
+                out.append(b'G1 X%.3fY-0.1 I S0' % (-0.597 * direction))
+            out = out[:body_lines - written]
+            f.write(b'\n'.join(out) + b'\n')
+            written += len(out)
+            block += 1
+        f.write(RASTER_FOOTER)
+
+
+def write_vector_job(filename: str, lines: int, seed=0, size=300.0, shapes_per_layer=1000) -> None:
+    """Absolute G0/G1 paths with about the given number of lines: closed polygons and open polylines, in layers."""
+    body_lines = max(lines - VECTOR_HEADER.count(b'\n') - VECTOR_FOOTER.count(b'\n'), 0)
+    with open(filename, 'wb') as f:
+        f.write(VECTOR_HEADER)
+        written = 0
+        shape = 0
+        block = 0
+        while written < body_lines:
+            rng = np.random.default_rng((seed, block))
+            out = []
+            for _ in range(BLOCK_ROWS):
+                if shape % shapes_per_layer == 0:
+                    out.append(b'; Layer C%02d' % (shape // shapes_per_layer % 100))
+                x, y = rng.uniform(0, size, 2)
+                corners = int(rng.integers(3, 64))
+                radius = rng.uniform(0.5, 10)
+                angles = np.linspace(0, 2 * np.pi, corners + 1)
+                if shape % 3 == 0: # Open polyline
+                    angles = angles[:corners // 2 + 2]
+                points = np.stack((x + radius * np.cos(angles), y + radius * np.sin(angles)), axis=1).tolist()
+                out.append(b'G0 X%.3f Y%.3f' % tuple(points[0]))
+                out.append(b'G1 X%.3f Y%.3f S800 F1200' % tuple(points[1]))
+                out += [b'G1 X%.3f Y%.3f' % tuple(point) for point in points[2:]]
+                shape += 1
+            out = out[:body_lines - written]
+            f.write(b'\n'.join(out) + b'\n')
+            written += len(out)
+            block += 1
+        f.write(VECTOR_FOOTER)
+
+
+def job_file(kind: str, lines: int, directory: str, seed=0) -> str:
+    "Name of a generated job, which is written once and then reused."
+    filename = os.path.join(directory, f'{kind}-{lines}-{seed}.gcode')
+    if not os.path.exists(filename):
+        os.makedirs(directory, exist_ok=True)
+        write = {'raster': write_raster_job, 'vector': write_vector_job}[kind]
+        write(filename + '.tmp', lines, seed)
+        os.replace(filename + '.tmp', filename)
+    return filename
+
+
+def camera_image(width=4000, height=3000, seed=0) -> np.ndarray:
+    "An RGB image with gradients and noise."
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[..., 0] = x
+    image[..., 1] = y
+    image[..., 2] = rng.integers(0, 256, (height, width), dtype=np.uint8)
+    return image
+
+
+def feed_channel(kind: str, data: bytes, chunk_size: int):
+    """Start a thread that writes data in pieces of chunk_size bytes into a pipe or socket and closes it.
+
+    Returns the reading end (a file descriptor or socket, as StreamLineReader takes them) and the thread.
+    """
+    if kind == 'pipe':
+        reader, writer = os.pipe()
+        write, close = (lambda chunk: os.write(writer, chunk)), (lambda: os.close(writer))
+    elif kind == 'socket':
+        reader, writer = socket.socketpair()
+        write, close = writer.send, writer.close
+    else:
+        raise ValueError(f'Unknown channel {kind}')
+
+    def run():
+        view = memoryview(data)
+        try:
+            for start in range(0, len(view), chunk_size):
+                chunk = view[start:start + chunk_size]
+                while chunk:
+                    chunk = chunk[write(chunk):]
+        finally:
+            close()
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return reader, thread
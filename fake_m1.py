@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""A local stand-in for the HTTP interface of the M1, for testing and benchmarking clients without the machine.
+
+./fake_m1.py --latency 0.02 --bandwidth 1M serves on the ports of the real machine (8080 and 8329),
+so e.g. XTM1_IP=127.0.0.1 ./m1control.py --status talks to it.
+"""
+import argparse
+import io
+import json
+import random
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from xtm1 import IDLE_STATES
+
+# States of a job after its upload. P_IDLE, P_WORKING and P_FINISH are reported by the real
+# machine; the machine waits for its button in between, which the fake reports as P_READY.
+READY, WORKING, FINISHED, IDLE, SLEEPING = 'P_READY', 'P_WORKING', 'P_FINISH', 'P_IDLE', 'P_SLEEP'
+TRANSFER_CHUNK_SIZE = 64 * 1024
+
+
+class FakeM1:
+    """Serves the control (PORT) and camera (CAMERA_PORT) endpoints of an M1 in background threads.
+
+    An upload moves the state to P_READY; after start_delay seconds (like pressing the button,
+    or when press_button() is called if start_delay is None) the job runs for job_seconds,
+    then the state is P_FINISH for finish_seconds and P_IDLE again. With sleep_seconds,
+    the machine reports P_SLEEP after being idle that long.
+
+    Every reply is delayed by latency plus up to jitter seconds, and bodies are sent and received
+    with at most bandwidth bytes per second (per connection). Requests fail with HTTP 500 with
+    probability failure_rate, and fail_next() schedules failures for specific endpoints.
+    """
+    def __init__(self, host='127.0.0.1', port=0, camera_port=0, latency=0.0, jitter=0.0, bandwidth=None,
+                 job_seconds=1.0, start_delay=0.0, finish_seconds=0.0, sleep_seconds=None,
+                 failure_rate=0.0, seed=None, thickness=3.0, camera_size=(4000, 3000)) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.job_seconds = job_seconds
+        self.start_delay = start_delay
+        self.finish_seconds = finish_seconds
+        self.sleep_seconds = sleep_seconds
+        self.failure_rate = failure_rate
+        self.thickness = thickness
+        self.camera_size = camera_size
+        self.files = {'points.json': json.dumps(calibration_points(*camera_size)).encode('utf-8')}
+        self.tool_type = None
+        self.commands = [] # G-code of /cnc/cmd requests
+        self.uploads = [] # Uploaded G-code
+        self.requests = {} # (method, endpoint) -> count
+        self._random = random.Random(seed)
+        self._failures = [] # (endpoint, status) for fail_next()
+        self._lock = threading.Lock()
+        self._camera_image = None
+        self._state = IDLE
+        self._since = time.monotonic() # Of the current state, or of the upload
+        self._servers = [ThreadingHTTPServer((host, port), type('Handler', (_Handler,), {'m1': self, 'camera': False})),
+                         ThreadingHTTPServer((host, camera_port), type('CameraHandler', (_Handler,), {'m1': self, 'camera': True}))]
+        for server in self._servers:
+            server.daemon_threads = True
+        self.IP = host
+        self.PORT = self._servers[0].server_address[1]
+        self.CAMERA_PORT = self._servers[1].server_address[1]
+
+    def start(self) -> 'FakeM1':
+        for server in self._servers:
+            threading.Thread(target=server.serve_forever, args=(0.05,), name=f'fake-m1-{server.server_address[1]}', daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self) -> 'FakeM1':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def client(self, **kwargs):
+        "An XTM1 that talks to this fake."
+        from xtm1 import XTM1
+        m1 = XTM1(self.IP, **kwargs)
+        m1.PORT, m1.CAMERA_PORT = self.PORT, self.CAMERA_PORT
+        return m1
+
+    @property
+    def state(self) -> str:
+        "The status, advanced by the time that passed since the upload."
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._since
+            if self._state == READY and self.start_delay is not None and elapsed >= self.start_delay:
+                self._set_state(WORKING, self._since + self.start_delay)
+            elif self._state == WORKING and elapsed >= self.job_seconds:
+                self._set_state(FINISHED, self._since + self.job_seconds)
+            elif self._state == FINISHED and elapsed >= self.finish_seconds:
+                self._set_state(IDLE, self._since + self.finish_seconds)
+            elif self._state == IDLE and self.sleep_seconds is not None and elapsed >= self.sleep_seconds:
+                self._set_state(SLEEPING, now)
+            else:
+                return self._state
+        return self.state # Several transitions may be due
+
+    @state.setter
+    def state(self, state: str) -> None:
+        with self._lock:
+            self._set_state(state, time.monotonic())
+
+    def _set_state(self, state: str, since: float) -> None:
+        self._state = state
+        self._since = since
+
+    def press_button(self) -> None:
+        "Start an uploaded job that waits in P_READY."
+        with self._lock:
+            if self._state == READY:
+                self._set_state(WORKING, time.monotonic())
+
+    def fail_next(self, count=1, endpoint=None, status=500) -> None:
+        """Let the next count requests (to endpoint, e.g. '/cnc/status', if given) fail.
+
+        status None closes the connection without a reply.
+        """
+        with self._lock:
+            self._failures += [(endpoint, status)] * count
+
+    def camera_image(self) -> bytes:
+        "A JPEG with a grid pattern of camera_size, made on first use."
+        if self._camera_image is None:
+            from PIL import Image, ImageDraw
+            image = Image.new('RGB', self.camera_size, (90, 80, 70))
+            draw = ImageDraw.Draw(image)
+            width, height = self.camera_size
+            for x in range(0, width, 100):
+                draw.line((x, 0, x, height), fill=(200, 200, 200), width=3)
+            for y in range(0, height, 100):
+                draw.line((0, y, width, y), fill=(200, 200, 200), width=3)
+            data = io.BytesIO()
+            image.save(data, 'JPEG', quality=85)
+            self._camera_image = data.getvalue()
+        return self._camera_image
+
+    def _failure(self, endpoint: str):
+        "The injected failure for a request: False for none, otherwise the status (None to drop the connection)."
+        with self._lock:
+            for i, (failing, status) in enumerate(self._failures):
+                if failing in (None, endpoint):
+                    del self._failures[i]
+                    return status
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                return 500
+        return False
+
+    def _delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _upload(self, body: bytes) -> tuple:
+        try:
+            gcode = zipfile.ZipFile(io.BytesIO(body)).read('gcodes.txt')
+        except (zipfile.BadZipFile, KeyError):
+            return 400, b'invalid upload'
+        self.state # Advance the state to now
+        with self._lock:
+            if self._state not in IDLE_STATES:
+                return 503, b'busy'
+            self.uploads.append(gcode)
+            self._set_state(READY, time.monotonic())
+        return 200, b'ok'
+
+    def handle(self, method: str, path: str, query: dict, body: bytes, camera=False) -> tuple:
+        "Reply to a request to the control port (or the camera port if camera is set) as (HTTP status, body)."
+        if camera:
+            if method == 'GET' and path == '/snap':
+                return 200, self.camera_image()
+            if method == 'GET' and path == '/camera' and 'focus' in query:
+                return 200, json.dumps({'measure': self.thickness}).encode('utf-8')
+            return 404, b'not found'
+        if method == 'GET' and path == '/cnc/status':
+            return 200, json.dumps({'STATUS': self.state}).encode('utf-8')
+        if method == 'GET' and path == '/cnc/cmd':
+            with self._lock:
+                self.commands.append(query.get('cmd', ''))
+            return 200, b'ok'
+        if path == '/cnc/data' and query.get('action') == 'stop':
+            self.state = IDLE
+            return 200, b'ok'
+        if method == 'POST' and path == '/cnc/data' and query.get('action') == 'upload':
+            return self._upload(body)
+        if method == 'POST' and path == '/setprintToolType':
+            self.tool_type = query.get('type')
+            return 200, b'ok'
+        if method == 'GET' and path == '/file' and query.get('action') == 'download':
+            data = self.files.get(query.get('filename'))
+            return (200, data) if data is not None else (404, b'not found')
+        return 404, b'not found'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # Keep-alive, like the real machine
+    disable_nagle_algorithm = True # Headers and body are written separately, which would otherwise wait for delayed ACKs
+    m1: FakeM1 = None
+    camera = False # Whether this serves the camera port
+
+    def do_GET(self):
+        self._serve('GET')
+
+    def do_POST(self):
+        self._serve('POST')
+
+    def _serve(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        endpoint = url.path + (f'?action={query["action"]}' if 'action' in query else '')
+        started = time.monotonic()
+        body = self._read_body()
+        with self.m1._lock:
+            key = (method, endpoint)
+            self.m1.requests[key] = self.m1.requests.get(key, 0) + 1
+        failure = self.m1._failure(endpoint)
+        delay = self.m1._delay() - (time.monotonic() - started)
+        if delay > 0:
+            time.sleep(delay)
+        if failure is None:
+            self.close_connection = True
+            return
+        status, reply = (failure, b'injected failure') if failure else self.m1.handle(method, url.path, query, body, self.camera)
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self._throttled(reply, self.wfile.write)
+
+    def _read_body(self) -> bytes:
+        parts = []
+        received = 0
+        started = time.monotonic()
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                parts.append(self.rfile.read(size))
+                self.rfile.readline()
+                received += size
+                self._wait_for_bandwidth(received, started)
+        else:
+            remaining = int(self.headers.get('Content-Length', 0))
+            while remaining > 0:
+                part = self.rfile.read(min(remaining, TRANSFER_CHUNK_SIZE))
+                if not part:
+                    break
+                parts.append(part)
+                remaining -= len(part)
+                received += len(part)
+                self._wait_for_bandwidth(received, started)
+        return b''.join(parts)
+
+    def _throttled(self, data: bytes, write) -> None:
+        started = time.monotonic()
+        for start in range(0, len(data), TRANSFER_CHUNK_SIZE):
+            write(data[start:start + TRANSFER_CHUNK_SIZE])
+            self._wait_for_bandwidth(min(start + TRANSFER_CHUNK_SIZE, len(data)), started)
+
+    def _wait_for_bandwidth(self, transferred: int, started: float) -> None:
+        if self.m1.bandwidth:
+            delay = started + transferred / self.m1.bandwidth - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def log_message(self, *args):
+        pass
+
+
+def calibration_points(width=4000, height=3000, bend=0.04) -> list:
+    "A 41x31 grid of calibration points (see xtm1_camera) over the full image, with barrel distortion like a wide angle lens."
+    points = []
+    for r in range(31):
+        row = []
+        for c in range(41):
+            u, v = c / 20 - 1, r / 15 - 1
+            scale = 1 - bend * (u * u + v * v)
+            row.append({'x': (u * scale + 1) / 2 * (width - 1), 'y': (v * scale + 1) / 2 * (height - 1)})
+        points.append(row)
+    return points
+
+
+def parse_size(text: str) -> int:
+    "Bytes, with an optional K or M suffix"
+    factor = {'K': 1024, 'M': 1024 ** 2}.get(text[-1:].upper(), 1)
+    return int(float(text[:-1] if factor > 1 else text) * factor)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--camera-port', type=int, default=8329)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds before each reply')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random additional latency, up to this many seconds')
+    parser.add_argument('--bandwidth', type=parse_size, help='Bytes per second, e.g. 500K')
+    parser.add_argument('--job-seconds', type=float, default=10.0)
+    parser.add_argument('--start-delay', type=float, default=2.0, help='Seconds until the button is "pressed" after an upload')
+    parser.add_argument('--sleep-seconds', type=float, help='Report P_SLEEP after being idle this long')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Probability of HTTP 500 replies')
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    fake = FakeM1(args.host, args.port, args.camera_port, args.latency, args.jitter, args.bandwidth,
+                  job_seconds=args.job_seconds, start_delay=args.start_delay, sleep_seconds=args.sleep_seconds,
+                  failure_rate=args.failure_rate, seed=args.seed)
+    print(f'Fake M1 on {args.host}:{fake.PORT} (camera {fake.CAMERA_PORT})... Stop with Ctrl+C')
+    fake.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f'\nRequests: {fake.requests}')
+        fake.stop()
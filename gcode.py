@@ -3,6 +3,10 @@ import math
 import re
 from textwrap import dedent
 
+import numpy as np
+
+from gcode_moves import MoveTable, absolute_positions, forward_fill
+
 class GcodeFramer():
     'Analyzes G-code files to determine the area in which the laser is active.'
     def __init__(self) -> None:
@@ -67,7 +71,7 @@ class GcodeFramer():
             return 
         self.current_command = code.strip().split(maxsplit=1)[0]
         if self.current_command in self.disallowed_gcodes:
-            raise RuntimeError('Cannot handle G-code ' + str(self.current_comman.strip()))
+            raise RuntimeError('Cannot handle G-code ' + str(self.current_command.strip()))
         if self.current_command in self.allowed_gcodes:
             if b'S' in code:
                 match = self.S_regex.search(code)
@@ -90,14 +94,51 @@ class GcodeFramer():
                     self.handle_global_gcode(match)
 
     def calculate_frame(self, gcode: bytes):
-        for line in gcode.split(b'\n'):
-            self.process_line(line)
+        self.calculate_frame_table(MoveTable.from_gcode(gcode, np.float64))
         print(self.Xminmax, self.Yminmax)
 
     def calculate_frame_file(self, filename: str):
-        with open(filename, 'rb') as f:
-            for line in f.readlines():
-                self.process_line(line)
+        self.calculate_frame_table(MoveTable.from_file(filename, np.float64))
+        return self.frame_gcode()
+
+    def calculate_frame_table(self, table: MoveTable) -> None:
+        """Vectorized version of process_line() for all rows of a parsed job.
+
+        Positions of relative moves are resolved with cumulative sums, and the bounds are
+        the extremes of all cutting moves: their end points and the points where they start.
+        """
+        unsupported = table.is_code(2, 3)
+        if unsupported.any():
+            raise RuntimeError(f'Cannot handle G-code G{table.code[unsupported][0]}')
+        # Rows before the first G90/G91 use the current mode
+        is_mode = table.is_code(90, 91)
+        relative = np.where(np.maximum.accumulate(is_mode), table.relative, self.is_relative_mode)
+        moves = table.is_code(0, 1)
+        relative = relative[moves]
+        X = absolute_positions(table.X[moves], relative, self.X)
+        Y = absolute_positions(table.Y[moves], relative, self.Y)
+        S = forward_fill(table.S[moves], self.S)
+        is_cutting = (table.code[moves] == 1) & (S > 0)
+        was_cutting = np.concatenate(([self.is_cutting], is_cutting[:-1]))
+        starts_cutting = is_cutting & ~was_cutting
+        X_before = np.concatenate(([self.X], X[:-1]))
+        Y_before = np.concatenate(([self.Y], Y[:-1]))
+
+        cut_X = np.concatenate((X[is_cutting], X_before[starts_cutting]))
+        cut_Y = np.concatenate((Y[is_cutting], Y_before[starts_cutting]))
+        if len(cut_X) > 0:
+            self.update_X(float(cut_X.min()))
+            self.update_X(float(cut_X.max()))
+            self.update_Y(float(cut_Y.min()))
+            self.update_Y(float(cut_Y.max()))
+        if len(X) > 0:
+            self.X, self.Y, self.S = float(X[-1]), float(Y[-1]), float(S[-1])
+            self.is_cutting = bool(is_cutting[-1])
+            self.starts_cutting = bool(starts_cutting[-1])
+        if is_mode.any():
+            self.is_relative_mode = bool(table.code[is_mode][-1] == 91)
+
+    def frame_gcode(self) -> bytes:
         Xmin, Xmax = self.Xminmax
         Ymin, Ymax = self.Yminmax
         return dedent(f'''
@@ -0,0 +1,185 @@
+import re
+
+import numpy as np
+
+from gcode_moves import MoveTable, absolute_positions, forward_fill
+
+_layer_regex = re.compile(rb'^[ \t]*;[ \t]*(Layer\b[^\r\n]*)', re.MULTILINE)
+
+
+class KinematicModel:
+    """Machine parameters for estimating how long moves take.
+
+    Feed rates are in mm/min like in G-code, acceleration in mm/s². Each move accelerates
+    and decelerates with constant acceleration, and corners are passed with the speed that
+    the junction deviation (in mm) allows, like the Marlin/Grbl planner does. An acceleration
+    of None means that moves run at their feed rate from start to end.
+
+    The defaults are guesses for the M1 and should be calibrated against real jobs.
+    """
+    def __init__(self, acceleration=2000.0, junction_deviation=0.05, default_feed_rate=9600.0,
+                 zero_feed_rate=9600.0, rapid_feed_rate=None, max_feed_rate=None, dwell_unit=1.0) -> None:
+        self.acceleration = acceleration
+        self.junction_deviation = junction_deviation
+        self.default_feed_rate = default_feed_rate # Of G0 and G1, set by GcodeTranslator.START_GCODE
+        self.zero_feed_rate = zero_feed_rate # GcodeTranslator replaces F0 by F9600
+        self.rapid_feed_rate = rapid_feed_rate # Feed rate of all G0 moves, if the machine ignores their F
+        self.max_feed_rate = max_feed_rate
+        # G4 P is in seconds for the M1 (the translator pauses with P0.1), use 0.001 for Marlin's milliseconds
+        self.dwell_unit = dwell_unit
+
+    def __repr__(self) -> str:
+        return (f'KinematicModel(acceleration={self.acceleration!r}, junction_deviation={self.junction_deviation!r}, '
+                f'default_feed_rate={self.default_feed_rate!r}, zero_feed_rate={self.zero_feed_rate!r}, '
+                f'rapid_feed_rate={self.rapid_feed_rate!r}, max_feed_rate={self.max_feed_rate!r}, '
+                f'dwell_unit={self.dwell_unit!r})')
+
+
+class TimeEstimate:
+    "Estimated runtime of a job, in total and per layer."
+    def __init__(self, total_ms: float, layers: list, moves: int, distance: float) -> None:
+        self.total_ms = total_ms
+        self.layers = layers # (name, milliseconds), in job order. Rows before the first layer comment are 'start'.
+        self.moves = moves
+        self.distance = distance # mm
+
+    def __str__(self) -> str:
+        lines = [f'{name}: {format_duration(ms)}' for name, ms in self.layers]
+        lines.append(f'Total: {format_duration(self.total_ms)} for {self.moves} moves, {self.distance / 1000:.2f} m')
+        return '\n'.join(lines)
+
+
+def format_duration(ms: float) -> str:
+    seconds = round(ms / 1000)
+    return f'{seconds // 3600}:{seconds // 60 % 60:02}:{seconds % 60:02}'
+
+
+def layer_offsets(gcode) -> tuple:
+    "Byte offsets and names of LightBurn's '; Layer ...' comments."
+    matches = list(_layer_regex.finditer(gcode))
+    offsets = np.array([match.start() for match in matches], dtype=np.int64)
+    return offsets, [match.group(1).decode('utf-8', 'replace').strip() for match in matches]
+
+
+class JobEstimator:
+    """Accumulates the estimate of a job that is parsed in consecutive pieces, see MoveTable.iter_file().
+
+    Each table continues at the position and feed rates where the previous one ended. Like the M1,
+    G0 and G1 have separate modal feed rates.
+    The machine is assumed to stop between the pieces, which adds a little time.
+    """
+    def __init__(self, model: KinematicModel = None) -> None:
+        self.model = model or KinematicModel()
+        self.names = [] # Layer names, the times of rows before the first one go to 'start'
+        self.per_layer = np.zeros(1) # Seconds
+        self.moves = 0
+        self.distance = 0.0
+        self.position = np.zeros(3)
+        self.feeds = [self.model.default_feed_rate] * 2 # Modal feed rates of G0 and G1
+
+    def add(self, table: MoveTable, layers=None) -> np.ndarray:
+        """Add the rows of a table and return their times in seconds.
+
+        layers are (offsets, names) of the layer comments within the data of the table, see layer_offsets().
+        """
+        offsets, names = layers if layers is not None else (np.empty(0, dtype=np.int64), [])
+        times = self.move_times(table)
+        layer = len(self.names) + np.searchsorted(offsets, table.offset, side='right')
+        self.names += names
+        self.per_layer = np.concatenate((self.per_layer, np.zeros(len(names))))
+        self.per_layer += np.bincount(layer, weights=times, minlength=len(self.per_layer))
+        return times
+
+    def result(self) -> TimeEstimate:
+        layers = [(name, float(seconds * 1000)) for name, seconds in zip(self.names, self.per_layer[1:])]
+        if self.per_layer[0] > 0 or not self.names:
+            layers.insert(0, ('start', float(self.per_layer[0] * 1000)))
+        return TimeEstimate(float(self.per_layer.sum() * 1000), layers, self.moves, self.distance)
+
+    def move_times(self, table: MoveTable) -> np.ndarray:
+        """Estimated seconds spent on each row of the table: moves, dwells and 0 for everything else.
+
+        The planner is vectorized: the speed at each junction is limited by the feed rates
+        and the corner angle, then by how much the machine can accelerate before (forward pass)
+        and decelerate after it (backward pass). Both passes are min-plus recurrences on the
+        squared speeds, which minimum.accumulate solves exactly. Moves are assumed to stop at
+        G4 dwells and at the start and end of the table.
+        """
+        model = self.model
+        times = np.zeros(len(table))
+        moves = np.flatnonzero(table.is_code(0, 1))
+        relative = table.relative[moves]
+        position = np.stack([absolute_positions(getattr(table, axis)[moves].astype(np.float64), relative, start)
+                             for axis, start in zip('XYZ', self.position)], axis=1)
+        delta = np.diff(np.concatenate(([self.position], position)), axis=0)
+        length = np.sqrt((delta ** 2).sum(axis=1))
+        codes = table.code[moves]
+        F = table.F[moves].astype(np.float64)
+        feed = np.empty(len(moves))
+        for kind in (0, 1):
+            of_kind = codes == kind
+            feed[of_kind] = forward_fill(F[of_kind], self.feeds[kind])
+            if of_kind.any():
+                self.feeds[kind] = feed[of_kind][-1]
+        if len(moves):
+            self.position = position[-1]
+            self.moves += len(moves)
+            self.distance += float(length.sum())
+        feed[feed == 0] = model.zero_feed_rate
+        if model.rapid_feed_rate is not None:
+            feed[codes == 0] = model.rapid_feed_rate
+        if model.max_feed_rate is not None:
+            feed = np.minimum(feed, model.max_feed_rate)
+        speed = feed / 60 # mm/s
+
+        # Only moves that go somewhere take part in the planning
+        going = length > 0
+        rows, length, speed, direction = moves[going], length[going], speed[going], delta[going] / length[going, None]
+        if model.acceleration:
+            a = model.acceleration
+            # Squared speed limits at the junctions before each move, and 0 after the last one
+            cos = (direction[1:] * direction[:-1]).sum(axis=1)
+            sin_half = np.sqrt(np.clip((1 + cos) / 2, 0, 1)) # Half the angle of the corner, 1 when going straight on
+            with np.errstate(divide='ignore'):
+                corner = a * model.junction_deviation * sin_half / (1 - sin_half)
+            limit = np.concatenate(([0.0], np.minimum(corner, np.minimum(speed[1:], speed[:-1]) ** 2), [0.0]))
+            dwells_before = np.cumsum(table.code == 4)[rows]
+            limit[1:-1][dwells_before[1:] != dwells_before[:-1]] = 0.0
+            gain = np.concatenate(([0.0], np.cumsum(2 * a * length))) # Squared speed gained by accelerating along the moves
+            forward = np.minimum.accumulate(limit - gain) + gain
+            junction = np.minimum.accumulate((forward + gain)[::-1])[::-1] - gain
+            entry, exit = np.maximum(junction[:-1], 0), np.maximum(junction[1:], 0)
+            peak = np.minimum(speed ** 2, (2 * a * length + entry + exit) / 2)
+            v0, v1, vp = np.sqrt(entry), np.sqrt(exit), np.sqrt(peak)
+            cruise = length - (2 * peak - entry - exit) / (2 * a)
+            times[rows] = (2 * vp - v0 - v1) / a + np.maximum(cruise, 0) / vp
+        else:
+            times[rows] = length / speed
+        dwells = table.code == 4
+        times[dwells] = np.nan_to_num(table.P[dwells].astype(np.float64)) * model.dwell_unit
+        return times
+
+
+def move_times(table: MoveTable, model: KinematicModel = None) -> np.ndarray:
+    "Estimated seconds spent on each row of the table, see JobEstimator.move_times()."
+    return JobEstimator(model).move_times(table)
+
+
+def estimate_table(table: MoveTable, model: KinematicModel = None, layers=None) -> TimeEstimate:
+    "Estimate a parsed job. layers are (offsets, names) as returned by layer_offsets()."
+    estimator = JobEstimator(model)
+    estimator.add(table, layers)
+    return estimator.result()
+
+
+def estimate_gcode(gcode: bytes, model: KinematicModel = None) -> TimeEstimate:
+    return estimate_table(MoveTable.from_gcode(gcode, np.float64), model, layer_offsets(gcode))
+
+
+def estimate_file(filename: str, model: KinematicModel = None, chunk_size=16 * 1024 * 1024) -> TimeEstimate:
+    "Estimate a G-code file, parsed in pieces of about chunk_size bytes."
+    estimator = JobEstimator(model)
+    for base, data, table in MoveTable.iter_file(filename, np.float64, chunk_size):
+        offsets, names = layer_offsets(data)
+        estimator.add(table, (offsets + base, names))
+    return estimator.result()
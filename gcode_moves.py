@@ -0,0 +1,244 @@
+import numpy as np
+
+M_CODE_OFFSET = 1000 # code column: G-code n is stored as n, M-code n as M_CODE_OFFSET + n
+
+_MAX_NUMBER_LENGTH = 15 # Longer numbers might not fit into the int64 mantissa
+_POWERS_OF_TEN = 10.0 ** np.arange(_MAX_NUMBER_LENGTH + 1)
+
+
+class MoveTable:
+    """Columnar representation of the commands in a G-code job.
+
+    Every line whose first word is a G- or M-code becomes one row. Parameters that
+    are not present on a line are NaN. Comments (after ; or #) are ignored.
+
+    code:     G/M code number, see M_CODE_OFFSET (int16)
+    X, Y, Z, F, S, P: parameter values (float32 by default, NaN if absent), P is the G4 dwell time
+    relative: True if the row is executed in G91 mode, i.e. X/Y/Z are relative (bool)
+    offset:   byte offset of the start of the source line (int64)
+    """
+    parameters = ('X', 'Y', 'Z', 'F', 'S', 'P')
+
+    def __init__(self, code, relative, offset, **parameters) -> None:
+        self.code = code
+        self.relative = relative
+        self.offset = offset
+        for letter in self.parameters:
+            setattr(self, letter, parameters[letter])
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns().values())
+
+    def columns(self) -> dict:
+        columns = {'code': self.code, 'relative': self.relative, 'offset': self.offset}
+        columns.update((letter, getattr(self, letter)) for letter in self.parameters)
+        return columns
+
+    def is_code(self, *gcodes) -> np.ndarray:
+        "Boolean mask of the rows with one of the given G-codes, e.g. table.is_code(0, 1)."
+        return np.isin(self.code, gcodes)
+
+    @classmethod
+    def concatenate(cls, tables: list, float_dtype=np.float32) -> 'MoveTable':
+        if not tables:
+            return cls.empty(float_dtype)
+        columns = {name: np.concatenate([t.columns()[name] for t in tables]) for name in tables[0].columns()}
+        return cls(**columns)
+
+    @classmethod
+    def empty(cls, float_dtype=np.float32) -> 'MoveTable':
+        parameters = {letter: np.empty(0, dtype=float_dtype) for letter in cls.parameters}
+        return cls(np.empty(0, dtype=np.int16), np.empty(0, dtype=bool), np.empty(0, dtype=np.int64), **parameters)
+
+    @classmethod
+    def from_gcode(cls, gcode: bytes, float_dtype=np.float32, chunk_size=16 * 1024 * 1024) -> 'MoveTable':
+        "Parse a G-code buffer. Large buffers are parsed in pieces of about chunk_size bytes."
+        tables = []
+        start = 0
+        while start < len(gcode):
+            end = gcode.find(b'\n', start + chunk_size)
+            end = len(gcode) if end < 0 else end + 1
+            tables.append(_parse_chunk(gcode[start:end], start, float_dtype))
+            start = end
+        return _finish(tables, float_dtype)
+
+    @classmethod
+    def from_file(cls, filename: str, float_dtype=np.float32, chunk_size=16 * 1024 * 1024) -> 'MoveTable':
+        "Parse a G-code file without loading all of it into memory."
+        return cls.concatenate([table for _base, _data, table in cls.iter_file(filename, float_dtype, chunk_size)], float_dtype)
+
+    @classmethod
+    def iter_file(cls, filename: str, float_dtype=np.float32, chunk_size=16 * 1024 * 1024):
+        """Parse a G-code file piece by piece, for files that are too large for one table.
+
+        Yields (base offset, data, table) for consecutive runs of complete lines of about chunk_size bytes.
+        The G90/G91 mode carries over from one table to the next.
+        """
+        relative = False
+        for base, data in read_lines(filename, chunk_size):
+            table = _parse_chunk(data, base, float_dtype)
+            relative = _resolve_modes(table, relative)
+            yield base, data, table
+
+
+def read_lines(filename: str, chunk_size=16 * 1024 * 1024):
+    "Yield (offset, data) of a file in pieces of about chunk_size bytes that end at line ends."
+    base = 0
+    rest = b''
+    with open(filename, 'rb') as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            data = rest + data
+            end = data.rfind(b'\n') + 1
+            if end == 0:
+                rest = data
+                continue
+            yield base, data[:end]
+            base += end
+            rest = data[end:]
+    if rest:
+        yield base, rest
+
+
+def parse_moves(gcode: bytes, float_dtype=np.float32) -> MoveTable:
+    return MoveTable.from_gcode(gcode, float_dtype)
+
+
+def forward_fill(values: np.ndarray, initial=np.nan) -> np.ndarray:
+    "Replace NaN by the last preceding value that is not NaN (or initial), like a modal G-code parameter."
+    last_row = np.maximum.accumulate(np.where(np.isnan(values), -1, np.arange(len(values))))
+    return np.where(last_row >= 0, values[np.maximum(last_row, 0)], initial)
+
+
+def absolute_positions(values: np.ndarray, relative: np.ndarray, start=0.0) -> np.ndarray:
+    """Resolve an X, Y or Z column to the absolute position after each row.
+
+    NaN means the axis does not move. Relative (G91) runs are resolved with a cumulative sum,
+    which is anchored at the last absolute value before them (or start).
+    """
+    present = ~np.isnan(values)
+    is_absolute = present & ~relative
+    offset = np.cumsum(np.where(present & relative, values, 0.0))
+    anchors = np.where(is_absolute, values - offset, np.nan)
+    positions = forward_fill(anchors, start) + offset
+    positions[is_absolute] = values[is_absolute]
+    return positions
+
+
+def _finish(tables: list, float_dtype) -> MoveTable:
+    table = MoveTable.concatenate(tables, float_dtype)
+    _resolve_modes(table, False)
+    return table
+
+
+def _resolve_modes(table: MoveTable, relative: bool) -> bool:
+    "Fill the relative column from the G90/G91 rows, starting in the given mode. Returns the mode at the end."
+    # G90/G91 is modal, so forward-fill the mode of the last G90/G91 row
+    is_mode = (table.code == 90) | (table.code == 91)
+    last_mode_row = np.maximum.accumulate(np.where(is_mode, np.arange(len(table)), -1))
+    table.relative = np.where(last_mode_row >= 0, table.code[np.maximum(last_mode_row, 0)] == 91, relative)
+    return bool(table.relative[-1]) if len(table) else relative
+
+
+def _parse_chunk(data: bytes, base_offset: int, float_dtype) -> MoveTable:
+    "Parse complete lines without a Python loop over lines or words."
+    buf = np.frombuffer(data, dtype=np.uint8)
+    n = len(buf)
+    if n == 0:
+        return MoveTable.empty(float_dtype)
+    is_newline = buf == ord('\n')
+    line_starts = np.concatenate(([0], np.flatnonzero(is_newline) + 1))
+    line_starts = line_starts[line_starts < n]
+
+    # Words are a letter followed by a run of numeric characters, like X-1.5.
+    # Unsigned wrap-around turns range checks into a single comparison.
+    is_numeric = ((buf - np.uint8(ord('+'))) <= ord('9') - ord('+')) & (buf != ord(',')) & (buf != ord('/'))
+    is_letter = (buf - np.uint8(ord('A'))) <= ord('Z') - ord('A')
+    run_starts = np.flatnonzero(is_numeric & ~np.concatenate(([False], is_numeric[:-1])))
+    run_ends = np.flatnonzero(is_numeric & ~np.concatenate((is_numeric[1:], [False]))) + 1
+    is_word_start = np.zeros(n, dtype=bool)
+    is_word_start[1:] = is_numeric[1:] & is_letter[:-1]
+
+    # Only newlines, comment characters and word starts matter for the line structure,
+    # so the per-line bookkeeping works on these events instead of every character.
+    is_comment = (buf == ord(';')) | (buf == ord('#'))
+    events = np.flatnonzero(is_newline | is_comment | is_word_start)
+    event_chars = buf[events]
+    event_is_newline = event_chars == ord('\n')
+    event_is_comment = (event_chars == ord(';')) | (event_chars == ord('#'))
+    event_is_word = ~(event_is_newline | event_is_comment)
+    event_lines = np.cumsum(event_is_newline, dtype=np.int32)
+    comment_count = np.cumsum(event_is_comment, dtype=np.int32)
+    comments_at_line_start = np.maximum.accumulate(np.where(event_is_newline, comment_count, 0))
+    not_commented = (comment_count == comments_at_line_start)[event_is_word]
+
+    is_word_run = is_word_start[run_starts]
+    word_starts = run_starts[is_word_run][not_commented]
+    word_lengths = run_ends[is_word_run][not_commented] - word_starts
+    word_lines = event_lines[event_is_word][not_commented]
+    values = _parse_numbers(buf, word_starts, word_lengths)
+    letters = buf[word_starts - 1]
+
+    # The first word of a line determines its command
+    valid = ~np.isnan(values)
+    first = np.ones(len(word_lines), dtype=bool)
+    first[1:] = word_lines[1:] != word_lines[:-1]
+    is_command = first & valid & ((letters == ord('G')) | (letters == ord('M'))) & (values == np.floor(values))
+    command_lines = word_lines[is_command]
+    codes = values[is_command].astype(np.int16) + np.where(letters[is_command] == ord('M'), M_CODE_OFFSET, 0).astype(np.int16)
+
+    row_of_line = np.full(len(line_starts), -1, dtype=np.int64)
+    row_of_line[command_lines] = np.arange(len(command_lines))
+    word_rows = row_of_line[word_lines]
+    parameters = {}
+    for letter in MoveTable.parameters:
+        column = np.full(len(command_lines), np.nan, dtype=float_dtype)
+        selected = (letters == ord(letter)) & (word_rows >= 0) & valid & ~first
+        column[word_rows[selected]] = values[selected]
+        parameters[letter] = column
+    return MoveTable(codes, np.zeros(len(codes), dtype=bool), line_starts[command_lines].astype(np.int64) + base_offset,
+                     **parameters)
+
+
+def _parse_numbers(buf: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Parse the numbers buf[starts:starts+lengths] into float64, NaN where float() would fail.
+
+    The digits are combined column by column into an integer mantissa and divided by
+    a power of ten, which gives the same correctly rounded result as float().
+    """
+    width = min(int(lengths.max(initial=1)), _MAX_NUMBER_LENGTH)
+    padded = np.concatenate((buf, np.zeros(width, dtype=np.uint8)))
+    # One row per character position, one column per number
+    chars = np.ascontiguousarray(np.lib.stride_tricks.sliding_window_view(padded, width)[starts].T)
+    inside = np.arange(width)[:, None] < lengths
+    digits = chars - np.uint8(ord('0'))
+    is_digit = (digits <= 9) & inside
+    is_dot = (chars == ord('.')) & inside
+    mantissa = np.zeros(len(starts), dtype=np.int32 if width <= 9 else np.int64)
+    digit_count = np.zeros(len(starts), dtype=np.int8)
+    dot_count = np.zeros(len(starts), dtype=np.int8)
+    fraction_digits = np.zeros(len(starts), dtype=np.int8)
+    for row in range(width):
+        mantissa = np.where(is_digit[row], mantissa * 10 + digits[row], mantissa)
+        digit_count += is_digit[row]
+        dot_count += is_dot[row]
+        fraction_digits += is_digit[row] & (dot_count > 0)
+    values = mantissa / _POWERS_OF_TEN[fraction_digits]
+    values[chars[0] == ord('-')] *= -1
+    # Numeric characters are digits, dots and signs, so a number is valid if it has digits,
+    # at most one dot and at most one sign at the start.
+    sign_count = lengths - digit_count - dot_count
+    has_sign = (chars[0] == ord('-')) | (chars[0] == ord('+'))
+    values[(sign_count > has_sign) | (dot_count > 1) | (digit_count == 0)] = np.nan
+    for i in np.flatnonzero(lengths > _MAX_NUMBER_LENGTH): # Very rare, so just let Python do it
+        try:
+            values[i] = float(buf[starts[i]:starts[i] + lengths[i]].tobytes())
+        except ValueError:
+            values[i] = np.nan
+    return values
@@ -0,0 +1,544 @@
+import math
+import re
+from typing import Iterable, Iterator
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+_move_regex = re.compile(rb'G0?([01])(?![0-9.])')
+_word_regex = re.compile(rb'([A-Z])([-+]?[0-9]*\.?[0-9]*)')
+
+
+class _Move:
+    "A G0/G1 line, or a run of lines merged into one move."
+    def __init__(self, line: bytes, kind: int, words: dict, start: tuple, end: tuple, F, S) -> None:
+        self.lines = [line]
+        self.kind = kind # 0 or 1, after turning G1 S0 into G0
+        self.words = words # Letter -> value bytes of the first line
+        self.start = start
+        self.end = end
+        self.points = [] # End points of all lines but the last
+        self.F = F # Modal feed rate and power of the input at this move
+        self.S = S
+
+
+def _parse_words(code: bytes, start: int):
+    "Letters and values of a move, or None if it has a comment or other words."
+    words = {}
+    position = start
+    for match in _word_regex.finditer(code, start):
+        if code[position:match.start()].strip() or match.group(1) not in b'XYZFSI':
+            return None
+        if (match.group(2) == b'') != (match.group(1) == b'I'):
+            return None
+        words[match.group(1)] = match.group(2)
+        position = match.end()
+    if code[position:].strip():
+        return None
+    return words
+
+
+class _MoveStage:
+    """Common state of the optimizers: mode, position and the modal F and S of input and output.
+
+    The M1 keeps separate feed rates for G0 and G1 (see GcodeTranslator.START_GCODE), so F is
+    tracked per kind of move: an F on a G0 line does not change the feed rate of G1 lines.
+
+    Subclasses implement _process_line() and _finish(). Lines they leave alone go through
+    _pass_through(), and all moves are written with _emit_move(), which adds F and S where
+    the output would otherwise run with other modal values than the input.
+    """
+    DIGITS = 4 # Decimal places of computed coordinates
+    START_F = (9600.0, 9600.0) # Feed rates of G0 and G1 that GcodeTranslator.START_GCODE sets before the job
+    START_S = 0.0 # Power after the M4 S0 of GcodeTranslator.START_GCODE, so moves without S do not burn
+
+    def reset(self) -> None:
+        self.lines_in = 0
+        self.lines_out = 0
+        self.relative = False
+        self.position = [0.0, 0.0] # Absolute position (or relative to an unknown start)
+        self.position_known = False
+        self.emitted_position = [0.0, 0.0] # Position according to the output, which differs by rounding
+        self.F = list(self.START_F) # Modal feed rates of G0 and G1 in the input
+        self.S = self.START_S # Modal power of the input
+        self.emitted_F = list(self.START_F) # Modal values of the output
+        self.emitted_S = self.START_S
+        self._rest = b''
+
+    def optimize_chunks(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        "Optimize an iterable of byte chunks (split anywhere) into output chunks."
+        self.reset()
+        for chunk in chunks:
+            data = self._rest + chunk
+            end = data.rfind(b'\n') + 1
+            self._rest = data[end:]
+            output = []
+            for line in data[:end].splitlines(keepends=True):
+                self.lines_in += 1
+                self._process_line(line, output)
+            if output:
+                yield b''.join(output)
+        output = []
+        if self._rest:
+            self.lines_in += 1
+            self._process_line(self._rest, output)
+        self._finish(output)
+        yield b''.join(output)
+
+    def _process_line(self, line: bytes, output: list) -> None:
+        raise NotImplementedError
+
+    def _finish(self, output: list) -> None:
+        pass
+
+    def _end_point(self, words: dict) -> tuple:
+        end = list(self.position)
+        for axis, letter in enumerate((b'X', b'Y')):
+            if letter in words:
+                value = float(words[letter])
+                end[axis] = end[axis] + value if self.relative else value
+        return tuple(end)
+
+    def _pass_through(self, line: bytes, code: bytes, match, output: list) -> None:
+        "Emit a line that is passed through and track its effect on the mode and position."
+        plain = code.split(b';')[0].split(b'#')[0]
+        command = plain.split()[0] if plain.split() else b''
+        if command == b'G90':
+            self.relative = False
+        elif command == b'G91':
+            self.relative = True
+        elif command in (b'G28', b'G92'):
+            self.position_known = False
+        if match is None:
+            output.append(line if line.endswith(b'\n') else line + b'\n')
+            self.lines_out += 1
+            return
+        words = {m.group(1): m.group(2) for m in _word_regex.finditer(plain, match.end()) if m.group(2)}
+        end = self._end_point(words)
+        if not self.relative and b'X' in words and b'Y' in words:
+            self.position_known = True
+        self.position = list(end)
+        kind = int(match.group(1))
+        if b'F' in words:
+            self.F[kind] = float(words[b'F'])
+        if b'S' in words:
+            self.S = float(words[b'S'])
+        self._emit_move(line, kind, words, end, self.F[kind], self.S, output)
+
+    def _emit_move(self, line: bytes, kind: int, words: dict, end: tuple, F, S, output: list) -> None:
+        "Emit a move, adding F and S where the modal values of the output differ from the input."
+        extra = b''
+        if b'F' in words:
+            self.emitted_F[kind] = float(words[b'F'])
+        elif F is not None and self.emitted_F[kind] != F:
+            extra += b' F' + self._format(F)
+            self.emitted_F[kind] = F
+        if b'S' in words:
+            self.emitted_S = float(words[b'S'])
+        elif kind == 1 and S is not None and self.emitted_S != S:
+            extra += b' S' + self._format(S)
+            self.emitted_S = S
+        line = line.rstrip(b'\r\n')
+        if extra:
+            comment = min((i for i in (line.find(b';'), line.find(b'#')) if i >= 0), default=len(line))
+            line = line[:comment].rstrip() + extra + (b' ' + line[comment:] if comment < len(line) else b'')
+        if self.relative:
+            for axis, letter in enumerate((b'X', b'Y')):
+                if letter in words:
+                    self.emitted_position[axis] += float(words[letter])
+        else:
+            self.emitted_position = list(end)
+        output.append(line + b'\n')
+        self.lines_out += 1
+
+    def _format(self, value: float) -> bytes:
+        text = f'{value:.{self.DIGITS}f}'.rstrip('0').rstrip('.')
+        return (text if text not in ('', '-0') else '0').encode('ascii')
+
+
+class GcodeSimplifier(_MoveStage):
+    """Removes redundant moves from G-code before it is translated.
+
+    - Consecutive G1 moves with the same power and feed rate that lie on one line
+      (within tolerance, in mm) are merged into one move.
+    - G1 moves with power S0 become G0 moves, and runs of them are merged into
+      a single G0 move to the end point of the run.
+    - Moves that do not change the position are dropped.
+
+    Lines with comments, Z coordinates or other words than X, Y, F, S and I are
+    passed through unchanged. Feed rate and power are added to the lines after
+    removed ones where needed, so the modal state of the machine stays the same.
+    """
+    def __init__(self, tolerance=0.001, s0_to_g0=True) -> None:
+        self.tolerance = tolerance
+        self.s0_to_g0 = s0_to_g0
+        self.reset()
+
+    def __repr__(self) -> str:
+        return f'GcodeSimplifier(tolerance={self.tolerance!r}, s0_to_g0={self.s0_to_g0!r})'
+
+    def reset(self) -> None:
+        super().reset()
+        self._pending = None
+
+    @property
+    def removed(self) -> int:
+        return self.lines_in - self.lines_out
+
+    def report(self) -> str:
+        percent = 100 * self.removed / self.lines_in if self.lines_in else 0.0
+        return f'Simplified {self.lines_in} lines to {self.lines_out}, removed {self.removed} ({percent:.1f}%)'
+
+    def simplify(self, gcode: bytes) -> bytes:
+        return b''.join(self.optimize_chunks([gcode]))
+
+    def _finish(self, output: list) -> None:
+        self._flush(output)
+
+    def _process_line(self, line: bytes, output: list) -> None:
+        code = line.strip()
+        match = _move_regex.match(code)
+        words = _parse_words(code, match.end()) if match else None
+        if words is None or b'Z' in words or (not self.relative and not self.position_known):
+            self._flush(output)
+            self._pass_through(line, code, match, output)
+            return
+
+        kind = int(match.group(1))
+        start = tuple(self.position)
+        end = self._end_point(words)
+        self.position = list(end)
+        if b'F' in words:
+            self.F[kind] = float(words[b'F'])
+        if b'S' in words:
+            self.S = float(words[b'S'])
+        if end == start:
+            return # Zero length, but the modal values are tracked above
+        if self.s0_to_g0 and kind == 1 and self.S == 0:
+            kind = 0 # Travels at the feed rate of G0
+        move = _Move(line, kind, words, start, end, self.F[kind], self.S)
+        if self._pending is not None and self._can_merge(self._pending, move):
+            self._pending.points.append(self._pending.end)
+            self._pending.end = end
+            self._pending.lines.append(line)
+            return
+        self._flush(output)
+        self._pending = move
+
+    def _can_merge(self, pending: _Move, move: _Move) -> bool:
+        if move.kind != pending.kind or move.F != pending.F:
+            return False
+        if move.kind == 0:
+            return True # The laser is off, so only the end point matters
+        if move.S != pending.S:
+            return False
+        # All points of the merged move must stay within tolerance of the straight line
+        (x0, y0), (x1, y1) = pending.start, move.end
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length == 0:
+            return False
+        progress = 0.0
+        for x, y in pending.points + [pending.end, move.end]:
+            if abs((x1 - x0) * (y0 - y) - (x0 - x) * (y1 - y0)) / length > self.tolerance:
+                return False
+            along = ((x - x0) * (x1 - x0) + (y - y0) * (y1 - y0)) / length
+            if along < progress:
+                return False # Going backwards
+            progress = along
+        return True
+
+    def _flush(self, output: list) -> None:
+        "Emit the pending move."
+        move, self._pending = self._pending, None
+        if move is None:
+            return
+        original_kind = int(_move_regex.match(move.lines[0].strip()).group(1))
+        if len(move.lines) == 1 and move.kind == original_kind:
+            self._emit_move(move.lines[0], move.kind, move.words, move.end, move.F, move.S, output)
+            return
+        words = {}
+        for axis, letter in enumerate((b'X', b'Y')):
+            if move.end[axis] != self.emitted_position[axis]:
+                value = move.end[axis] - self.emitted_position[axis] if self.relative else move.end[axis]
+                words[letter] = self._format(value)
+        if move.kind == 1 and b'I' in move.words:
+            words[b'I'] = b''
+        line = b'G%d ' % move.kind + b' '.join(letter + value for letter, value in words.items())
+        self._emit_move(line, move.kind, words, move.end, move.F, move.S, output)
+
+
+class _Path:
+    "Consecutive laser-on moves of a CutOrderOptimizer section."
+    def __init__(self, start: tuple, travel_F) -> None:
+        self.start = start
+        self.moves = [] # (line, words, end, F, S)
+        self.travel_F = travel_F # Modal G0 feed rate of the travel move to the start
+
+    @property
+    def end(self) -> tuple:
+        return self.moves[-1][2]
+
+
+class CutOrderOptimizer(_MoveStage):
+    """Reorders the laser-on paths of vector jobs to shorten the travel between them.
+
+    A section is a run of plain G0/G1 lines with absolute X/Y coordinates. Any other line
+    (comments like LightBurn's layer headers, M-codes, Z moves, G91 relative scans...) ends
+    a section, so layers and passes keep their order. Within a section, each run of G1 moves
+    with power is a path; the moves with the laser off are replaced by one G0 move to the
+    next path. Paths are ordered with nearest neighbour and 2-opt, open paths are also
+    burnt backwards if reverse_paths is set.
+
+    The end point of a section is kept when the following lines depend on it.
+    """
+    def __init__(self, reverse_paths=True, window=32, max_rounds=100) -> None:
+        self.reverse_paths = reverse_paths
+        self.window = window # 2-opt tries to reverse up to this many consecutive paths
+        self.max_rounds = max_rounds
+        self.reset()
+
+    def __repr__(self) -> str:
+        return f'CutOrderOptimizer(reverse_paths={self.reverse_paths!r}, window={self.window!r}, max_rounds={self.max_rounds!r})'
+
+    def reset(self) -> None:
+        super().reset()
+        self.paths = 0
+        self.travel_before = 0.0 # Laser-off distance in the reordered sections, in mm
+        self.travel_after = 0.0
+        self._origin = None # Start of the current section, None if there is none
+        self._paths = []
+        self._travel = 0.0
+        self._travel_F = None
+        self._held = None # Lines after a section until it is known whether its end point matters
+
+    def report(self) -> str:
+        saved = 100 * (1 - self.travel_after / self.travel_before) if self.travel_before else 0.0
+        return f'Reordered {self.paths} paths, travel {self.travel_before:.1f} mm -> {self.travel_after:.1f} mm ({saved:.1f}% less)'
+
+    def optimize(self, gcode: bytes) -> bytes:
+        return b''.join(self.optimize_chunks([gcode]))
+
+    def _process_line(self, line: bytes, output: list) -> None:
+        code = line.strip()
+        match = _move_regex.match(code)
+        words = _parse_words(code, match.end()) if match else None
+        if self._held is not None:
+            fixed_end = self._end_matters(code, match)
+            self._held.append(line)
+            if fixed_end is not None:
+                held, self._held = self._held, None
+                self._flush(output, fixed_end)
+                for line in held:
+                    self._process_line(line, output)
+            return
+        if words is None or b'Z' in words or self.relative or not self.position_known:
+            if self._origin is not None:
+                self._held = []
+                self._process_line(line, output)
+            else:
+                self._pass_through(line, code, match, output)
+            return
+
+        if self._origin is None:
+            self._origin = tuple(self.position)
+            self._travel_F = self.F[0]
+        kind = int(match.group(1))
+        start = tuple(self.position)
+        end = self._end_point(words)
+        self.position = list(end)
+        if b'F' in words:
+            self.F[kind] = float(words[b'F'])
+        if b'S' in words:
+            self.S = float(words[b'S'])
+        if kind == 1 and self.S != 0:
+            if not self._paths or self._paths[-1] is None:
+                self._paths.append(_Path(start, self._travel_F))
+            self._paths[-1].moves.append((line, words, end, self.F[1], self.S))
+        else:
+            if self._paths and self._paths[-1] is not None:
+                self._paths.append(None) # The next burning move starts a new path
+            self._travel += math.dist(start, end)
+            self._travel_F = self.F[0]
+
+    def _finish(self, output: list) -> None:
+        # The end of the job is kept, e.g. LightBurn's return to the finish position
+        held, self._held = self._held or [], None
+        if self._origin is not None:
+            self._flush(output, fixed_end=True)
+        for line in held:
+            self._process_line(line, output)
+
+    def _end_matters(self, code: bytes, match):
+        """Whether a line after a section depends on the position at its end.
+
+        None if that is not known yet, e.g. for comments and Z moves.
+        """
+        plain = code.split(b';')[0].split(b'#')[0]
+        command = plain.split()[0] if plain.split() else b''
+        if match is None:
+            return True if command in (b'G2', b'G02', b'G3', b'G03', b'G91', b'G92') else None
+        words = {m.group(1): m.group(2) for m in _word_regex.finditer(plain, match.end()) if m.group(2)}
+        if b'X' not in words and b'Y' not in words:
+            return True if b'S' in words else None
+        if b'X' not in words or b'Y' not in words:
+            return True
+        S = float(words[b'S']) if b'S' in words else self.S
+        return match.group(1) == b'1' and S != 0 # A burn starts at the end point, a travel move does not
+
+    def _flush(self, output: list, fixed_end: bool) -> None:
+        "Emit the current section with its paths reordered."
+        origin, self._origin = self._origin, None
+        end = tuple(self.position)
+        paths = [path for path in self._paths if path is not None]
+        self._paths = []
+        self.travel_before += self._travel
+        self._travel = 0.0
+        self.position = list(origin)
+        if paths:
+            starts = np.array([path.start for path in paths])
+            ends = np.array([path.end for path in paths])
+            reversible = np.full(len(paths), self.reverse_paths)
+            order, flipped = order_paths(starts, ends, reversible, origin, end if fixed_end else None,
+                                         self.window, self.max_rounds)
+            for index, reverse in zip(order, flipped):
+                path = paths[index]
+                reverse = reverse and path.start != path.end
+                self._travel_to(path.end if reverse else path.start, path.travel_F, output)
+                self.emitted_S = None # The first move of a path always sets its power
+                if reverse:
+                    points = [path.start] + [move[2] for move in path.moves[:-1]]
+                    for (line, words, _end, F, S), point in zip(reversed(path.moves), reversed(points)):
+                        self._emit_burn(point, b'I' in words, F, S, output)
+                else:
+                    for line, words, move_end, F, S in path.moves:
+                        self._emit_move(line, 1, words, move_end, F, S, output)
+                        self.position = list(move_end)
+            self.paths += len(paths)
+        if fixed_end or not paths:
+            self._travel_to(end, self.F[0], output)
+
+    def _travel_to(self, point: tuple, F, output: list) -> None:
+        if point == tuple(self.position):
+            return
+        self.travel_after += math.dist(self.position, point)
+        words = {b'X': self._format(point[0]), b'Y': self._format(point[1])}
+        line = b'G0 X' + words[b'X'] + b' Y' + words[b'Y']
+        self._emit_move(line, 0, words, point, F, self.S, output)
+        self.position = list(point)
+
+    def _emit_burn(self, point: tuple, inline: bool, F, S, output: list) -> None:
+        words = {b'X': self._format(point[0]), b'Y': self._format(point[1])}
+        line = b'G1 X' + words[b'X'] + b' Y' + words[b'Y'] + (b' I' if inline else b'')
+        self._emit_move(line, 1, words, point, F, S, output)
+        self.position = list(point)
+
+
+def order_paths(starts: np.ndarray, ends: np.ndarray, reversible: np.ndarray, origin, end=None,
+                window=32, max_rounds=100):
+    """Find a short order to visit paths from origin, and finally end if it is given.
+
+    starts and ends are (n, 2) arrays, paths with start == end are closed. Paths where
+    reversible is True may be entered at their end. Returns the order of the path indices
+    and whether each of them is run backwards.
+    """
+    order, flipped = _nearest_neighbour(starts, ends, reversible, np.asarray(origin, dtype=float))
+    return _two_opt(starts, ends, reversible, order, flipped, origin, end, window, max_rounds)
+
+
+def _nearest_neighbour(starts, ends, reversible, origin):
+    "Greedy order: always go to the closest entry point of a path that was not visited yet."
+    n = len(starts)
+    has_end_entry = reversible & np.any(starts != ends, axis=1)
+    second = np.flatnonzero(has_end_entry)
+    points = np.concatenate((starts, ends[second]))
+    owner = np.concatenate((np.arange(n), second))
+    is_end = np.concatenate((np.zeros(n, dtype=bool), np.ones(len(second), dtype=bool)))
+    # Plain lists, because the loop looks at single elements
+    owner_list, is_end_list, has_end_list = owner.tolist(), is_end.tolist(), has_end_entry.tolist()
+    starts_list, ends_list = starts.tolist(), ends.tolist()
+    visited = [False] * n
+    order = []
+    flipped = []
+    alive = np.arange(len(points)) # Entry points in the tree
+    tree = cKDTree(points)
+    dead = 0 # Entry points in the tree whose path was visited
+    position = origin
+    k = 8
+    while len(order) < n:
+        _distances, found = tree.query(position, k=min(k, len(alive)))
+        for chosen in alive[np.atleast_1d(found)].tolist():
+            if not visited[owner_list[chosen]]:
+                break
+        else:
+            k *= 4 # All candidates were visited, look further
+            continue
+        k = 8
+        path = owner_list[chosen]
+        visited[path] = True
+        order.append(path)
+        flipped.append(is_end_list[chosen])
+        position = starts_list[path] if is_end_list[chosen] else ends_list[path]
+        dead += 1 + has_end_list[path]
+        if dead * 2 > len(alive) and len(order) < n: # Rebuild without the visited paths
+            alive = alive[~np.array(visited)[owner[alive]]]
+            tree = cKDTree(points[alive])
+            dead = 0
+    order = np.array(order, dtype=np.int64)
+    flipped = np.array(flipped, dtype=bool)
+    return order, flipped
+
+
+def _two_opt(starts, ends, reversible, order, flipped, origin, end, window, max_rounds):
+    """Improve an order by reversing runs of up to window paths where that shortens the travel.
+
+    All improving reversals are evaluated at once with NumPy, and each round applies the
+    best ones that do not touch each other.
+    """
+    n = len(order)
+    # Entry and exit point of the path at each position, with the origin and end around them
+    entry = np.where(flipped[:, None], ends[order], starts[order])
+    exit = np.where(flipped[:, None], starts[order], ends[order])
+    last = np.asarray(end if end is not None else origin, dtype=float)
+    entry = np.concatenate(([origin], entry, [last])).astype(float)
+    exit = np.concatenate(([origin], exit, [last])).astype(float)
+    order = np.concatenate(([-1], order, [-1]))
+    flipped = np.concatenate(([False], flipped, [False]))
+    closed = np.all(starts == ends, axis=1)
+    fixed = np.concatenate(([False], ~reversible[order[1:-1]] & ~closed[order[1:-1]], [False]))
+    # With a free end, the move from the last path to the end costs nothing
+    weight = np.ones(n + 2)
+    weight[n] = end is not None
+    gain = np.zeros(n)
+    best = np.zeros(n, dtype=np.int64) # Last position of the best reversal from each position
+    dirty = np.ones(n, dtype=bool) # Positions whose reversals need to be evaluated (again)
+    for _round in range(max_rounds):
+        fixed_before = np.concatenate(([0], np.cumsum(fixed)))
+        i = np.flatnonzero(dirty)[:, None] + 1
+        j = np.minimum(i + np.arange(window), n)
+        valid = fixed_before[j + 1] - fixed_before[i] == 0
+        new = _distance(exit[i - 1], exit[j]) + _distance(entry[i], entry[j + 1]) * weight[j]
+        old = _distance(exit[i - 1], entry[i]) + _distance(exit[j], entry[j + 1]) * weight[j]
+        delta = np.where(valid, new - old, 0.0)
+        columns = np.argmin(delta, axis=1)
+        gain[dirty] = delta[np.arange(len(i)), columns]
+        best[dirty] = j[np.arange(len(i)), columns]
+        dirty[:] = False
+        improving = np.flatnonzero(gain < -1e-9)
+        if len(improving) == 0:
+            break
+        used = np.zeros(n + 2, dtype=bool)
+        for row in improving[np.argsort(gain[improving])]:
+            a, b = row + 1, best[row]
+            if used[a - 1:b + 2].any():
+                continue
+            used[a:b + 1] = True
+            entry[a:b + 1], exit[a:b + 1] = exit[a:b + 1][::-1].copy(), entry[a:b + 1][::-1].copy()
+            order[a:b + 1] = order[a:b + 1][::-1]
+            flipped[a:b + 1] = ~flipped[a:b + 1][::-1]
+            fixed[a:b + 1] = fixed[a:b + 1][::-1]
+            dirty[max(a - window, 1) - 1:b + 1] = True # Rows whose window reaches into a...b
+    return order[1:-1], flipped[1:-1]
+
+
+def _distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.hypot(a[..., 0] - b[..., 0], a[..., 1] - b[..., 1])
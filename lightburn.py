@@ -0,0 +1,456 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from xtm1 import IDLE_STATES, GcodeTranslator, StatusWatcher, UnexpectedGcodeError
+from xtm1_metrics import metrics
+
+TIMEOUT_SECONDS = 1
+MIN_JOB_LINES = 4 # Shorter transmissions are not jobs, e.g. LightBurn asking for the position
+
+
+def next_job_filename(directory: str, exclude=()) -> str:
+    "The first output-NNNN.gcode in directory that can be written and is not in exclude."
+    i = 0
+    while True:
+        name = os.path.join(directory, f'output-{i:04}.gcode')
+        if name not in exclude and not any(os.path.exists(n) and (not os.path.isfile(n) or os.path.getsize(n) > 0)
+                   for n in (name, GcodeTranslator.translated_filename(name))):
+            return name
+        i += 1 # Skip all names which exist and are either non-empty or not normal files
+
+
+class JobWriter:
+    """Translates the lines of a job while they are received and writes the result.
+
+    The received G-code is also written to raw_filename if keep_raw is set. After
+    close(), the translated file (filename) is ready to upload. If the translator
+    rejects a line, error is set, the remaining lines are only counted and the
+    translated file is removed on close().
+    """
+    FEED_SIZE = 64 * 1024 # Lines are collected and translated in blocks of about this size
+
+    def __init__(self, raw_filename: str, keep_raw=True, translator=None) -> None:
+        self.raw_filename = raw_filename
+        self.filename = GcodeTranslator.translated_filename(raw_filename)
+        self.translator = translator or GcodeTranslator()
+        self.translator.begin_stream()
+        self.lines = 0
+        self.error = None
+        self._raw = open(raw_filename, 'wb') if keep_raw else None
+        self._out = open(self.filename, 'wb')
+        self._pending = []
+        self._pending_size = 0
+
+    def write(self, line: bytes) -> None:
+        self.lines += 1
+        if self._raw is not None:
+            self._raw.write(line)
+        if self.error is None:
+            self._pending.append(line)
+            self._pending_size += len(line)
+            if self._pending_size >= self.FEED_SIZE:
+                self._translate()
+
+    def write_lines(self, lines: list) -> None:
+        "write() for each of lines, e.g. from a thread."
+        for line in lines:
+            self.write(line)
+
+    def _translate(self, final=False) -> None:
+        data = b''.join(self._pending)
+        self._pending.clear()
+        self._pending_size = 0
+        try:
+            output = self.translator.feed(data) if data else b''
+            if final:
+                output += self.translator.finish()
+            self._out.write(output)
+        except (UnexpectedGcodeError, RuntimeError) as e:
+            self.error = e
+
+    def close(self) -> bool:
+        "Finish the translation and close the files. Returns True if the translated file is ready."
+        if self._out.closed:
+            return self.error is None
+        if self.error is None:
+            self._translate(final=True)
+        if self._raw is not None:
+            self._raw.close()
+        self._out.close()
+        if self.error is not None:
+            os.unlink(self.filename)
+        return self.error is None
+
+    def discard(self) -> None:
+        "Close and delete all files of this job."
+        self.close()
+        for name in (self.raw_filename, self.filename):
+            if os.path.exists(name):
+                os.unlink(name)
+
+
+def receive_job(stream, directory: str, keep_raw=True, log=print):
+    """Receive one job from LightBurn through a StreamLineReader and translate it on the fly.
+
+    Lines before LASER_JOB_START are acknowledged and skipped. The job ends with a
+    LASER_JOB_END line or when no line arrives for TIMEOUT_SECONDS. Returns the
+    closed JobWriter, or None if the transmission was too short to be a job.
+    """
+    log("\nWaiting for LASER_JOB_START... Stop with Ctrl+C")
+    line: bytes = stream.readline() # Wait forever for the first line
+    stream.write_flush(b'ok\n')
+    while not b'LASER_JOB_START' in line:
+        log(f'Received G-code {line.strip()} ... skipping')
+        # TODO: Check G-code line and possibly execute on machine immediately?
+        line = stream.readline() # Wait forever for the first line
+        stream.write_flush(b'ok\n')
+
+    filename = next_job_filename(directory)
+    writer = JobWriter(filename, keep_raw)
+    log(f'{filename}: starting')
+    started = time.monotonic()
+    while True:
+        line = stream.readline(timeout=TIMEOUT_SECONDS)
+        stream.write(b'ok\n')
+        if len(line) == 0:
+            break # Timeout while receiving commands, assume that file is done
+        if b'LASER_JOB_END' in line: # You can put this into "End G-code" in LightBurn, followed by a newline, to mark the end of the file.
+            break # End of transmission
+        writer.write(line)
+    count_received(writer, time.monotonic() - started, 'stream')
+
+    if writer.lines < MIN_JOB_LINES: # Filter out bogus files
+        log("Not enough lines, deleting file.")
+        writer.discard()
+        return None
+    writer.close()
+    return writer
+
+
+def count_received(job: JobWriter, seconds: float, source: str) -> None:
+    "Metrics of a received transmission. Lines per second are lines_total / receive_seconds_total."
+    metrics.count('xtm1_lightburn_lines_total', job.lines, source=source)
+    metrics.count('xtm1_lightburn_receive_seconds_total', seconds, source=source)
+    if job.lines >= MIN_JOB_LINES:
+        metrics.count('xtm1_lightburn_jobs_total', source=source, translated=job.error is None)
+
+
+class ConnectionStats:
+    "Lines and jobs received from one LightBurn connection."
+    def __init__(self, peer) -> None:
+        self.peer = peer
+        self.lines = 0
+        self.jobs = 0
+        self.receiving_seconds = 0.0 # Time between the start and end of jobs
+        self.closed = False
+
+    @property
+    def lines_per_second(self) -> float:
+        return self.lines / self.receiving_seconds if self.receiving_seconds else 0.0
+
+    def __str__(self) -> str:
+        state = 'closed' if self.closed else 'connected'
+        return f'{self.peer}: {state}, {self.jobs} jobs, {self.lines} lines, {self.lines_per_second:.0f} lines/s'
+
+
+class LightBurnServer:
+    """asyncio TCP server for several LightBurn connections at once.
+
+    Each connection receives and translates its jobs like receive_job(). Finished
+    jobs (closed JobWriters) are put into the jobs queue, which is shared by all
+    connections.
+    """
+    def __init__(self, directory: str, keep_raw=True, log=print) -> None:
+        self.directory = directory
+        self.keep_raw = keep_raw
+        self.log = log
+        self.jobs = asyncio.Queue()
+        self.connections = []
+        self._receiving = set() # Files of jobs that are being received
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=2323) -> None:
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def report(self) -> str:
+        return '\n'.join(str(stats) for stats in self.connections)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        stats = ConnectionStats(writer.get_extra_info('peername'))
+        self.connections.append(stats)
+        self.log(f'{stats.peer}: connected')
+        try:
+            while not stats.closed:
+                job = await self._receive_job(reader, writer, stats)
+                if job is not None:
+                    await self.jobs.put(job)
+        except ConnectionError:
+            stats.closed = True
+        finally:
+            writer.close()
+            self.log(str(stats))
+
+    async def _readline(self, reader, stats, timeout=None) -> bytes:
+        try:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+        except asyncio.TimeoutError:
+            return b''
+        if not line:
+            stats.closed = True
+        return line.replace(b'\r\n', b'\n')
+
+    async def _receive_job(self, reader, writer, stats: ConnectionStats):
+        "Receive one job like receive_job(). Returns None if there was no job."
+        line = b''
+        while not b'LASER_JOB_START' in line:
+            line = await self._readline(reader, stats) # Wait forever for the first line
+            if stats.closed:
+                return None
+            writer.write(b'ok\n')
+            await writer.drain()
+
+        filename = next_job_filename(self.directory, self._receiving)
+        self._receiving.add(filename)
+        job = JobWriter(filename, self.keep_raw)
+        started = time.monotonic()
+        # Translating and writing files would block the event loop and thus the other connections,
+        # so blocks of lines are written by a thread while the next block is received.
+        loop = asyncio.get_running_loop()
+        writing = None
+        batch, batch_size = [], 0
+        try:
+            while True:
+                line = await self._readline(reader, stats, TIMEOUT_SECONDS)
+                if not line or b'LASER_JOB_END' in line:
+                    break # Timeout, end of transmission or closed connection
+                writer.write(b'ok\n')
+                batch.append(line)
+                batch_size += len(line)
+                if batch_size >= JobWriter.FEED_SIZE:
+                    if writing is not None:
+                        await writing
+                    writing = loop.run_in_executor(None, job.write_lines, batch)
+                    batch, batch_size = [], 0
+                if writer.transport.get_write_buffer_size() > 64 * 1024:
+                    await writer.drain()
+            if writing is not None:
+                await writing
+            writing = loop.run_in_executor(None, job.write_lines, batch)
+            await writing
+            if not stats.closed:
+                writer.write(b'ok\n')
+                await writer.drain()
+        except BaseException:
+            if writing is not None:
+                await asyncio.wait([writing]) # The thread must be done with the files before they are removed
+            job.discard()
+            raise
+        finally:
+            self._receiving.discard(filename)
+            seconds = time.monotonic() - started
+            stats.receiving_seconds += seconds
+            stats.lines += job.lines
+            count_received(job, seconds, 'tcp')
+        if job.lines < MIN_JOB_LINES:
+            await loop.run_in_executor(None, job.discard)
+            return None
+        await loop.run_in_executor(None, job.close)
+        stats.jobs += 1
+        self.log(f'{stats.peer}: received {job.lines} lines into {job.filename} '
+                 f'({job.lines / max(time.monotonic() - started, 1e-9):.0f} lines/s)')
+        return job
+
+
+class Inotify:
+    "Minimal inotify binding through ctypes (Linux only), reporting files that were written or moved into a directory."
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_TO = 0x80
+    IN_Q_OVERFLOW = 0x4000
+    _EVENT = struct.Struct('iIII') # wd, mask, cookie, len, followed by the name
+
+    def __init__(self, directory: str) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f'Cannot watch {directory}')
+
+    def read(self, timeout=None) -> list:
+        """Wait up to timeout seconds for events and return the names of the files.
+
+        Returns None instead of a list if the kernel dropped events because of a queue overflow.
+        """
+        readable, _w, _e = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        names = []
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _wd, mask, _cookie, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                if mask & self.IN_Q_OVERFLOW:
+                    overflow = True
+                elif length:
+                    names.append(os.fsdecode(data[offset:offset + length].rstrip(b'\0')))
+                offset += length
+        return None if overflow else names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def translate_job(filename: str):
+    "Translate a G-code file from the hot folder. Returns the translated filename, or None if it was already processed."
+    translator = GcodeTranslator()
+    with open(filename, 'rb') as f:
+        if translator.is_already_processed(f.read(translator.HEADER_CHECK_SIZE)):
+            return None
+    return translator.translate_file(filename)
+
+
+class HotFolder:
+    """Translates G-code files saved into a directory and uploads them one after another.
+
+    New files are reported by inotify, so the directory is only scanned again if
+    the kernel's event queue overflowed. Files are translated in a worker pool
+    and the results are queued for upload. A job is uploaded when the machine is
+    idle; the next one waits until the machine has run it (or start_timeout passed).
+    """
+    EXTENSIONS = ('.gcode', '.gc', '.nc')
+
+    def __init__(self, directory: str, m1, workers=None, material_thickness=None, start_timeout=None,
+                 executor=None, log=print) -> None:
+        self.directory = directory
+        self.m1 = m1
+        self.material_thickness = material_thickness
+        self.start_timeout = start_timeout
+        self.executor = executor or ProcessPoolExecutor(workers)
+        self.log = log
+        self.seen = set()
+        self.uploads = queue.Queue()
+        self.uploaded = []
+        self.failed = []
+        self.watcher = StatusWatcher(m1)
+        self._inotify = Inotify(directory)
+        self._stopping = threading.Event()
+        self._uploader = threading.Thread(target=self._upload_jobs, name='hot-folder-upload', daemon=True)
+
+    def wants(self, name: str) -> bool:
+        "Whether a file name looks like a new G-code job. Our own translated files are ignored."
+        return name.lower().endswith(self.EXTENSIONS) and '.xtm1.' not in name and not name.startswith('.')
+
+    def add(self, name: str, rescan=False) -> None:
+        "Translate a file of the directory. When rescanning, files that were already seen are skipped."
+        path = os.path.join(self.directory, name)
+        if not self.wants(name) or (rescan and path in self.seen):
+            return
+        self.seen.add(path)
+        future = self.executor.submit(translate_job, path)
+        future.add_done_callback(lambda future: self._translated(path, future))
+
+    def _translated(self, path: str, future) -> None:
+        try:
+            translated = future.result()
+        except Exception as e:
+            self.log(f'{path}: cannot translate: {e}')
+            self.failed.append(path)
+            return
+        if translated is None:
+            self.log(f'{path}: already processed, ignoring it')
+            return
+        self.log(f'{path}: translated to {translated}, queued for upload')
+        self.uploads.put(translated)
+
+    def poll(self, timeout=None) -> None:
+        "Handle the events that arrive within timeout seconds."
+        names = self._inotify.read(timeout)
+        if names is not None:
+            for name in names:
+                self.add(name)
+            return
+        self.log('Too many files at once, scanning the directory')
+        for name in sorted(os.listdir(self.directory)):
+            self.add(name, rescan=True)
+
+    def start(self) -> None:
+        self.watcher.start()
+        self._uploader.start()
+
+    def run(self) -> None:
+        "Watch the directory until stop() is called (or Ctrl+C)."
+        self.start()
+        self.log(f'Watching {self.directory} for G-code files... Stop with Ctrl+C')
+        try:
+            while not self._stopping.is_set():
+                self.poll(timeout=0.5)
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self.uploads.put(None)
+        if self._uploader.is_alive():
+            self._uploader.join()
+        self.watcher.stop()
+        self.executor.shutdown()
+        self._inotify.close()
+
+    def _wait_until(self, predicate, timeout=None) -> bool:
+        "StatusWatcher.wait_until(), but giving up when stop() is called."
+        waited = 0.0
+        while not self._stopping.is_set():
+            step = 0.5 if timeout is None else min(0.5, timeout - waited)
+            if self.watcher.wait_until(predicate, step):
+                return True
+            waited += step
+            if timeout is not None and waited >= timeout:
+                break
+        return False
+
+    def _upload_jobs(self) -> None:
+        is_idle = lambda state: state in IDLE_STATES
+        while True:
+            filename = self.uploads.get()
+            if filename is None:
+                return
+            while self._wait_until(is_idle):
+                try:
+                    reply = self.m1.upload_gcode_file(filename, material_thickness=self.material_thickness)
+                except Exception as e:
+                    self.log(f'{filename}: upload failed: {e}')
+                    self.failed.append(filename)
+                    break
+                if reply is False:
+                    continue # The machine was not idle after all
+                self.log(f'{filename}: uploaded, press the button on the M1 to run it')
+                self.uploaded.append(filename)
+                # Don't replace the job before it was run
+                self.watcher.poke()
+                if self._wait_until(lambda state: not is_idle(state), self.start_timeout):
+                    self._wait_until(is_idle)
+                break
@@ -1,49 +1,83 @@
 #!/usr/bin/env python3
 
+import importlib
+import os
 import sys
 import traceback
 
+# Only the modules for talking to the machine are imported at startup. The actions import
+# the rest (NumPy, OpenCV, SciPy, tkinter and PIL are slow to import) when they need it.
 from xtm1 import XTM1, GcodeTranslator
-from gcode import GcodeFramer
-from xtm1_camera import camera_stream, get_undistorted_camera_image
-from PIL import Image
+from xtm1_cache import TranslationCache
 
 translator = GcodeTranslator()
 
+def lazy(module: str, name: str):
+    "Attribute name of module, which is imported on first use."
+    return getattr(importlib.import_module(module), name)
+
+def frame_gcode(filename):
+    if filename.endswith(lazy('xtm1_job', 'SUFFIX')):
+        with lazy('xtm1_job', 'JobFile')(filename) as job:
+            return job.frame_gcode()
+    return lazy('gcode', 'GcodeFramer')().calculate_frame_file(filename)
+
+def translate_optimized(filename, *optimizers):
+    translator.optimizers = list(optimizers)
+    new_filename = translator.translate_file(filename)
+    return '\n'.join([new_filename] + [optimizer.report() for optimizer in optimizers])
+
+def upload_file(filename, material_thickness=None):
+    if m1.cache is None:
+        m1.cache = TranslationCache() # Creates the cache directory, so only for uploads of files
+    return m1.upload_gcode_file(filename, material_thickness=material_thickness)
+
 #m1 = XTM1()
-m1 = XTM1('192.168.178.125')
+m1 = XTM1(os.environ.get('XTM1_IP', '192.168.178.125'))
+# args are the command line arguments, starting with the option
 actions = {
-    '--status': lambda: m1.get_status(),
-    '--stop': lambda: m1.stop(),
-    '--gcode': lambda: m1.execute_gcode_command(' '.join(sys.argv[2:])),
-    '--frame': lambda: m1.upload_gcode(GcodeFramer().calculate_frame_file(sys.argv[2])),
-    '--upload': lambda: m1.upload_gcode_file(sys.argv[2]),
-    '--upload-z': lambda: m1.upload_gcode_file(sys.argv[2], material_thickness=float(sys.argv[3])),
-    '--upload-auto': lambda: m1.upload_gcode_file(sys.argv[2], material_thickness='auto'),
-    '--translate': lambda: translator.translate_file(sys.argv[2]),
-    '--laserpointer': lambda: m1.set_laserpointer(sys.argv[2].lower() == 'on'),
-    '--thickness': lambda: m1.measure_thickness(),
-    '--light': lambda: m1.set_light_brightness(sys.argv[2]),
-    '--camera': lambda: get_undistorted_camera_image(m1, (4000,3000)).save('camera.jpg') or 'wrote camera.jpg',
-    '--camera-raw': lambda: open('camera-raw.jpg', 'wb').write(m1.get_camera_image()),
-    '--camera-stream': lambda: camera_stream(m1, m1.get_camera_calibration()),
-    '--camera-stream-raw': lambda: camera_stream(m1),
+    '--status': lambda args: m1.get_status(),
+    '--stop': lambda args: m1.stop(),
+    '--gcode': lambda args: m1.execute_gcode_command(' '.join(args[1:])),
+    '--frame': lambda args: m1.upload_gcode(frame_gcode(args[1])),
+    '--upload': lambda args: upload_file(args[1]),
+    '--upload-z': lambda args: upload_file(args[1], material_thickness=float(args[2])),
+    '--upload-auto': lambda args: upload_file(args[1], material_thickness='auto'),
+    '--translate': lambda args: translator.translate_file(args[1]),
+    '--translate-simplified': lambda args: translate_optimized(args[1], lazy('gcode_optimize', 'GcodeSimplifier')()),
+    '--estimate': lambda args: lazy('gcode_estimate', 'estimate_file')(args[1]),
+    '--job': lambda args: lazy('xtm1_job', 'create_job')(args[1]),
+    '--translate-reordered': lambda args: translate_optimized(args[1], lazy('gcode_optimize', 'CutOrderOptimizer')(),
+                                                              lazy('gcode_optimize', 'GcodeSimplifier')()),
+    '--laserpointer': lambda args: m1.set_laserpointer(args[1].lower() == 'on'),
+    '--thickness': lambda args: m1.measure_thickness(),
+    '--light': lambda args: m1.set_light_brightness(args[1]),
+    '--camera': lambda args: lazy('xtm1_camera', 'get_undistorted_camera_image')(m1, (4000,3000)).save('camera.jpg') or 'wrote camera.jpg',
+    '--camera-raw': lambda args: open('camera-raw.jpg', 'wb').write(m1.get_camera_image()),
+    '--camera-stream': lambda args: lazy('xtm1_camera', 'camera_stream')(m1, m1.get_camera_calibration()),
+    '--camera-stream-raw': lambda args: lazy('xtm1_camera', 'camera_stream')(m1),
 }
 
-try:
-    action = actions[sys.argv[1]]
-except KeyError:
-    print(f'Unknown option {sys.argv[1]}', file=sys.stderr)
-    for option in actions.keys(): print(option)
-    sys.exit(1)
-except IndexError:
-    print('Supported options: ')
-    for option in actions.keys(): print(option)
-    sys.exit(2)
-
-try:
-    print(action())
-except IndexError as ex:
-    print(f'\nOption {sys.argv[1]} needs an argument. Please look at the code.\n\n')
-    traceback.print_exception(type(ex), ex, ex.__traceback__)
-    sys.exit(3)
+def main(argv=None) -> int:
+    args = (sys.argv if argv is None else argv)[1:]
+    try:
+        action = actions[args[0]]
+    except KeyError:
+        print(f'Unknown option {args[0]}', file=sys.stderr)
+        for option in actions.keys(): print(option)
+        return 1
+    except IndexError:
+        print('Supported options: ')
+        for option in actions.keys(): print(option)
+        return 2
+
+    try:
+        print(action(args))
+    except IndexError as ex:
+        print(f'\nOption {args[0]} needs an argument. Please look at the code.\n\n')
+        traceback.print_exception(type(ex), ex, ex.__traceback__)
+        return 3
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,2622 @@
+; LightBurn 1.2.01
+; Marlin device profile, absolute coords
+; Bounds: X173.5 Y155.05 to X213.54 Y164.35
+G21
+G90
+; Scan @ 60 mm/sec, 50% power
+M8
+M05
+G0 X203.12 Y164.35 F0
+G0 Z0
+; Layer C03 Pass 1 of 2
+G91
+G1 X-1.5 F3600 I S0
+G1 X-1.638 I S500
+G1 X-6.251 I S0
+G1 X-1.638 I S500
+G1 X-1.5 I S0
+G1 X-0.597Y-0.1 I S0
+G1 X1.5 I S0
+G1 X2.853 I S500
+G1 X5.036 I S0
+G1 X2.853 I S500
+G1 X1.5 I S0
+G1 X9.805Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.838 I S500
+G1 X-3.61 I S0
+G1 X-3.623 I S500
+G1 X-4.266 I S0
+G1 X-3.623 I S500
+G1 X-2.01 I S0
+G1 X-1.272 I S500
+G1 X-5.681 I S0
+G1 X-1.291 I S500
+G1 X-0.191 I S0
+G1 X-5.638 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X5.638 I S500
+G1 X0.229 I S0
+G1 X1.289 I S500
+G1 X5.609 I S0
+G1 X1.27 I S500
+G1 X1.701 I S0
+G1 X4.227 I S500
+G1 X3.662 I S0
+G1 X4.227 I S500
+G1 X3.353 I S0
+G1 X5.838 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.838 I S500
+G1 X-3.152 I S0
+G1 X-4.749 I S500
+G1 X-3.14 I S0
+G1 X-4.75 I S500
+G1 X-1.417 I S0
+G1 X-1.267 I S500
+G1 X-5.539 I S0
+G1 X-1.286 I S500
+G1 X-0.267 I S0
+G1 X-5.638 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X5.638 I S500
+G1 X0.305 I S0
+G1 X1.284 I S500
+G1 X5.467 I S0
+G1 X1.265 I S500
+G1 X1.168 I S0
+G1 X5.2 I S500
+G1 X2.689 I S0
+G1 X5.2 I S500
+G1 X2.989 I S0
+G1 X5.838 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.838 I S500
+G1 X-2.85 I S0
+G1 X-5.404 I S500
+G1 X-2.485 I S0
+G1 X-5.404 I S500
+G1 X-1.142 I S0
+G1 X-1.261 I S500
+G1 X-5.396 I S0
+G1 X-1.281 I S500
+G1 X-0.344 I S0
+G1 X-5.638 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X5.638 I S500
+G1 X0.382 I S0
+G1 X1.278 I S500
+G1 X5.325 I S0
+G1 X1.259 I S500
+G1 X1.18 I S0
+G1 X5.541 I S500
+G1 X2.348 I S0
+G1 X5.541 I S500
+G1 X2.713 I S0
+G1 X5.838 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.838 I S500
+G1 X-2.613 I S0
+G1 X-5.641 I S500
+G1 X-2.248 I S0
+G1 X-5.641 I S500
+G1 X-1.218 I S0
+G1 X-1.256 I S500
+G1 X-5.255 I S0
+G1 X-1.275 I S500
+G1 X-0.42 I S0
+G1 X-5.638 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X5.638 I S500
+G1 X0.458 I S0
+G1 X1.273 I S500
+G1 X5.183 I S0
+G1 X1.254 I S500
+G1 X1.256 I S0
+G1 X5.741 I S500
+G1 X2.148 I S0
+G1 X5.741 I S500
+G1 X2.513 I S0
+G1 X5.838 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.838 I S500
+G1 X-2.414 I S0
+G1 X-2.239 I S500
+G1 X-1.347 I S0
+G1 X-2.254 I S500
+G1 X-2.049 I S0
+G1 X-2.239 I S500
+G1 X-1.347 I S0
+G1 X-2.254 I S500
+G1 X-1.294 I S0
+G1 X-1.251 I S500
+G1 X-5.112 I S0
+G1 X-1.271 I S500
+G1 X-0.496 I S0
+G1 X-5.638 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X5.638 I S500
+G1 X0.535 I S0
+G1 X1.267 I S500
+G1 X5.041 I S0
+G1 X1.249 I S500
+G1 X1.332 I S0
+G1 X1.73 I S500
+G1 X2.235 I S0
+G1 X1.939 I S500
+G1 X1.985 I S0
+G1 X1.73 I S500
+G1 X2.235 I S0
+G1 X1.939 I S500
+G1 X2.35 I S0
+G1 X5.838 I S500
+G1 X1.5 I S0
+G1 X-4.612Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.288 I S0
+G1 X-1.76 I S500
+G1 X-2.884 I S0
+G1 X-1.322 I S500
+G1 X-1.923 I S0
+G1 X-1.76 I S500
+G1 X-2.884 I S0
+G1 X-1.322 I S500
+G1 X-1.37 I S0
+G1 X-1.246 I S500
+G1 X-4.97 I S0
+G1 X-1.265 I S500
+G1 X-4.985 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.023 I S0
+G1 X1.262 I S500
+G1 X4.899 I S0
+G1 X1.244 I S500
+G1 X1.408 I S0
+G1 X1.048 I S500
+G1 X3.356 I S0
+G1 X1.623 I S500
+G1 X1.862 I S0
+G1 X1.048 I S500
+G1 X3.356 I S0
+G1 X1.624 I S500
+G1 X2.226 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.17 I S0
+G1 X-1.537 I S500
+G1 X-3.773 I S0
+G1 X-0.774 I S500
+G1 X-1.806 I S0
+G1 X-1.536 I S500
+G1 X-3.773 I S0
+G1 X-0.774 I S500
+G1 X-1.446 I S0
+G1 X-1.241 I S500
+G1 X-4.828 I S0
+G1 X-1.26 I S500
+G1 X-5.061 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.099 I S0
+G1 X1.257 I S500
+G1 X4.757 I S0
+G1 X1.238 I S500
+G1 X1.485 I S0
+G1 X0.551 I S500
+G1 X4.106 I S0
+G1 X1.467 I S500
+G1 X1.765 I S0
+G1 X0.551 I S500
+G1 X4.106 I S0
+G1 X1.467 I S500
+G1 X2.13 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.09 I S0
+G1 X-1.419 I S500
+G1 X-4.387 I S0
+G1 X-0.358 I S500
+G1 X-1.725 I S0
+G1 X-1.419 I S500
+G1 X-4.388 I S0
+G1 X-0.357 I S500
+G1 X-1.523 I S0
+G1 X-1.235 I S500
+G1 X-4.686 I S0
+G1 X-1.254 I S500
+G1 X-5.138 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.176 I S0
+G1 X1.251 I S500
+G1 X4.615 I S0
+G1 X1.233 I S500
+G1 X1.561 I S0
+G1 X0.164 I S500
+G1 X4.659 I S0
+G1 X1.381 I S500
+G1 X1.685 I S0
+G1 X0.165 I S500
+G1 X4.658 I S0
+G1 X1.381 I S500
+G1 X2.05 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.015 I S0
+G1 X-1.357 I S500
+G1 X-6.532 I S0
+G1 X-1.357 I S500
+G1 X-6.481 I S0
+G1 X-1.23 I S500
+G1 X-4.544 I S0
+G1 X-1.249 I S500
+G1 X-5.214 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.252 I S0
+G1 X1.246 I S500
+G1 X4.473 I S0
+G1 X1.228 I S500
+G1 X6.572 I S0
+G1 X1.326 I S500
+G1 X6.563 I S0
+G1 X1.326 I S500
+G1 X1.993 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.971 I S0
+G1 X-1.307 I S500
+G1 X-6.582 I S0
+G1 X-1.307 I S500
+G1 X-6.651 I S0
+G1 X-1.225 I S500
+G1 X-4.402 I S0
+G1 X-1.244 I S500
+G1 X-5.29 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.329 I S0
+G1 X1.24 I S500
+G1 X4.331 I S0
+G1 X1.223 I S500
+G1 X6.723 I S0
+G1 X1.294 I S500
+G1 X6.595 I S0
+G1 X1.294 I S500
+G1 X1.95 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.929 I S0
+G1 X-1.29 I S500
+G1 X-6.6 I S0
+G1 X-1.29 I S500
+G1 X-6.785 I S0
+G1 X-1.22 I S500
+G1 X-4.26 I S0
+G1 X-1.238 I S500
+G1 X-5.367 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.405 I S0
+G1 X1.235 I S500
+G1 X4.189 I S0
+G1 X1.218 I S500
+G1 X6.842 I S0
+G1 X1.276 I S500
+G1 X6.613 I S0
+G1 X1.276 I S500
+G1 X1.925 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.921 I S0
+G1 X-1.271 I S500
+G1 X-6.618 I S0
+G1 X-1.271 I S500
+G1 X-6.889 I S0
+G1 X-1.215 I S500
+G1 X-4.118 I S0
+G1 X-1.233 I S500
+G1 X-5.443 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.481 I S0
+G1 X6.489 I S500
+G1 X6.933 I S0
+G1 X1.27 I S500
+G1 X6.62 I S0
+G1 X1.27 I S500
+G1 X1.916 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.912 I S0
+G1 X-1.281 I S500
+G1 X-6.608 I S0
+G1 X-1.281 I S500
+G1 X-6.965 I S0
+G1 X-6.412 I S500
+G1 X-5.52 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.558 I S0
+G1 X6.336 I S500
+G1 X6.996 I S0
+G1 X1.288 I S500
+G1 X6.601 I S0
+G1 X1.288 I S500
+G1 X1.912 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.912 I S0
+G1 X-1.302 I S500
+G1 X-6.587 I S0
+G1 X-1.302 I S500
+G1 X-7.02 I S0
+G1 X-6.26 I S500
+G1 X-5.596 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.634 I S0
+G1 X6.184 I S500
+G1 X7.044 I S0
+G1 X1.315 I S500
+G1 X6.574 I S0
+G1 X1.315 I S500
+G1 X1.913 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.925 I S0
+G1 X-1.333 I S500
+G1 X-6.556 I S0
+G1 X-1.333 I S500
+G1 X-7.052 I S0
+G1 X-6.108 I S500
+G1 X-5.672 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.71 I S0
+G1 X6.032 I S500
+G1 X7.06 I S0
+G1 X1.35 I S500
+G1 X6.539 I S0
+G1 X1.35 I S500
+G1 X1.938 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.954 I S0
+G1 X-1.381 I S500
+G1 X-6.508 I S0
+G1 X-1.382 I S500
+G1 X-7.05 I S0
+G1 X-5.955 I S500
+G1 X-5.749 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.787 I S0
+G1 X5.879 I S500
+G1 X7.037 I S0
+G1 X1.409 I S500
+G1 X6.48 I S0
+G1 X1.409 I S500
+G1 X1.978 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.002 I S0
+G1 X-1.452 I S500
+G1 X-6.437 I S0
+G1 X-1.452 I S500
+G1 X-7.009 I S0
+G1 X-5.802 I S500
+G1 X-5.825 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.863 I S0
+G1 X1.212 I S500
+G1 X3.307 I S0
+G1 X1.207 I S500
+G1 X6.968 I S0
+G1 X1.498 I S500
+G1 X6.391 I S0
+G1 X1.498 I S500
+G1 X2.035 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.071 I S0
+G1 X-1.554 I S500
+G1 X-6.335 I S0
+G1 X-1.554 I S500
+G1 X-6.914 I S0
+G1 X-1.206 I S500
+G1 X-3.233 I S0
+G1 X-1.211 I S500
+G1 X-5.901 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.94 I S0
+G1 X1.209 I S500
+G1 X3.159 I S0
+G1 X1.205 I S500
+G1 X6.83 I S0
+G1 X1.636 I S500
+G1 X6.253 I S0
+G1 X1.637 I S500
+G1 X2.11 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.16 I S0
+G1 X-1.745 I S500
+G1 X-6.145 I S0
+G1 X-1.744 I S500
+G1 X-6.71 I S0
+G1 X-1.204 I S500
+G1 X-3.085 I S0
+G1 X-1.208 I S500
+G1 X-5.978 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.016 I S0
+G1 X1.207 I S500
+G1 X3.011 I S0
+G1 X1.203 I S500
+G1 X6.523 I S0
+G1 X1.92 I S500
+G1 X5.969 I S0
+G1 X1.92 I S500
+G1 X2.21 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.272 I S0
+G1 X-2.143 I S500
+G1 X-5.746 I S0
+G1 X-2.143 I S500
+G1 X-6.276 I S0
+G1 X-1.202 I S500
+G1 X-2.937 I S0
+G1 X-1.206 I S500
+G1 X-6.054 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.092 I S0
+G1 X1.205 I S500
+G1 X2.863 I S0
+G1 X1.201 I S500
+G1 X5.953 I S0
+G1 X2.438 I S500
+G1 X5.452 I S0
+G1 X2.438 I S500
+G1 X2.337 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.412 I S0
+G1 X-2.836 I S500
+G1 X-5.053 I S0
+G1 X-2.836 I S500
+G1 X-5.519 I S0
+G1 X-1.2 I S500
+G1 X-2.79 I S0
+G1 X-1.202 I S500
+G1 X-6.131 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.169 I S0
+G1 X1.201 I S500
+G1 X2.716 I S0
+G1 X1.199 I S500
+G1 X5.05 I S0
+G1 X3.26 I S500
+G1 X4.629 I S0
+G1 X3.26 I S500
+G1 X2.495 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.587 I S0
+G1 X-3.605 I S500
+G1 X-4.284 I S0
+G1 X-3.606 I S500
+G1 X-4.651 I S0
+G1 X-1.197 I S500
+G1 X-2.642 I S0
+G1 X-1.2 I S500
+G1 X-6.207 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.245 I S0
+G1 X1.199 I S500
+G1 X2.568 I S0
+G1 X1.196 I S500
+G1 X4.365 I S0
+G1 X3.825 I S500
+G1 X4.064 I S0
+G1 X3.825 I S500
+G1 X2.692 I S0
+G1 X5.541 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.541 I S500
+G1 X-2.823 I S0
+G1 X-3.943 I S500
+G1 X-3.947 I S0
+G1 X-3.942 I S500
+G1 X-4.154 I S0
+G1 X-1.195 I S500
+G1 X-2.494 I S0
+G1 X-1.198 I S500
+G1 X-6.283 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.322 I S0
+G1 X1.196 I S500
+G1 X2.42 I S0
+G1 X1.194 I S500
+G1 X3.963 I S0
+G1 X4.018 I S500
+G1 X3.871 I S0
+G1 X4.018 I S500
+G1 X2.977 I S0
+G1 X5.541 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.541 I S500
+G1 X-3.13 I S0
+G1 X-4.059 I S500
+G1 X-3.83 I S0
+G1 X-4.059 I S500
+G1 X-3.807 I S0
+G1 X-1.193 I S500
+G1 X-2.346 I S0
+G1 X-1.195 I S500
+G1 X-6.36 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.398 I S0
+G1 X1.194 I S500
+G1 X2.272 I S0
+G1 X1.192 I S500
+G1 X3.667 I S0
+G1 X4.042 I S500
+G1 X3.847 I S0
+G1 X4.042 I S500
+G1 X3.325 I S0
+G1 X5.541 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.541 I S500
+G1 X-3.53 I S0
+G1 X-3.98 I S500
+G1 X-3.909 I S0
+G1 X-3.98 I S500
+G1 X-3.562 I S0
+G1 X-1.191 I S500
+G1 X-2.199 I S0
+G1 X-1.192 I S500
+G1 X-6.436 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.474 I S0
+G1 X1.191 I S500
+G1 X2.125 I S0
+G1 X1.19 I S500
+G1 X3.485 I S0
+G1 X3.838 I S500
+G1 X4.051 I S0
+G1 X3.838 I S500
+G1 X3.787 I S0
+G1 X5.541 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.541 I S500
+G1 X-4.08 I S0
+G1 X-3.65 I S500
+G1 X-4.239 I S0
+G1 X-3.651 I S500
+G1 X-3.417 I S0
+G1 X-1.189 I S500
+G1 X-2.051 I S0
+G1 X-1.189 I S500
+G1 X-6.513 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.551 I S0
+G1 X1.188 I S500
+G1 X1.977 I S0
+G1 X1.188 I S500
+G1 X3.369 I S0
+G1 X3.256 I S500
+G1 X4.633 I S0
+G1 X3.257 I S500
+G1 X4.56 I S0
+G1 X5.541 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.541 I S500
+G1 X-5.049 I S0
+G1 X-2.847 I S500
+G1 X-5.042 I S0
+G1 X-2.848 I S500
+G1 X-3.328 I S0
+G1 X-1.186 I S500
+G1 X-1.903 I S0
+G1 X-1.187 I S500
+G1 X-6.589 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.627 I S0
+G1 X1.186 I S500
+G1 X1.829 I S0
+G1 X1.185 I S500
+G1 X3.3 I S0
+G1 X2.426 I S500
+G1 X5.463 I S0
+G1 X2.426 I S500
+G1 X5.537 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-5.938 I S0
+G1 X-2.087 I S500
+G1 X-5.802 I S0
+G1 X-2.087 I S500
+G1 X-3.276 I S0
+G1 X-1.184 I S500
+G1 X-1.755 I S0
+G1 X-1.185 I S500
+G1 X-6.665 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.703 I S0
+G1 X1.183 I S500
+G1 X1.682 I S0
+G1 X1.183 I S500
+G1 X3.263 I S0
+G1 X1.851 I S500
+G1 X6.038 I S0
+G1 X1.851 I S500
+G1 X6.225 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.454 I S0
+G1 X-1.67 I S500
+G1 X-6.219 I S0
+G1 X-1.67 I S500
+G1 X-3.253 I S0
+G1 X-1.182 I S500
+G1 X-1.608 I S0
+G1 X-1.181 I S500
+G1 X-6.742 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.78 I S0
+G1 X1.18 I S500
+G1 X1.534 I S0
+G1 X1.181 I S500
+G1 X3.255 I S0
+G1 X1.535 I S500
+G1 X6.354 I S0
+G1 X1.535 I S500
+G1 X6.625 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.734 I S0
+G1 X-1.462 I S500
+G1 X-6.427 I S0
+G1 X-1.462 I S500
+G1 X-3.257 I S0
+G1 X-1.18 I S500
+G1 X-1.46 I S0
+G1 X-1.179 I S500
+G1 X-6.818 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.856 I S0
+G1 X1.178 I S500
+G1 X1.386 I S0
+G1 X1.179 I S500
+G1 X3.27 I S0
+G1 X1.395 I S500
+G1 X6.494 I S0
+G1 X1.396 I S500
+G1 X6.825 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.888 I S0
+G1 X-1.356 I S500
+G1 X-6.533 I S0
+G1 X-1.356 I S500
+G1 X-3.285 I S0
+G1 X-1.178 I S500
+G1 X-1.312 I S0
+G1 X-1.177 I S500
+G1 X-6.894 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.933 I S0
+G1 X1.175 I S500
+G1 X1.238 I S0
+G1 X1.176 I S500
+G1 X3.307 I S0
+G1 X1.31 I S500
+G1 X6.579 I S0
+G1 X1.31 I S500
+G1 X6.951 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.982 I S0
+G1 X-1.289 I S500
+G1 X-6.6 I S0
+G1 X-1.289 I S500
+G1 X-3.335 I S0
+G1 X-1.175 I S500
+G1 X-1.164 I S0
+G1 X-1.174 I S500
+G1 X-6.971 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.009 I S0
+G1 X1.172 I S500
+G1 X1.091 I S0
+G1 X1.174 I S500
+G1 X3.363 I S0
+G1 X1.269 I S500
+G1 X6.621 I S0
+G1 X1.268 I S500
+G1 X7.012 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-7.038 I S0
+G1 X-1.246 I S500
+G1 X-6.644 I S0
+G1 X-1.245 I S500
+G1 X-3.398 I S0
+G1 X-1.173 I S500
+G1 X-1.017 I S0
+G1 X-1.171 I S500
+G1 X-7.047 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.085 I S0
+G1 X1.17 I S500
+G1 X0.943 I S0
+G1 X1.172 I S500
+G1 X3.434 I S0
+G1 X1.233 I S500
+G1 X6.656 I S0
+G1 X1.233 I S500
+G1 X7.053 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-7.064 I S0
+G1 X-1.224 I S500
+G1 X-6.665 I S0
+G1 X-1.224 I S500
+G1 X-3.47 I S0
+G1 X-1.171 I S500
+G1 X-0.869 I S0
+G1 X-1.168 I S500
+G1 X-7.124 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.162 I S0
+G1 X1.167 I S500
+G1 X0.795 I S0
+G1 X1.17 I S500
+G1 X3.505 I S0
+G1 X1.227 I S500
+G1 X6.662 I S0
+G1 X1.227 I S500
+G1 X7.064 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-7.06 I S0
+G1 X-1.229 I S500
+G1 X-6.66 I S0
+G1 X-1.229 I S500
+G1 X-3.545 I S0
+G1 X-1.169 I S500
+G1 X-0.721 I S0
+G1 X-1.166 I S500
+G1 X-7.2 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.238 I S0
+G1 X1.165 I S500
+G1 X0.647 I S0
+G1 X1.168 I S500
+G1 X3.599 I S0
+G1 X1.227 I S500
+G1 X6.662 I S0
+G1 X1.227 I S500
+G1 X7.046 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-7.026 I S0
+G1 X-1.23 I S500
+G1 X-6.659 I S0
+G1 X-1.23 I S500
+G1 X-3.654 I S0
+G1 X-1.167 I S500
+G1 X-0.574 I S0
+G1 X-1.163 I S500
+G1 X-7.276 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.315 I S0
+G1 X1.161 I S500
+G1 X0.5 I S0
+G1 X1.165 I S500
+G1 X3.709 I S0
+G1 X1.244 I S500
+G1 X6.646 I S0
+G1 X1.243 I S500
+G1 X6.996 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.958 I S0
+G1 X-1.265 I S500
+G1 X-6.624 I S0
+G1 X-1.265 I S500
+G1 X-3.764 I S0
+G1 X-1.164 I S500
+G1 X-0.426 I S0
+G1 X-1.16 I S500
+G1 X-7.353 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.391 I S0
+G1 X1.159 I S500
+G1 X0.352 I S0
+G1 X1.163 I S500
+G1 X3.831 I S0
+G1 X1.281 I S500
+G1 X6.608 I S0
+G1 X1.282 I S500
+G1 X6.912 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.852 I S0
+G1 X-1.305 I S500
+G1 X-6.585 I S0
+G1 X-1.305 I S500
+G1 X-3.905 I S0
+G1 X-1.162 I S500
+G1 X-0.278 I S0
+G1 X-1.158 I S500
+G1 X-7.429 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.467 I S0
+G1 X1.157 I S500
+G1 X0.204 I S0
+G1 X1.161 I S500
+G1 X3.98 I S0
+G1 X1.336 I S500
+G1 X4.307 I S0
+G1 X0.019 I S500
+G1 X2.227 I S0
+G1 X1.336 I S500
+G1 X4.308 I S0
+G1 X0.018 I S500
+G1 X2.459 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.459 I S0
+G1 X-0.239 I S500
+G1 X-4 I S0
+G1 X-1.386 I S500
+G1 X-2.264 I S0
+G1 X-0.239 I S500
+G1 X-4 I S0
+G1 X-1.386 I S500
+G1 X-4.055 I S0
+G1 X-1.16 I S500
+G1 X-0.13 I S0
+G1 X-1.155 I S500
+G1 X-7.506 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.544 I S0
+G1 X1.154 I S500
+G1 X0.056 I S0
+G1 X1.159 I S500
+G1 X4.135 I S0
+G1 X1.451 I S500
+G1 X3.673 I S0
+G1 X0.459 I S500
+G1 X2.306 I S0
+G1 X1.451 I S500
+G1 X3.673 I S0
+G1 X0.459 I S500
+G1 X2.459 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.459 I S0
+G1 X-0.712 I S500
+G1 X-3.276 I S0
+G1 X-1.535 I S500
+G1 X-2.366 I S0
+G1 X-0.712 I S500
+G1 X-3.277 I S0
+G1 X-1.534 I S500
+G1 X-4.233 I S0
+G1 X-2.293 I S500
+G1 X-7.582 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.62 I S0
+G1 X2.217 I S500
+G1 X4.331 I S0
+G1 X1.668 I S500
+G1 X2.775 I S0
+G1 X1.02 I S500
+G1 X2.426 I S0
+G1 X1.668 I S500
+G1 X2.775 I S0
+G1 X1.02 I S500
+G1 X2.459 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 X4.504Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.73 I S500
+G1 X-2.459 I S0
+G1 X-1.393 I S500
+G1 X-2.157 I S0
+G1 X-1.853 I S500
+G1 X-2.486 I S0
+G1 X-1.393 I S500
+G1 X-2.157 I S0
+G1 X-1.853 I S500
+G1 X-4.43 I S0
+G1 X-2.14 I S500
+G1 X-7.658 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.697 I S0
+G1 X2.063 I S500
+G1 X4.536 I S0
+G1 X2.143 I S500
+G1 X1.28 I S0
+G1 X1.912 I S500
+G1 X2.554 I S0
+G1 X2.143 I S500
+G1 X1.28 I S0
+G1 X1.912 I S500
+G1 X2.459 I S0
+G1 X5.73 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.73 I S500
+G1 X-2.459 I S0
+G1 X-5.236 I S500
+G1 X-2.653 I S0
+G1 X-5.236 I S500
+G1 X-4.673 I S0
+G1 X-1.987 I S500
+G1 X-7.735 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.773 I S0
+G1 X1.911 I S500
+G1 X4.81 I S0
+G1 X5.137 I S500
+G1 X2.753 I S0
+G1 X5.136 I S500
+G1 X2.459 I S0
+G1 X5.73 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.73 I S500
+G1 X-2.459 I S0
+G1 X-5.037 I S500
+G1 X-2.852 I S0
+G1 X-5.037 I S500
+G1 X-4.948 I S0
+G1 X-1.835 I S500
+G1 X-7.811 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.849 I S0
+G1 X1.759 I S500
+G1 X5.114 I S0
+G1 X4.909 I S500
+G1 X2.981 I S0
+G1 X4.908 I S500
+G1 X2.459 I S0
+G1 X5.73 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.73 I S500
+G1 X-2.459 I S0
+G1 X-4.766 I S500
+G1 X-3.123 I S0
+G1 X-4.766 I S500
+G1 X-5.295 I S0
+G1 X-1.683 I S500
+G1 X-7.887 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.926 I S0
+G1 X1.606 I S500
+G1 X5.475 I S0
+G1 X4.584 I S500
+G1 X3.305 I S0
+G1 X4.584 I S500
+G1 X2.499 I S0
+G1 X5.73 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.73 I S500
+G1 X-2.829 I S0
+G1 X-4.05 I S500
+G1 X-3.839 I S0
+G1 X-4.05 I S500
+G1 X-5.717 I S0
+G1 X-1.53 I S500
+G1 X-7.964 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X8.002 I S0
+G1 X1.454 I S500
+G1 X5.969 I S0
+G1 X3.465 I S500
+G1 X4.424 I S0
+G1 X3.466 I S500
+G1 X3.199 I S0
+G1 X5.73 I S500
+G1 X1.5 I S0
+G1 X-9.375Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-2.681 I S500
+G1 X-5.208 I S0
+G1 X-2.682 I S500
+G1 X-1.5 I S0
+G1 X0.496Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.497 I S500
+G1 X6.393 I S0
+G1 X1.496 I S500
+G1 X1.5 I S0
+G90
+; Layer C03 Pass 2 of 2
+G0 Z-2
+G91
+G1 X-0.251Y9.3 I S0
+G1 X-1.5 I S0
+G1 X-1.638 I S500
+G1 X-6.251 I S0
+G1 X-1.638 I S500
+G1 X-1.5 I S0
+G1 X-0.597Y-0.1 I S0
+G1 X1.5 I S0
+G1 X2.853 I S500
+G1 X5.036 I S0
+G1 X2.853 I S500
+G1 X1.5 I S0
+G1 X9.805Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.838 I S500
+G1 X-3.61 I S0
+G1 X-3.623 I S500
+G1 X-4.266 I S0
+G1 X-3.623 I S500
+G1 X-2.01 I S0
+G1 X-1.272 I S500
+G1 X-5.681 I S0
+G1 X-1.291 I S500
+G1 X-0.191 I S0
+G1 X-5.638 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X5.638 I S500
+G1 X0.229 I S0
+G1 X1.289 I S500
+G1 X5.609 I S0
+G1 X1.27 I S500
+G1 X1.701 I S0
+G1 X4.227 I S500
+G1 X3.662 I S0
+G1 X4.227 I S500
+G1 X3.353 I S0
+G1 X5.838 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.838 I S500
+G1 X-3.152 I S0
+G1 X-4.749 I S500
+G1 X-3.14 I S0
+G1 X-4.75 I S500
+G1 X-1.417 I S0
+G1 X-1.267 I S500
+G1 X-5.539 I S0
+G1 X-1.286 I S500
+G1 X-0.267 I S0
+G1 X-5.638 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X5.638 I S500
+G1 X0.305 I S0
+G1 X1.284 I S500
+G1 X5.467 I S0
+G1 X1.265 I S500
+G1 X1.168 I S0
+G1 X5.2 I S500
+G1 X2.689 I S0
+G1 X5.2 I S500
+G1 X2.989 I S0
+G1 X5.838 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.838 I S500
+G1 X-2.85 I S0
+G1 X-5.404 I S500
+G1 X-2.485 I S0
+G1 X-5.404 I S500
+G1 X-1.142 I S0
+G1 X-1.261 I S500
+G1 X-5.396 I S0
+G1 X-1.281 I S500
+G1 X-0.344 I S0
+G1 X-5.638 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X5.638 I S500
+G1 X0.382 I S0
+G1 X1.278 I S500
+G1 X5.325 I S0
+G1 X1.259 I S500
+G1 X1.18 I S0
+G1 X5.541 I S500
+G1 X2.348 I S0
+G1 X5.541 I S500
+G1 X2.713 I S0
+G1 X5.838 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.838 I S500
+G1 X-2.613 I S0
+G1 X-5.641 I S500
+G1 X-2.248 I S0
+G1 X-5.641 I S500
+G1 X-1.218 I S0
+G1 X-1.256 I S500
+G1 X-5.254 I S0
+G1 X-1.276 I S500
+G1 X-0.42 I S0
+G1 X-5.638 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X5.638 I S500
+G1 X0.458 I S0
+G1 X1.273 I S500
+G1 X5.183 I S0
+G1 X1.254 I S500
+G1 X1.256 I S0
+G1 X5.741 I S500
+G1 X2.148 I S0
+G1 X5.741 I S500
+G1 X2.513 I S0
+G1 X5.838 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.838 I S500
+G1 X-2.414 I S0
+G1 X-2.239 I S500
+G1 X-1.347 I S0
+G1 X-2.254 I S500
+G1 X-2.049 I S0
+G1 X-2.239 I S500
+G1 X-1.347 I S0
+G1 X-2.254 I S500
+G1 X-1.294 I S0
+G1 X-1.251 I S500
+G1 X-5.112 I S0
+G1 X-1.271 I S500
+G1 X-0.496 I S0
+G1 X-5.638 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X5.638 I S500
+G1 X0.535 I S0
+G1 X1.267 I S500
+G1 X5.041 I S0
+G1 X1.249 I S500
+G1 X1.332 I S0
+G1 X1.73 I S500
+G1 X2.235 I S0
+G1 X1.939 I S500
+G1 X1.985 I S0
+G1 X1.73 I S500
+G1 X2.235 I S0
+G1 X1.939 I S500
+G1 X2.35 I S0
+G1 X5.838 I S500
+G1 X1.5 I S0
+G1 X-4.612Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.288 I S0
+G1 X-1.76 I S500
+G1 X-2.884 I S0
+G1 X-1.322 I S500
+G1 X-1.923 I S0
+G1 X-1.76 I S500
+G1 X-2.884 I S0
+G1 X-1.322 I S500
+G1 X-1.37 I S0
+G1 X-1.246 I S500
+G1 X-4.97 I S0
+G1 X-1.265 I S500
+G1 X-4.985 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.023 I S0
+G1 X1.262 I S500
+G1 X4.899 I S0
+G1 X1.244 I S500
+G1 X1.408 I S0
+G1 X1.048 I S500
+G1 X3.356 I S0
+G1 X1.623 I S500
+G1 X1.862 I S0
+G1 X1.048 I S500
+G1 X3.356 I S0
+G1 X1.624 I S500
+G1 X2.226 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.17 I S0
+G1 X-1.537 I S500
+G1 X-3.773 I S0
+G1 X-0.774 I S500
+G1 X-1.806 I S0
+G1 X-1.536 I S500
+G1 X-3.773 I S0
+G1 X-0.774 I S500
+G1 X-1.446 I S0
+G1 X-1.241 I S500
+G1 X-4.828 I S0
+G1 X-1.26 I S500
+G1 X-5.061 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.099 I S0
+G1 X1.257 I S500
+G1 X4.757 I S0
+G1 X1.238 I S500
+G1 X1.485 I S0
+G1 X0.551 I S500
+G1 X4.106 I S0
+G1 X1.467 I S500
+G1 X1.765 I S0
+G1 X0.551 I S500
+G1 X4.106 I S0
+G1 X1.467 I S500
+G1 X2.13 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.09 I S0
+G1 X-1.419 I S500
+G1 X-4.387 I S0
+G1 X-0.358 I S500
+G1 X-1.725 I S0
+G1 X-1.419 I S500
+G1 X-4.388 I S0
+G1 X-0.357 I S500
+G1 X-1.523 I S0
+G1 X-1.235 I S500
+G1 X-4.686 I S0
+G1 X-1.254 I S500
+G1 X-5.138 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.176 I S0
+G1 X1.251 I S500
+G1 X4.615 I S0
+G1 X1.233 I S500
+G1 X1.561 I S0
+G1 X0.164 I S500
+G1 X4.659 I S0
+G1 X1.381 I S500
+G1 X1.685 I S0
+G1 X0.165 I S500
+G1 X4.658 I S0
+G1 X1.381 I S500
+G1 X2.05 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.015 I S0
+G1 X-1.357 I S500
+G1 X-6.532 I S0
+G1 X-1.357 I S500
+G1 X-6.481 I S0
+G1 X-1.23 I S500
+G1 X-4.544 I S0
+G1 X-1.249 I S500
+G1 X-5.214 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.252 I S0
+G1 X1.246 I S500
+G1 X4.473 I S0
+G1 X1.228 I S500
+G1 X6.572 I S0
+G1 X1.326 I S500
+G1 X6.563 I S0
+G1 X1.326 I S500
+G1 X1.993 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.971 I S0
+G1 X-1.307 I S500
+G1 X-6.582 I S0
+G1 X-1.307 I S500
+G1 X-6.651 I S0
+G1 X-1.225 I S500
+G1 X-4.402 I S0
+G1 X-1.244 I S500
+G1 X-5.29 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.329 I S0
+G1 X1.24 I S500
+G1 X4.331 I S0
+G1 X1.223 I S500
+G1 X6.723 I S0
+G1 X1.294 I S500
+G1 X6.595 I S0
+G1 X1.294 I S500
+G1 X1.95 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.929 I S0
+G1 X-1.29 I S500
+G1 X-6.6 I S0
+G1 X-1.29 I S500
+G1 X-6.785 I S0
+G1 X-1.22 I S500
+G1 X-4.26 I S0
+G1 X-1.238 I S500
+G1 X-5.367 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.405 I S0
+G1 X1.235 I S500
+G1 X4.189 I S0
+G1 X1.218 I S500
+G1 X6.842 I S0
+G1 X1.276 I S500
+G1 X6.613 I S0
+G1 X1.276 I S500
+G1 X1.925 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.921 I S0
+G1 X-1.271 I S500
+G1 X-6.618 I S0
+G1 X-1.271 I S500
+G1 X-6.889 I S0
+G1 X-1.215 I S500
+G1 X-4.118 I S0
+G1 X-1.233 I S500
+G1 X-5.443 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.481 I S0
+G1 X6.489 I S500
+G1 X6.933 I S0
+G1 X1.27 I S500
+G1 X6.62 I S0
+G1 X1.27 I S500
+G1 X1.916 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.912 I S0
+G1 X-1.281 I S500
+G1 X-6.608 I S0
+G1 X-1.281 I S500
+G1 X-6.965 I S0
+G1 X-6.412 I S500
+G1 X-5.52 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.558 I S0
+G1 X6.336 I S500
+G1 X6.996 I S0
+G1 X1.288 I S500
+G1 X6.601 I S0
+G1 X1.288 I S500
+G1 X1.912 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.912 I S0
+G1 X-1.302 I S500
+G1 X-6.587 I S0
+G1 X-1.302 I S500
+G1 X-7.02 I S0
+G1 X-6.26 I S500
+G1 X-5.596 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.634 I S0
+G1 X6.184 I S500
+G1 X7.044 I S0
+G1 X1.315 I S500
+G1 X6.574 I S0
+G1 X1.315 I S500
+G1 X1.913 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.925 I S0
+G1 X-1.333 I S500
+G1 X-6.556 I S0
+G1 X-1.333 I S500
+G1 X-7.052 I S0
+G1 X-6.108 I S500
+G1 X-5.672 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.71 I S0
+G1 X6.032 I S500
+G1 X7.06 I S0
+G1 X1.35 I S500
+G1 X6.539 I S0
+G1 X1.35 I S500
+G1 X1.938 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-1.954 I S0
+G1 X-1.381 I S500
+G1 X-6.508 I S0
+G1 X-1.382 I S500
+G1 X-7.05 I S0
+G1 X-5.955 I S500
+G1 X-5.749 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.787 I S0
+G1 X5.879 I S500
+G1 X7.037 I S0
+G1 X1.409 I S500
+G1 X6.48 I S0
+G1 X1.409 I S500
+G1 X1.978 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.002 I S0
+G1 X-1.452 I S500
+G1 X-6.437 I S0
+G1 X-1.452 I S500
+G1 X-7.009 I S0
+G1 X-5.802 I S500
+G1 X-5.825 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.863 I S0
+G1 X1.212 I S500
+G1 X3.307 I S0
+G1 X1.207 I S500
+G1 X6.968 I S0
+G1 X1.498 I S500
+G1 X6.391 I S0
+G1 X1.498 I S500
+G1 X2.035 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.071 I S0
+G1 X-1.554 I S500
+G1 X-6.335 I S0
+G1 X-1.554 I S500
+G1 X-6.914 I S0
+G1 X-1.206 I S500
+G1 X-3.233 I S0
+G1 X-1.211 I S500
+G1 X-5.901 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X5.94 I S0
+G1 X1.209 I S500
+G1 X3.159 I S0
+G1 X1.205 I S500
+G1 X6.83 I S0
+G1 X1.636 I S500
+G1 X6.253 I S0
+G1 X1.637 I S500
+G1 X2.11 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.16 I S0
+G1 X-1.745 I S500
+G1 X-6.145 I S0
+G1 X-1.744 I S500
+G1 X-6.71 I S0
+G1 X-1.204 I S500
+G1 X-3.085 I S0
+G1 X-1.208 I S500
+G1 X-5.978 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.016 I S0
+G1 X1.207 I S500
+G1 X3.011 I S0
+G1 X1.203 I S500
+G1 X6.523 I S0
+G1 X1.92 I S500
+G1 X5.969 I S0
+G1 X1.92 I S500
+G1 X2.21 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.272 I S0
+G1 X-2.143 I S500
+G1 X-5.746 I S0
+G1 X-2.143 I S500
+G1 X-6.276 I S0
+G1 X-1.202 I S500
+G1 X-2.937 I S0
+G1 X-1.206 I S500
+G1 X-6.054 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.092 I S0
+G1 X1.205 I S500
+G1 X2.863 I S0
+G1 X1.201 I S500
+G1 X5.953 I S0
+G1 X2.438 I S500
+G1 X5.452 I S0
+G1 X2.438 I S500
+G1 X2.337 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.412 I S0
+G1 X-2.836 I S500
+G1 X-5.053 I S0
+G1 X-2.836 I S500
+G1 X-5.519 I S0
+G1 X-1.2 I S500
+G1 X-2.789 I S0
+G1 X-1.203 I S500
+G1 X-6.131 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.169 I S0
+G1 X1.201 I S500
+G1 X2.716 I S0
+G1 X1.199 I S500
+G1 X5.05 I S0
+G1 X3.26 I S500
+G1 X4.629 I S0
+G1 X3.26 I S500
+G1 X2.495 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.587 I S0
+G1 X-3.605 I S500
+G1 X-4.284 I S0
+G1 X-3.606 I S500
+G1 X-4.651 I S0
+G1 X-1.197 I S500
+G1 X-2.642 I S0
+G1 X-1.2 I S500
+G1 X-6.207 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.245 I S0
+G1 X1.199 I S500
+G1 X2.568 I S0
+G1 X1.196 I S500
+G1 X4.365 I S0
+G1 X3.825 I S500
+G1 X4.064 I S0
+G1 X3.825 I S500
+G1 X2.692 I S0
+G1 X5.541 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.541 I S500
+G1 X-2.823 I S0
+G1 X-3.943 I S500
+G1 X-3.947 I S0
+G1 X-3.942 I S500
+G1 X-4.154 I S0
+G1 X-1.195 I S500
+G1 X-2.494 I S0
+G1 X-1.198 I S500
+G1 X-6.283 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.322 I S0
+G1 X1.196 I S500
+G1 X2.42 I S0
+G1 X1.194 I S500
+G1 X3.963 I S0
+G1 X4.018 I S500
+G1 X3.871 I S0
+G1 X4.018 I S500
+G1 X2.977 I S0
+G1 X5.541 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.541 I S500
+G1 X-3.13 I S0
+G1 X-4.059 I S500
+G1 X-3.83 I S0
+G1 X-4.059 I S500
+G1 X-3.807 I S0
+G1 X-1.193 I S500
+G1 X-2.346 I S0
+G1 X-1.195 I S500
+G1 X-6.36 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.398 I S0
+G1 X1.194 I S500
+G1 X2.272 I S0
+G1 X1.192 I S500
+G1 X3.667 I S0
+G1 X4.042 I S500
+G1 X3.847 I S0
+G1 X4.042 I S500
+G1 X3.325 I S0
+G1 X5.541 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.541 I S500
+G1 X-3.53 I S0
+G1 X-3.98 I S500
+G1 X-3.909 I S0
+G1 X-3.98 I S500
+G1 X-3.562 I S0
+G1 X-1.191 I S500
+G1 X-2.199 I S0
+G1 X-1.192 I S500
+G1 X-6.436 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.474 I S0
+G1 X1.191 I S500
+G1 X2.125 I S0
+G1 X1.19 I S500
+G1 X3.485 I S0
+G1 X3.838 I S500
+G1 X4.051 I S0
+G1 X3.838 I S500
+G1 X3.787 I S0
+G1 X5.541 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.541 I S500
+G1 X-4.08 I S0
+G1 X-3.65 I S500
+G1 X-4.239 I S0
+G1 X-3.65 I S500
+G1 X-3.418 I S0
+G1 X-1.189 I S500
+G1 X-2.051 I S0
+G1 X-1.189 I S500
+G1 X-6.513 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.551 I S0
+G1 X1.188 I S500
+G1 X1.977 I S0
+G1 X1.188 I S500
+G1 X3.369 I S0
+G1 X3.256 I S500
+G1 X4.633 I S0
+G1 X3.257 I S500
+G1 X4.56 I S0
+G1 X5.541 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.541 I S500
+G1 X-5.049 I S0
+G1 X-2.847 I S500
+G1 X-5.042 I S0
+G1 X-2.848 I S500
+G1 X-3.328 I S0
+G1 X-1.186 I S500
+G1 X-1.903 I S0
+G1 X-1.187 I S500
+G1 X-6.589 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.627 I S0
+G1 X1.186 I S500
+G1 X1.829 I S0
+G1 X1.185 I S500
+G1 X3.3 I S0
+G1 X2.426 I S500
+G1 X5.463 I S0
+G1 X2.426 I S500
+G1 X5.537 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-5.938 I S0
+G1 X-2.087 I S500
+G1 X-5.802 I S0
+G1 X-2.087 I S500
+G1 X-3.276 I S0
+G1 X-1.184 I S500
+G1 X-1.755 I S0
+G1 X-1.185 I S500
+G1 X-6.665 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.703 I S0
+G1 X1.183 I S500
+G1 X1.682 I S0
+G1 X1.183 I S500
+G1 X3.263 I S0
+G1 X1.851 I S500
+G1 X6.038 I S0
+G1 X1.851 I S500
+G1 X6.225 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.454 I S0
+G1 X-1.67 I S500
+G1 X-6.219 I S0
+G1 X-1.67 I S500
+G1 X-3.253 I S0
+G1 X-1.182 I S500
+G1 X-1.608 I S0
+G1 X-1.181 I S500
+G1 X-6.742 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.78 I S0
+G1 X1.18 I S500
+G1 X1.534 I S0
+G1 X1.181 I S500
+G1 X3.255 I S0
+G1 X1.535 I S500
+G1 X6.354 I S0
+G1 X1.535 I S500
+G1 X6.625 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.734 I S0
+G1 X-1.462 I S500
+G1 X-6.427 I S0
+G1 X-1.462 I S500
+G1 X-3.257 I S0
+G1 X-1.18 I S500
+G1 X-1.46 I S0
+G1 X-1.179 I S500
+G1 X-6.818 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.856 I S0
+G1 X1.178 I S500
+G1 X1.386 I S0
+G1 X1.179 I S500
+G1 X3.27 I S0
+G1 X1.395 I S500
+G1 X6.494 I S0
+G1 X1.396 I S500
+G1 X6.825 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.888 I S0
+G1 X-1.356 I S500
+G1 X-6.533 I S0
+G1 X-1.356 I S500
+G1 X-3.285 I S0
+G1 X-1.178 I S500
+G1 X-1.312 I S0
+G1 X-1.177 I S500
+G1 X-6.894 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X6.933 I S0
+G1 X1.175 I S500
+G1 X1.238 I S0
+G1 X1.176 I S500
+G1 X3.307 I S0
+G1 X1.31 I S500
+G1 X6.579 I S0
+G1 X1.31 I S500
+G1 X6.951 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.982 I S0
+G1 X-1.289 I S500
+G1 X-6.6 I S0
+G1 X-1.289 I S500
+G1 X-3.335 I S0
+G1 X-1.175 I S500
+G1 X-1.164 I S0
+G1 X-1.174 I S500
+G1 X-6.971 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.009 I S0
+G1 X1.172 I S500
+G1 X1.091 I S0
+G1 X1.174 I S500
+G1 X3.363 I S0
+G1 X1.269 I S500
+G1 X6.621 I S0
+G1 X1.268 I S500
+G1 X7.012 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-7.038 I S0
+G1 X-1.246 I S500
+G1 X-6.644 I S0
+G1 X-1.245 I S500
+G1 X-3.398 I S0
+G1 X-1.173 I S500
+G1 X-1.017 I S0
+G1 X-1.171 I S500
+G1 X-7.047 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.085 I S0
+G1 X1.17 I S500
+G1 X0.943 I S0
+G1 X1.172 I S500
+G1 X3.434 I S0
+G1 X1.233 I S500
+G1 X6.656 I S0
+G1 X1.233 I S500
+G1 X7.053 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-7.064 I S0
+G1 X-1.224 I S500
+G1 X-6.665 I S0
+G1 X-1.224 I S500
+G1 X-3.47 I S0
+G1 X-1.171 I S500
+G1 X-0.869 I S0
+G1 X-1.168 I S500
+G1 X-7.124 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.162 I S0
+G1 X1.167 I S500
+G1 X0.795 I S0
+G1 X1.17 I S500
+G1 X3.505 I S0
+G1 X1.227 I S500
+G1 X6.662 I S0
+G1 X1.227 I S500
+G1 X7.064 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-7.06 I S0
+G1 X-1.229 I S500
+G1 X-6.66 I S0
+G1 X-1.229 I S500
+G1 X-3.545 I S0
+G1 X-1.169 I S500
+G1 X-0.721 I S0
+G1 X-1.166 I S500
+G1 X-7.2 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.238 I S0
+G1 X1.165 I S500
+G1 X0.647 I S0
+G1 X1.168 I S500
+G1 X3.599 I S0
+G1 X1.227 I S500
+G1 X6.662 I S0
+G1 X1.227 I S500
+G1 X7.046 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-7.026 I S0
+G1 X-1.23 I S500
+G1 X-6.659 I S0
+G1 X-1.23 I S500
+G1 X-3.654 I S0
+G1 X-1.167 I S500
+G1 X-0.574 I S0
+G1 X-1.163 I S500
+G1 X-7.276 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.315 I S0
+G1 X1.161 I S500
+G1 X0.5 I S0
+G1 X1.165 I S500
+G1 X3.709 I S0
+G1 X1.244 I S500
+G1 X6.646 I S0
+G1 X1.243 I S500
+G1 X6.996 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.958 I S0
+G1 X-1.265 I S500
+G1 X-6.624 I S0
+G1 X-1.265 I S500
+G1 X-3.764 I S0
+G1 X-1.164 I S500
+G1 X-0.426 I S0
+G1 X-1.16 I S500
+G1 X-7.353 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.391 I S0
+G1 X1.159 I S500
+G1 X0.352 I S0
+G1 X1.163 I S500
+G1 X3.831 I S0
+G1 X1.281 I S500
+G1 X6.608 I S0
+G1 X1.282 I S500
+G1 X6.912 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-6.852 I S0
+G1 X-1.305 I S500
+G1 X-6.585 I S0
+G1 X-1.305 I S500
+G1 X-3.905 I S0
+G1 X-1.162 I S500
+G1 X-0.278 I S0
+G1 X-1.158 I S500
+G1 X-7.429 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.467 I S0
+G1 X1.157 I S500
+G1 X0.204 I S0
+G1 X1.161 I S500
+G1 X3.98 I S0
+G1 X1.336 I S500
+G1 X4.307 I S0
+G1 X0.019 I S500
+G1 X2.227 I S0
+G1 X1.336 I S500
+G1 X4.308 I S0
+G1 X0.018 I S500
+G1 X2.459 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.459 I S0
+G1 X-0.239 I S500
+G1 X-4 I S0
+G1 X-1.386 I S500
+G1 X-2.264 I S0
+G1 X-0.239 I S500
+G1 X-4 I S0
+G1 X-1.386 I S500
+G1 X-4.055 I S0
+G1 X-1.16 I S500
+G1 X-0.13 I S0
+G1 X-1.155 I S500
+G1 X-7.506 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.544 I S0
+G1 X1.154 I S500
+G1 X0.056 I S0
+G1 X1.159 I S500
+G1 X4.135 I S0
+G1 X1.451 I S500
+G1 X3.673 I S0
+G1 X0.459 I S500
+G1 X2.306 I S0
+G1 X1.451 I S500
+G1 X3.673 I S0
+G1 X0.459 I S500
+G1 X2.459 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-1.226 I S500
+G1 X-2.459 I S0
+G1 X-0.712 I S500
+G1 X-3.276 I S0
+G1 X-1.535 I S500
+G1 X-2.366 I S0
+G1 X-0.712 I S500
+G1 X-3.277 I S0
+G1 X-1.534 I S500
+G1 X-4.233 I S0
+G1 X-2.293 I S500
+G1 X-7.582 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.62 I S0
+G1 X2.217 I S500
+G1 X4.331 I S0
+G1 X1.668 I S500
+G1 X2.775 I S0
+G1 X1.02 I S500
+G1 X2.426 I S0
+G1 X1.668 I S500
+G1 X2.775 I S0
+G1 X1.02 I S500
+G1 X2.459 I S0
+G1 X1.226 I S500
+G1 X1.5 I S0
+G1 X4.504Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.73 I S500
+G1 X-2.459 I S0
+G1 X-1.393 I S500
+G1 X-2.157 I S0
+G1 X-1.853 I S500
+G1 X-2.486 I S0
+G1 X-1.393 I S500
+G1 X-2.157 I S0
+G1 X-1.853 I S500
+G1 X-4.43 I S0
+G1 X-2.14 I S500
+G1 X-7.658 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.697 I S0
+G1 X2.063 I S500
+G1 X4.536 I S0
+G1 X2.143 I S500
+G1 X1.28 I S0
+G1 X1.912 I S500
+G1 X2.554 I S0
+G1 X2.143 I S500
+G1 X1.28 I S0
+G1 X1.912 I S500
+G1 X2.459 I S0
+G1 X5.73 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.73 I S500
+G1 X-2.459 I S0
+G1 X-5.236 I S500
+G1 X-2.653 I S0
+G1 X-5.236 I S500
+G1 X-4.673 I S0
+G1 X-1.987 I S500
+G1 X-7.735 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.773 I S0
+G1 X1.911 I S500
+G1 X4.81 I S0
+G1 X5.137 I S500
+G1 X2.753 I S0
+G1 X5.136 I S500
+G1 X2.459 I S0
+G1 X5.73 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.73 I S500
+G1 X-2.459 I S0
+G1 X-5.037 I S500
+G1 X-2.852 I S0
+G1 X-5.037 I S500
+G1 X-4.948 I S0
+G1 X-1.835 I S500
+G1 X-7.811 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.849 I S0
+G1 X1.759 I S500
+G1 X5.114 I S0
+G1 X4.909 I S500
+G1 X2.981 I S0
+G1 X4.908 I S500
+G1 X2.459 I S0
+G1 X5.73 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.73 I S500
+G1 X-2.459 I S0
+G1 X-4.766 I S500
+G1 X-3.123 I S0
+G1 X-4.766 I S500
+G1 X-5.295 I S0
+G1 X-1.682 I S500
+G1 X-7.888 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X7.926 I S0
+G1 X1.606 I S500
+G1 X5.475 I S0
+G1 X4.584 I S500
+G1 X3.305 I S0
+G1 X4.584 I S500
+G1 X2.499 I S0
+G1 X5.73 I S500
+G1 X1.5 I S0
+G1 Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-5.73 I S500
+G1 X-2.829 I S0
+G1 X-4.05 I S500
+G1 X-3.839 I S0
+G1 X-4.05 I S500
+G1 X-5.717 I S0
+G1 X-1.53 I S500
+G1 X-7.964 I S0
+G1 X-1.226 I S500
+G1 X-1.5 I S0
+G1 Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.226 I S500
+G1 X8.002 I S0
+G1 X1.454 I S500
+G1 X5.969 I S0
+G1 X3.465 I S500
+G1 X4.424 I S0
+G1 X3.466 I S500
+G1 X3.199 I S0
+G1 X5.73 I S500
+G1 X1.5 I S0
+G1 X-9.375Y-0.1 I S0
+G1 X-1.5 I S0
+G1 X-2.681 I S500
+G1 X-5.208 I S0
+G1 X-2.682 I S500
+G1 X-1.5 I S0
+G1 X0.496Y-0.1 I S0
+G1 X1.5 I S0
+G1 X1.497 I S500
+G1 X6.393 I S0
+G1 X1.496 I S500
+G1 X1.5 I S0
+G90
+G0 Z0
+M9
+M05
+G90
+; return to user-defined finish pos
+G0 X0 Y0 F0
@@ -0,0 +1,48 @@
+import os
+import sys
+import pytest
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'benchmarks'))
+
+import bench
+import workloads
+from gcode import GcodeFramer
+from xtm1 import GcodeTranslator
+
+@pytest.fixture
+def options(tmp_path):
+    return {'line_counts': [1000], 'stream_lines': 1000, 'stream_bytes': 1024 * 1024, 'chunk_sizes': [64],
+            'sizes': ['40x30'], 'latency': 0.0, 'bandwidth': None, 'repeat': 1, 'data_dir': str(tmp_path)}
+
+@pytest.mark.parametrize('kind', ['raster', 'vector'])
+def test_workloads(tmp_path, kind):
+    filename = workloads.job_file(kind, 5000, str(tmp_path))
+    with open(filename, 'rb') as f:
+        data = f.read()
+    assert data.count(b'\n') == 5000
+    # Generated once, then reused
+    os.utime(filename, (0, 0))
+    assert workloads.job_file(kind, 5000, str(tmp_path)) == filename and os.path.getmtime(filename) == 0
+    workloads.write_raster_job(str(tmp_path / 'again'), 5000) if kind == 'raster' else workloads.write_vector_job(str(tmp_path / 'again'), 5000)
+    assert (tmp_path / 'again').read_bytes() == data
+    GcodeTranslator().translate_file_content(data)
+    assert b'G1 F9600 S5' in GcodeFramer().calculate_frame_file(filename)
+
+def test_cases(options, monkeypatch):
+    import xtm1_camera
+    monkeypatch.setattr(xtm1_camera, 'REMAP_CACHE_DIR', None) # The undistort case switches the cache off
+    names = bench.case_names(options)
+    assert 'translate/raster-1000' in names and 'readline/socket-64' in names and 'undistort/40x30' in names
+    for name in names:
+        result = bench.run_case(name, options)
+        assert result['throughput'] > 0 and result['peak_rss_mb'] > 0
+        assert result['units'] == {'undistort/40x30': 1, 'client/status': 200, 'client/camera': 10}.get(name, 1000)
+
+def test_compare():
+    baseline = {'a': {'throughput': 100.0, 'peak_rss_mb': 100.0, 'unit': 'lines'}}
+    assert bench.compare({'a': dict(baseline['a'], throughput=85.0)}, baseline, 0.2) == []
+    assert len(bench.compare({'a': dict(baseline['a'], throughput=75.0)}, baseline, 0.2)) == 1
+    assert len(bench.compare({'a': dict(baseline['a'], peak_rss_mb=200.0)}, baseline, 0.2)) == 1
+    assert bench.compare({'b': baseline['a']}, baseline, 0.2) == []
+    assert bench.parse_count('50M') == 50_000_000 and bench.parse_count('10K') == 10_000 and bench.parse_count('64') == 64
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+import sys
+import time
+import pytest
+import requests
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from fake_m1 import FakeM1
+from xtm1 import GcodeTranslator
+from xtm1_async import AsyncXTM1
+
+GCODE = b'G0 X1 Y2\nG1 X10 Y20 S255\n' * 100
+
+@pytest.fixture
+def fake():
+    with FakeM1(job_seconds=0.2, camera_size=(400, 300), seed=1) as fake:
+        yield fake
+
+def test_upload_and_states(fake, tmp_path):
+    filename = tmp_path / 'job.gcode'
+    filename.write_bytes(GCODE)
+    with fake.client(chunked_upload=True) as m1:
+        assert m1.is_idle()
+        assert m1.upload_gcode_file(str(filename)) == b'ok'
+        assert fake.uploads == [GcodeTranslator().translate_file_content(GCODE)]
+        assert fake.tool_type == 'Laser'
+        assert m1.get_status()['STATUS'] == 'P_WORKING'
+        assert m1.upload_gcode(GCODE) is False # Busy
+        time.sleep(0.25)
+        assert m1.is_idle()
+        m1.set_light_brightness(300)
+    assert fake.commands == ['M13 S255']
+    assert fake.requests[('POST', '/cnc/data?action=upload')] == 1
+
+def test_button_and_stop():
+    with FakeM1(start_delay=None, job_seconds=10, sleep_seconds=0.1) as fake, fake.client() as m1:
+        assert m1.upload_gcode(GCODE) == b'ok'
+        assert m1.get_status()['STATUS'] == 'P_READY'
+        fake.press_button()
+        assert m1.get_status()['STATUS'] == 'P_WORKING'
+        m1.stop()
+        assert m1.get_status()['STATUS'] == 'P_IDLE'
+        time.sleep(0.15)
+        assert m1.get_status()['STATUS'] == 'P_SLEEP' and m1.is_idle()
+
+def test_camera(fake):
+    with fake.client() as m1:
+        assert m1.measure_thickness() == 3.0
+        assert m1.get_camera_image()[:2] == b'\xff\xd8' # JPEG
+        points = json.loads(m1.get_camera_calibration())
+        assert len(points) == 31 and len(points[0]) == 41 and points[30][40]['x'] < 400
+
+def test_failures(fake):
+    with fake.client() as m1:
+        fake.fail_next(1, '/cnc/status')
+        m1.stop() # Other endpoints are not affected
+        with pytest.raises(RuntimeError, match='HTTP status 500'):
+            m1.get_status()
+        assert m1.is_idle()
+        fake.fail_next(1, status=None)
+        with pytest.raises(requests.ConnectionError):
+            m1.get_status()
+        assert m1.is_idle()
+    fake.failure_rate = 0.5
+    with fake.client() as m1:
+        failures = 0
+        for _ in range(40):
+            try:
+                m1.get_status()
+            except RuntimeError:
+                failures += 1
+        assert 8 < failures < 32
+
+def test_latency_and_bandwidth():
+    with FakeM1(latency=0.1, bandwidth=100 * 1024) as fake, fake.client() as m1:
+        start = time.monotonic()
+        m1.get_status()
+        assert 0.1 <= time.monotonic() - start < 0.5
+        start = time.monotonic()
+        m1.upload_gcode(GCODE * 16) # About 40 KiB, sent uncompressed
+        assert 0.4 <= time.monotonic() - start < 2
+
+def test_async_client(fake):
+    async def run():
+        async with AsyncXTM1(fake.IP) as m1:
+            m1.PORT, m1.CAMERA_PORT = fake.PORT, fake.CAMERA_PORT
+            statuses = await asyncio.gather(*[m1.get_status() for _ in range(10)])
+            return statuses, await m1.upload_gcode(GCODE)
+    statuses, reply = asyncio.run(run())
+    assert statuses == [{'STATUS': 'P_IDLE'}] * 10 and reply == b'ok'
+
+def test_async_upload_file(fake, tmp_path, monkeypatch):
+    monkeypatch.setattr(GcodeTranslator, 'STREAM_CHUNK_SIZE', 1000) # Read and translated in many pieces
+    filename = tmp_path / 'job.gcode'
+    filename.write_bytes(GCODE * 20)
+    async def run():
+        async with AsyncXTM1(fake.IP) as m1:
+            m1.PORT, m1.CAMERA_PORT = fake.PORT, fake.CAMERA_PORT
+            return await m1.upload_gcode_file(str(filename))
+    assert asyncio.run(run()) == b'ok'
+    assert fake.uploads == [GcodeTranslator().translate_file_content(GCODE * 20)]
+
+def test_endpoints_per_port(fake):
+    control = f'http://{fake.IP}:{fake.PORT}'
+    camera = f'http://{fake.IP}:{fake.CAMERA_PORT}'
+    assert requests.get(control + '/cnc/status').status_code == 200
+    assert requests.get(camera + '/cnc/status').status_code == 404
+    assert requests.post(camera + '/cnc/data?action=upload', data=b'').status_code == 404
+    assert requests.get(camera + '/snap?stream=0').status_code == 200
+    assert requests.get(control + '/snap?stream=0').status_code == 404
+    assert requests.get(control + '/camera?focus=0,0,0,0').status_code == 404
+    assert fake.uploads == []
+
+def test_uploads_back_to_back():
+    with FakeM1(start_delay=None) as fake:
+        with fake.client() as m1:
+            assert m1.upload_gcode(GCODE) == b'ok'
+            assert m1.upload_gcode(GCODE) is False # Waits for the button, although the status is cached
+        fake.state = 'P_IDLE'
+        async def run_twice():
+            async with AsyncXTM1(fake.IP) as m1:
+                m1.PORT, m1.CAMERA_PORT = fake.PORT, fake.CAMERA_PORT
+                return await m1.upload_gcode(GCODE), await m1.upload_gcode(GCODE)
+        assert asyncio.run(run_twice()) == (b'ok', False)
+        assert len(fake.uploads) == 2
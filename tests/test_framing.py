@@ -14,4 +14,24 @@ def test_framing_file(framer: GcodeFramer):
     filename = os.path.join(current_dir, 'test-gcode/lasse.gcode')
     gcode = framer.calculate_frame_file(filename)
     assert framer.Xminmax == pytest.approx((175, 212.043))
-    assert framer.Yminmax == pytest.approx((155.05, 164.35))
\ No newline at end of file
+    assert framer.Yminmax == pytest.approx((155.05, 164.35))
+
+def test_framing_relative_moves(framer: GcodeFramer):
+    framer.calculate_frame(b'''
+G0 X10 Y10
+G91
+G1 X5 S0
+G1 X2 Y1 S100 ; starts cutting at X15 Y10
+G1 X-20 S0
+G0 Y50
+G1 Y-1 S10
+G90
+G1 X1 Y2
+''')
+    assert framer.Xminmax == pytest.approx((-3, 17))
+    assert framer.Yminmax == pytest.approx((2, 61))
+    assert framer.frame_gcode().startswith(b'G0 X-3.0 Y2.0\n')
+
+def test_framing_rejects_arcs(framer: GcodeFramer):
+    with pytest.raises(RuntimeError, match='G2'):
+        framer.calculate_frame(b'G1 X1 S10\nG2 X2 Y2 I1 J1\n')
@@ -0,0 +1,58 @@
+import os
+import sys
+import pytest
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from gcode_estimate import KinematicModel, estimate_file, estimate_gcode, format_duration
+
+@pytest.fixture
+def model():
+    return KinematicModel(acceleration=1000)
+
+def test_trapezoid(model):
+    # 100 mm at 100 mm/s: 0.1 s accelerating, 0.9 s cruising, 0.1 s braking
+    assert estimate_gcode(b'G1 X100 F6000\n', model).total_ms == pytest.approx(1100)
+    split = b''.join(b'G1 X%d F6000\n' % (10 * i) for i in range(1, 11))
+    assert estimate_gcode(split, model).total_ms == pytest.approx(1100)
+    # Too short to reach the feed rate
+    assert estimate_gcode(b'G1 X0.1 F6000\n', model).total_ms == pytest.approx(2000 * (0.05 / 500) ** 0.5)
+
+def test_corners_and_dwells(model):
+    straight = estimate_gcode(b'G1 X100 F6000\nG1 X200\n', model).total_ms
+    corner = estimate_gcode(b'G1 X100 F6000\nG1 X100 Y100\n', model).total_ms
+    assert straight < corner < 2200
+    assert estimate_gcode(b'G1 X100 F6000\nG4 P0.5\nG1 X200\n', model).total_ms == pytest.approx(2700)
+
+def test_feed_rates():
+    model = KinematicModel(acceleration=None)
+    assert estimate_gcode(b'G91\nG1 X100 Y0\nG0 X-100 F0\n', model).total_ms == pytest.approx(1250)
+    assert estimate_gcode(b'G1 X100 F600\n', KinematicModel(acceleration=None, max_feed_rate=300)).total_ms == pytest.approx(20000)
+    assert estimate_gcode(b'G0 X100 F600\n', KinematicModel(acceleration=None, rapid_feed_rate=6000)).total_ms == pytest.approx(1000)
+
+def test_separate_feed_rates_of_g0_and_g1(tmp_path):
+    model = KinematicModel(acceleration=None)
+    # G0 runs at the 9600 mm/min of START_GCODE (1 s), the G1 at its 600 mm/min (1 s), the next G0 again at 9600
+    gcode = b'G0 X160\nG1 X170 F600\nG0 X330\nG1 X340\n'
+    assert estimate_gcode(gcode, model).total_ms == pytest.approx(4000)
+    filename = tmp_path / 'job.gcode'
+    filename.write_bytes(gcode)
+    assert estimate_file(str(filename), model, chunk_size=10).total_ms == pytest.approx(4000) # Also across pieces
+
+def test_layers(tmp_path):
+    with open(os.path.join(current_dir, 'test-gcode', 'lasse.gcode'), 'rb') as f:
+        gcode = f.read()
+    estimate = estimate_gcode(gcode)
+    assert [name for name, _ms in estimate.layers] == ['start', 'Layer C03 Pass 1 of 2', 'Layer C03 Pass 2 of 2']
+    assert sum(ms for _name, ms in estimate.layers) == pytest.approx(estimate.total_ms)
+    assert 60_000 < estimate.total_ms < 180_000
+    assert 'Total' in str(estimate)
+    filename = tmp_path / 'job.gcode'
+    filename.write_bytes(gcode)
+    assert estimate_file(str(filename)).total_ms == pytest.approx(estimate.total_ms)
+    pieces = estimate_file(str(filename), chunk_size=1000) # Stops between the pieces
+    assert pieces.layers[1][0] == 'Layer C03 Pass 1 of 2'
+    assert pieces.total_ms == pytest.approx(estimate.total_ms, rel=0.05)
+
+def test_format_duration():
+    assert format_duration(3_723_400) == '1:02:03'
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import os
+import sys
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from gcode_moves import MoveTable, M_CODE_OFFSET
+
+TEST_GCODE = b'''; LightBurn comment G1 X5
+G21
+G90
+M05
+G0 X203.12 Y164.35 F0
+G91
+G1 X-1.5 F3600 I S0
+G1 X-0.597Y-0.1 I S500.5 ; X99
+G0 Z-1.25
+G4 P0.1
+G90
+G1 X1 Y2 # X3
+'''
+
+@pytest.fixture
+def table():
+    return MoveTable.from_gcode(TEST_GCODE, np.float64)
+
+def test_codes_and_offsets(table: MoveTable):
+    assert list(table.code) == [21, 90, M_CODE_OFFSET + 5, 0, 91, 1, 1, 0, 4, 90, 1]
+    lines = TEST_GCODE.split(b'\n')
+    assert [TEST_GCODE[o:].split(b'\n')[0] for o in table.offset] == lines[1:-1]
+
+def test_parameters(table: MoveTable):
+    assert table.X[3] == 203.12 and table.Y[3] == 164.35 and table.F[3] == 0
+    assert table.X[6] == -0.597 and table.Y[6] == -0.1 and table.S[6] == 500.5
+    assert table.Z[7] == -1.25
+    assert table.P[8] == 0.1 and np.isnan(table.P[7])
+    assert table.X[10] == 1 and table.Y[10] == 2 # Values in comments are ignored
+    assert np.isnan(table.Y[5]) and np.isnan(table.Z[5])
+
+def test_relative_mode(table: MoveTable):
+    assert list(table.relative) == [False, False, False, False, True, True, True, True, True, False, False]
+
+def test_invalid_numbers():
+    table = MoveTable.from_gcode(b'G1 X1- Y1.2.3 S.\nG1 X-.5 Y+2 S1234567890123456789\n', np.float64)
+    assert np.isnan(table.X[0]) and np.isnan(table.Y[0]) and np.isnan(table.S[0])
+    assert table.X[1] == -0.5 and table.Y[1] == 2 and table.S[1] == 1234567890123456789.0
+
+@pytest.mark.parametrize('chunk_size', [1, 10, 1 << 20])
+def test_chunking(tmp_path, chunk_size):
+    expected = MoveTable.from_gcode(TEST_GCODE)
+    filename = tmp_path / 'job.gcode'
+    filename.write_bytes(TEST_GCODE)
+    for table in (MoveTable.from_gcode(TEST_GCODE, chunk_size=chunk_size),
+                  MoveTable.from_file(str(filename), chunk_size=chunk_size)):
+        for name, column in expected.columns().items():
+            np.testing.assert_array_equal(table.columns()[name], column)
+
+def test_empty():
+    assert len(MoveTable.from_gcode(b'')) == 0
+    assert len(MoveTable.from_gcode(b'; only a comment\n\n')) == 0
@@ -0,0 +1,178 @@
+import os
+import random
+import re
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from gcode_optimize import CutOrderOptimizer, GcodeSimplifier, order_paths
+from xtm1 import GcodeTranslator
+
+def burns(gcode: bytes):
+    """Laser-on segments as (start, end, S, F), joined where they continue in the same direction.
+
+    Like the M1, G0 and G1 have separate modal feed rates, which start as GcodeTranslator.START_GCODE sets them.
+    """
+    relative, x, y, feeds, S = False, 0.0, 0.0, [9600.0, 9600.0], None
+    segments = []
+    for line in gcode.split(b'\n'):
+        code = line.split(b';')[0].strip()
+        if code in (b'G90', b'G91'):
+            relative = code == b'G91'
+        match = re.match(rb'G0?([01])(?![0-9.])', code)
+        if not match:
+            continue
+        words = dict(re.findall(rb'([A-Z])([-+]?[0-9.]*)', code[match.end():]))
+        kind = int(match.group(1))
+        if b'F' in words:
+            feeds[kind] = float(words[b'F'])
+        F = feeds[kind]
+        S = float(words[b'S']) if b'S' in words else S
+        nx = x * relative + float(words[b'X']) if b'X' in words else x
+        ny = y * relative + float(words[b'Y']) if b'Y' in words else y
+        if kind == 1 and S and (nx, ny) != (x, y):
+            if segments and segments[-1][2:] == [S, F] and segments[-1][1] == pytest.approx((x, y), abs=1e-3):
+                (x0, y0), _end, *_ = segments[-1]
+                if abs((nx - x0) * (y - y0) - (ny - y0) * (x - x0)) < 1e-6:
+                    segments[-1][1] = (nx, ny)
+                    x, y = nx, ny
+                    continue
+            segments.append([(x, y), (nx, ny), S, F])
+        x, y = nx, ny
+    return [(round(x0, 3), round(y0, 3), round(x1, 3), round(y1, 3), S, F) for (x0, y0), (x1, y1), S, F in segments]
+
+@pytest.fixture
+def lasse():
+    with open(os.path.join(current_dir, 'test-gcode', 'lasse.gcode'), 'rb') as f:
+        return f.read()
+
+def test_lasse_burns_the_same(lasse):
+    simplifier = GcodeSimplifier()
+    simplified = simplifier.simplify(lasse)
+    assert burns(simplified) == burns(lasse)
+    assert simplifier.removed > 300
+    assert len(simplified) < len(lasse)
+    assert 'removed' in simplifier.report()
+
+def test_merges_collinear_moves():
+    simplifier = GcodeSimplifier()
+    assert simplifier.simplify(b'G90\nG0 X0 Y0\nG1 X1 Y1 S100\nG1 X2 Y2\nG1 X3 Y3.0001\nG1 X4 Y3\n') == \
+        b'G90\nG0 X0 Y0\nG1 X3 Y3.0001 S100\nG1 X4 Y3\n'
+    assert simplifier.removed == 2
+
+def test_relative_moves_and_power():
+    simplifier = GcodeSimplifier()
+    gcode = b'G91\nG1 X1 F3000 I S0\nG1 X2 I S0\nG1 Y0\nG1 X1 I S500\nG1 X1 I S500\nG1 X-1 I S500\nG1 Y1\n'
+    # F3000 was the feed rate of G1, which the G0 does not need
+    assert simplifier.simplify(gcode) == \
+        b'G91\nG0 X3\nG1 X2 I F3000 S500\nG1 X-1 I S500\nG1 Y1\n'
+
+def test_power_is_restored_after_converted_moves():
+    gcode = b'G90\nG0 X0 Y0\nG1 X1 S500\nG1 X2 S0\nG1 X3\n'
+    assert GcodeSimplifier().simplify(gcode) == b'G90\nG0 X0 Y0\nG1 X1 S500\nG0 X3\n'
+    gcode = b'G90\nG0 X0 Y0\nG1 X1 S500\nG1 X2 S0\nM5\nG1 X3 S0\nG1 X2 ; comment\n'
+    assert GcodeSimplifier().simplify(gcode) == b'G90\nG0 X0 Y0\nG1 X1 S500\nG0 X2\nM5\nG0 X3\nG1 X2 S0 ; comment\n'
+
+def test_chunks(lasse):
+    chunks = [lasse[i:i + 1000] for i in range(0, len(lasse), 1000)]
+    assert b''.join(GcodeSimplifier().optimize_chunks(chunks)) == GcodeSimplifier().simplify(lasse)
+
+def test_translator_pipeline(lasse):
+    translator = GcodeTranslator()
+    translator.optimizers = [GcodeSimplifier()]
+    expected = GcodeTranslator().translate_file_content(GcodeSimplifier().simplify(lasse))
+    assert translator.translate_file_content(lasse) == expected
+    chunks = [lasse[i:i + 4096] for i in range(0, len(lasse), 4096)]
+    assert b''.join(translator.translate_chunks(chunks)) == expected
+
+def test_g1_feed_rate_after_inserted_g0():
+    # The F3000 of the G1 S0 move moves to the G0 that replaces it, which does not change the feed rate of G1
+    gcode = b'G90\nG0 X0 Y0\nG1 X1 Y1 S0 F3000\nG1 X2 Y2 S500\nG0 X5 Y0\nG1 X6 Y0 S0 F600\nG1 X5 Y1 S500\n'
+    plain = GcodeTranslator().translate_file_content(gcode)
+    for optimizers in ([GcodeSimplifier()], [CutOrderOptimizer(), GcodeSimplifier()]):
+        translator = GcodeTranslator()
+        translator.optimizers = optimizers
+        translated = translator.translate_file_content(gcode)
+        assert translated.startswith(GcodeTranslator.START_GCODE)
+        assert unordered(burns(translated)) == unordered(burns(plain))
+        assert [F for *_, F in burns(translated)] == [3000.0, 600.0]
+
+def unordered(segments):
+    "Burn segments regardless of order and direction."
+    return sorted((min((x0, y0), (x1, y1)), max((x0, y0), (x1, y1)), S, F) for x0, y0, x1, y1, S, F in segments)
+
+def vector_job(count=100, seed=3):
+    rng = random.Random(seed)
+    lines = [b'G21', b'G90', b'G0 X0 Y0 F0', b'; Layer C00', b'G0 Z-1']
+    for k in range(count):
+        x, y = rng.uniform(0, 300), rng.uniform(0, 300)
+        lines.append(b'G0 X%.3f Y%.3f' % (x, y))
+        if k % 2: # Closed square
+            lines += [b'G1 X%.3f F600 S%d' % (x + 5, 100 + k % 3), b'G1 Y%.3f' % (y + 5), b'G1 X%.3f F900' % x, b'G1 Y%.3f' % y]
+        else: # Open path with a gap
+            lines += [b'G1 X%.3f Y%.3f S300' % (x + 7, y + 2), b'G1 X%.3f S0' % (x + 9), b'G1 Y%.3f S250' % (y + 9)]
+    lines += [b'; Layer C01', b'G0 X5 Y5', b'G1 X6 Y6 S10', b'M5', b'G0 X0 Y0 F0', b'']
+    return b'\n'.join(lines)
+
+def travel(starts, ends, order, flipped, origin):
+    entries = np.where(flipped[:, None], ends[order], starts[order])
+    exits = np.where(flipped[:, None], starts[order], ends[order])
+    return np.hypot(*(entries - np.vstack(([origin], exits[:-1]))).T).sum()
+
+def test_order_paths():
+    rng = np.random.default_rng(1)
+    starts = rng.uniform(0, 100, (500, 2))
+    ends = starts + rng.uniform(-2, 2, (500, 2))
+    reversible = np.arange(500) % 2 == 0
+    order, flipped = order_paths(starts, ends, reversible, (0, 0))
+    assert sorted(order) == list(range(500))
+    assert not flipped[~reversible[order]].any()
+    identity = np.arange(500), np.zeros(500, dtype=bool)
+    assert travel(starts, ends, order, flipped, (0, 0)) < travel(starts, ends, *identity, (0, 0)) / 5
+
+def test_order_paths_with_end():
+    starts = np.array([[1.0, 0], [2, 0], [3, 0]])
+    order, flipped = order_paths(starts, starts, np.ones(3, dtype=bool), (0, 0), end=(0, 0))
+    assert list(order) in ([0, 1, 2], [2, 1, 0])
+    order, flipped = order_paths(starts, starts, np.ones(3, dtype=bool), (0, 0), end=(4, 0))
+    assert list(order) == [0, 1, 2]
+
+def test_cut_order_keeps_burns():
+    gcode = vector_job()
+    optimizer = CutOrderOptimizer()
+    reordered = optimizer.optimize(gcode)
+    assert unordered(burns(reordered)) == unordered(burns(gcode))
+    assert optimizer.paths == 151
+    assert optimizer.travel_after < optimizer.travel_before / 3
+    assert 'less' in optimizer.report()
+    # Layers stay in order and the job still ends at the finish position
+    assert reordered.index(b'; Layer C01') > reordered.rindex(b'S300')
+    assert reordered.endswith(b'M5\nG0 X0 Y0\n') # G0 is still at F0 from the start
+
+def test_cut_order_without_reversing():
+    gcode = vector_job()
+    reordered = CutOrderOptimizer(reverse_paths=False).optimize(gcode)
+    assert sorted(burns(reordered)) == sorted(burns(gcode))
+
+def test_cut_order_keeps_end_for_relative_moves():
+    gcode = b'G90\nG0 X0 Y0\nG0 X10 Y0\nG1 X11 Y0 S100\nG0 X1 Y0\nG1 X2 Y0 S100\nG0 X20 Y0\nG91\nG1 X1 S100\n'
+    reordered = CutOrderOptimizer().optimize(gcode)
+    assert reordered == b'G90\nG0 X0 Y0\nG0 X1 Y0\nG1 X2 Y0 S100\nG0 X10 Y0\nG1 X11 Y0 S100\nG0 X20 Y0\nG91\nG1 X1 S100\n'
+
+def test_cut_order_without_power_does_not_burn():
+    # G1 without S runs at the S0 of START_GCODE, so only X0..X5 is burnt
+    gcode = b'G90\nG0 X0 Y0\nG0 X10 Y0\nG1 X5 Y0\nG1 X0 Y0 S200\nG0 X0 Y0\n'
+    reordered = CutOrderOptimizer().optimize(gcode)
+    assert unordered(burns(reordered)) == unordered(burns(gcode)) == [((0.0, 0.0), (5.0, 0.0), 200.0, 9600.0)]
+
+def test_cut_order_sets_power_of_each_path():
+    gcode = b'G90\nG0 X0 Y0\nG0 X10 Y0\nG1 X11 Y0 S300\nG0 X1 Y0\nG1 X2 Y0\n'
+    reordered = CutOrderOptimizer().optimize(gcode)
+    assert unordered(burns(reordered)) == unordered(burns(gcode))
+    assert [line for line in reordered.split(b'\n') if line.startswith(b'G1')] == [b'G1 X2 Y0 S300', b'G1 X11 Y0 S300']
+
+def test_cut_order_leaves_raster_jobs_alone(lasse):
+    # Only the F0 of the last move is dropped, as G0 is still at F0 from the start
+    assert CutOrderOptimizer().optimize(lasse) == lasse.replace(b'G0 X0 Y0 F0', b'G0 X0 Y0')
@@ -100,5 +100,82 @@ def test_translate_file(bare_translator: GcodeTranslator):
         assert f'G0 Z{zero_z}\n'.encode('utf-8') in lines
     os.unlink(new_file)
 
+TEST_GCODE_TRICKY = b'''G21
+  G90\t
+; Comment with F0 and  I  inside
+G0 X1 Y1 F0\r
+G1 X1 I S12.5 ; S1.5 in a comment
+M5 ; comment
+G00 G17 G40 G21 G54
+G1 Z1.5 X2 F0 I S1
+G91
+G1 X1
+'''
+
+def test_translate_block_matches_process_line(bare_translator: GcodeTranslator):
+    expected = b'\n'.join(GcodeTranslator().process_line(line) for line in TEST_GCODE_TRICKY.split(b'\n'))
+    assert bare_translator.translate_file_content(TEST_GCODE_TRICKY) == expected
+    assert bare_translator.filtered_lines == {b'G21', b'M5 ; comment', b'G00 G17 G40 G21 G54'}
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1023, 1024, 1025, 1 << 20])
+def test_translate_chunks(translator: GcodeTranslator, chunk_size):
+    gcode = TEST_GCODE_1 * 200 + TEST_GCODE_2 + b'G1 X5 Y5' # no trailing newline
+    expected = translator.translate_file_content(gcode)
+    chunks = (gcode[i:i+chunk_size] for i in range(0, len(gcode), chunk_size))
+    assert b''.join(translator.translate_chunks(chunks)) == expected
+
+def test_translate_chunks_already_processed(translator: GcodeTranslator):
+    gcode = translator.translate_file_content(TEST_GCODE_1)
+    chunks = [gcode[:10], gcode[10:]]
+    assert b''.join(translator.translate_chunks(chunks)) == gcode
+
+def test_optimizers_skip_already_processed(translator: GcodeTranslator):
+    from gcode_optimize import CutOrderOptimizer, GcodeSimplifier
+    gcode = translator.translate_file_content(b'G90\nG0 X0 Y0\nG1 X1 Y1 S100\nG1 X2 Y2\nG1 X3 Y3\n')
+    translator.optimizers = [CutOrderOptimizer(), GcodeSimplifier()]
+    assert translator.translate_file_content(gcode) == gcode
+    chunks = [gcode[i:i+7] for i in range(0, len(gcode), 7)]
+    assert b''.join(translator.translate_chunks(chunks)) == gcode
+    assert translator.optimizers[1].lines_in == 0
+
+def test_translate_file_streaming(bare_translator: GcodeTranslator, tmp_path):
+    in_file = tmp_path / 'job.gcode'
+    gcode = TEST_GCODE_Z1 * 1000
+    in_file.write_bytes(gcode)
+    bare_translator.STREAM_CHUNK_SIZE = 100
+    new_file = bare_translator.translate_file(str(in_file))
+    with open(new_file, 'rb') as f:
+        assert f.read() == bare_translator.translate_file_content(gcode)
+
+def test_translate_file_error_removes_output(translator: GcodeTranslator, tmp_path):
+    in_file = tmp_path / 'job.gcode'
+    in_file.write_bytes(b'G1 X1 Y1\nM123\n')
+    with pytest.raises(UnexpectedGcodeError):
+        translator.translate_file(str(in_file))
+    assert not (tmp_path / 'job.xtm1.gcode').exists()
+
+@pytest.fixture
+def parallel_translator(translator: GcodeTranslator):
+    translator.PARALLEL_THRESHOLD = 0
+    translator.PARALLEL_CHUNK_SIZE = 100
+    return translator
+
+@pytest.mark.parametrize('gcode', [TEST_GCODE_2 * 50, TEST_GCODE_2 * 50 + b'G1 X1', b''])
+def test_translate_file_parallel(parallel_translator: GcodeTranslator, tmp_path, gcode):
+    in_file = tmp_path / 'job.gcode'
+    in_file.write_bytes(gcode)
+    new_file = parallel_translator.translate_file(str(in_file), processes=2)
+    serial_translator = GcodeTranslator()
+    with open(new_file, 'rb') as f:
+        assert f.read() == serial_translator.translate_file_content(gcode)
+    assert parallel_translator.filtered_lines == serial_translator.filtered_lines
+
+def test_translate_file_parallel_error(parallel_translator: GcodeTranslator, tmp_path):
+    in_file = tmp_path / 'job.gcode'
+    in_file.write_bytes(TEST_GCODE_2 * 20 + b'M123 first\n' + TEST_GCODE_2 * 20 + b'M124 second\n')
+    with pytest.raises(UnexpectedGcodeError, match='M123 first'):
+        parallel_translator.translate_file(str(in_file), processes=2)
+    assert not (tmp_path / 'job.xtm1.gcode').exists()
+
 if __name__ == '__main__':
     sys.exit(pytest.main())
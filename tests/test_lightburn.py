@@ -0,0 +1,166 @@
+import os
+import sys
+import time
+from socket import socketpair
+from threading import Thread
+import pytest
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from lightburn import JobWriter, next_job_filename, receive_job
+from StreamLineReader import StreamLineReader
+from xtm1 import GcodeTranslator
+
+@pytest.fixture
+def lasse_lines():
+    with open(os.path.join(current_dir, 'test-gcode', 'lasse.gcode'), 'rb') as f:
+        return f.read().splitlines(keepends=True)
+
+def test_job_writer_matches_translate_file(tmp_path, lasse_lines):
+    writer = JobWriter(str(tmp_path / 'job.gcode'))
+    writer.FEED_SIZE = 1000 # Translate in many blocks
+    for line in lasse_lines:
+        writer.write(line)
+    assert writer.close()
+    raw = b''.join(lasse_lines)
+    assert open(tmp_path / 'job.gcode', 'rb').read() == raw
+    assert open(writer.filename, 'rb').read() == GcodeTranslator().translate_file_content(raw)
+    assert writer.filename == str(tmp_path / 'job.xtm1.gcode')
+
+def test_job_writer_error(tmp_path):
+    writer = JobWriter(str(tmp_path / 'job.gcode'), keep_raw=False)
+    writer.write(b'G0 X1\n')
+    writer.write(b'G1 Z-100\n') # Outside of the allowed Z range
+    writer.write(b'G0 X2\n')
+    assert not writer.close()
+    assert isinstance(writer.error, RuntimeError)
+    assert writer.lines == 3
+    assert os.listdir(tmp_path) == []
+
+def test_next_job_filename(tmp_path):
+    assert next_job_filename(str(tmp_path)) == str(tmp_path / 'output-0000.gcode')
+    (tmp_path / 'output-0000.xtm1.gcode').write_bytes(b'G0\n')
+    (tmp_path / 'output-0001.gcode').write_bytes(b'')
+    assert next_job_filename(str(tmp_path)) == str(tmp_path / 'output-0001.gcode')
+
+def test_receive_job(tmp_path, lasse_lines):
+    lightburn, adapter = socketpair()
+    lines = [b'?\n', b'LASER_JOB_START\n'] + lasse_lines + [b'LASER_JOB_END\n']
+    def send():
+        for line in lines:
+            lightburn.sendall(line)
+            assert lightburn.recv(3) == b'ok\n' # Wait for each line to be acknowledged, like LightBurn
+    sender = Thread(target=send)
+    sender.start()
+    job = receive_job(StreamLineReader(adapter), str(tmp_path), log=lambda *args: None)
+    sender.join()
+    assert job.error is None and job.lines == len(lasse_lines)
+    assert open(job.filename, 'rb').read() == GcodeTranslator().translate_file_content(b''.join(lasse_lines))
+    lightburn.close()
+    adapter.close()
+
+class IdleM1:
+    "Stands in for XTM1. Reports idle, except for one poll after each upload (the job running)."
+    IP = 'fake'
+    def __init__(self):
+        self.uploads = []
+        self.running = False
+
+    def get_status(self):
+        running, self.running = self.running, False
+        return {'STATUS': 'P_WORKING' if running else 'P_IDLE'}
+
+    def upload_gcode_file(self, filename, material_thickness=None):
+        self.uploads.append(filename)
+        self.running = True
+        return b'ok'
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify is only available on Linux')
+def test_hot_folder(tmp_path, lasse_lines):
+    from concurrent.futures import ThreadPoolExecutor
+    from lightburn import HotFolder
+    m1 = IdleM1()
+    folder = HotFolder(str(tmp_path), m1, executor=ThreadPoolExecutor(4), log=lambda *args: None)
+    folder.watcher.fast_interval = folder.watcher.slow_interval = 0.01
+    folder.start()
+    try:
+        gcode = b''.join(lasse_lines)
+        for i in range(20):
+            (tmp_path / f'job{i}.gcode').write_bytes(gcode)
+        (tmp_path / 'done.gcode').write_bytes(GcodeTranslator().translate_file_content(gcode))
+        (tmp_path / 'notes.txt').write_bytes(b'not G-code')
+        deadline = time.monotonic() + 20
+        while len(m1.uploads) < 20 and time.monotonic() < deadline:
+            folder.poll(timeout=0.1)
+    finally:
+        folder.stop()
+    assert sorted(m1.uploads) == sorted(str(tmp_path / f'job{i}.xtm1.gcode') for i in range(20))
+    assert folder.failed == []
+    assert open(m1.uploads[0], 'rb').read() == GcodeTranslator().translate_file_content(gcode)
+
+def test_server_with_several_connections(tmp_path, lasse_lines):
+    import asyncio
+    from lightburn import LightBurnServer
+
+    async def send_job(port, lines):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for line in [b'LASER_JOB_START\n'] + lines + [b'LASER_JOB_END\n']:
+            writer.write(line)
+            assert await reader.readline() == b'ok\n'
+        writer.close()
+
+    async def main():
+        server = LightBurnServer(str(tmp_path), log=lambda *args: None)
+        await server.start(port=0)
+        await asyncio.gather(*(send_job(server.port, lasse_lines[:200 + i]) for i in range(3)))
+        jobs = [await asyncio.wait_for(server.jobs.get(), 5) for _ in range(3)]
+        await server.close()
+        return server, jobs
+
+    server, jobs = asyncio.run(main())
+    assert sorted(job.lines for job in jobs) == [200, 201, 202]
+    assert len({job.filename for job in jobs}) == 3
+    for job in jobs:
+        expected = GcodeTranslator().translate_file_content(b''.join(lasse_lines[:job.lines]))
+        assert open(job.filename, 'rb').read() == expected
+    assert len(server.connections) == 3
+    assert all(stats.jobs == 1 for stats in server.connections)
+    assert 'lines/s' in server.report()
+
+def test_server_translates_outside_the_event_loop(tmp_path, lasse_lines, monkeypatch):
+    import asyncio
+    import threading
+    from lightburn import LightBurnServer
+
+    threads = set()
+    def slow_write_lines(self, lines):
+        threads.add(threading.current_thread())
+        time.sleep(0.5)
+        for line in lines:
+            self.write(line)
+    monkeypatch.setattr(JobWriter, 'FEED_SIZE', 1000)
+    monkeypatch.setattr(JobWriter, 'write_lines', slow_write_lines)
+
+    async def main():
+        server = LightBurnServer(str(tmp_path), log=lambda *args: None)
+        await server.start(port=0)
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+        writer.write(b''.join([b'LASER_JOB_START\n'] + lasse_lines[:100] + [b'LASER_JOB_END\n']))
+        while await reader.readline() == b'ok\n' and not threads:
+            pass
+        # Another connection is served while the first job is translated
+        other_reader, other_writer = await asyncio.open_connection('127.0.0.1', server.port)
+        started = time.monotonic()
+        other_writer.write(b'M114\n')
+        assert await other_reader.readline() == b'ok\n'
+        assert time.monotonic() - started < 0.25
+        job = await asyncio.wait_for(server.jobs.get(), 5)
+        writer.close()
+        other_writer.close()
+        await server.close()
+        return job
+
+    job = asyncio.run(main())
+    assert threading.main_thread() not in threads
+    assert job.lines == 100
+    assert open(job.filename, 'rb').read() == GcodeTranslator().translate_file_content(b''.join(lasse_lines[:100]))
@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from fake_m1 import FakeM1
+
+HEAVY_MODULES = ['cv2', 'numpy', 'scipy', 'tkinter', 'PIL']
+# Importing m1control (with requests) takes about 0.1 s, the heavy modules would add about 0.5 s
+IMPORT_BUDGET_SECONDS = 0.4
+SCRIPT = '''
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+import m1control
+import_seconds = time.perf_counter() - start
+m1control.m1.PORT, m1control.m1.CAMERA_PORT = int(sys.argv[2]), int(sys.argv[3])
+result = m1control.main(['m1control.py'] + sys.argv[4:])
+print(json.dumps({'result': result, 'import_seconds': import_seconds,
+                  'heavy': [name for name in %r if name in sys.modules]}))
+''' % HEAVY_MODULES
+
+@pytest.fixture(scope='module')
+def fake():
+    with FakeM1(camera_size=(40, 30)) as fake:
+        yield fake
+
+def run(fake, cwd, *args):
+    # XDG_CACHE_HOME keeps the translation cache of uploads out of the user's cache
+    process = subprocess.run([sys.executable, '-c', SCRIPT, os.path.join(current_dir, '..'), str(fake.PORT), str(fake.CAMERA_PORT), *args],
+                             cwd=cwd, env=dict(os.environ, XTM1_IP=fake.IP, XDG_CACHE_HOME=str(cwd / 'cache')),
+                             capture_output=True, check=True)
+    *output, summary = process.stdout.decode('utf-8').splitlines()
+    return output, json.loads(summary)
+
+@pytest.mark.parametrize('args', [['--status'], ['--stop'], ['--gcode', 'M13', 'S100'], ['--laserpointer', 'on'],
+                                  ['--light', '10'], ['--thickness'], ['--camera-raw'], ['--upload', 'job.gcode']])
+def test_control_commands_import_little(fake, tmp_path, args):
+    (tmp_path / 'job.gcode').write_bytes(b'G0 X1 Y2\nG1 X10 Y20 S255\n')
+    output, summary = run(fake, tmp_path, *args)
+    assert summary['result'] == 0
+    assert summary['heavy'] == []
+    assert summary['import_seconds'] < IMPORT_BUDGET_SECONDS
+    if args == ['--status']:
+        assert output == ["{'STATUS': 'P_IDLE'}"]
+    if args[0] == '--upload':
+        assert len(os.listdir(tmp_path / 'cache' / 'xtm1')) == 1
+    else:
+        assert not os.path.exists(tmp_path / 'cache') # Only created for uploads
+    fake.state = 'P_IDLE' # After the upload
+
+def test_actions_import_what_they_need(fake, tmp_path):
+    (tmp_path / 'job.gcode').write_bytes(b'G0 X1 Y2\nG1 X10 Y20 S255\n')
+    output, summary = run(fake, tmp_path, '--estimate', 'job.gcode')
+    assert summary['result'] == 0 and 'numpy' in summary['heavy']
+    assert output[-1].startswith('Total: 0:00:00 for 2 moves')
+
+def test_usage(capsys, tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    import m1control
+    assert m1control.main(['m1control.py']) == 2
+    assert m1control.main(['m1control.py', '--nonsense']) == 1
+    assert m1control.main(['m1control.py', '--upload']) == 3
+    assert '--status' in capsys.readouterr().out
+    assert os.listdir(tmp_path) == []
@@ -98,3 +98,27 @@ def test_readline(two_endpoints):
     assert data == b'part1-part2\n'
 
     close_endpoints(read_port, write_port)
+
+def test_readlines_and_iteration():
+    read_port, write_port = socketpair()
+    reader = StreamLineReader(read_port)
+    send(write_port, b'a\nb\r\nc\npartial')
+    assert reader.readlines(timeout=0.1) == [b'a\n', b'b\n', b'c\n']
+    assert reader.readlines(timeout=0.1) == []
+    send(write_port, b'-line\n' + b'x' * 100000 + b'\nlast\n')
+    write_port.close()
+    assert list(reader) == [b'partial-line\n', b'x' * 100000 + b'\n', b'last\n']
+    assert reader.eof
+    read_port.close()
+
+def test_many_lines():
+    read_port, write_port = socketpair()
+    reader = StreamLineReader(read_port)
+    lines = [b'G1 X%d Y%d S500\n' % (i, i) for i in range(50000)]
+    sender = Thread(target=lambda: (write_port.sendall(b''.join(lines)), write_port.close()))
+    sender.start()
+    received = [reader.readline(timeout=5) for _ in range(len(lines))]
+    sender.join()
+    assert received == lines
+    assert reader.read_size > StreamLineReader.min_read_size
+    read_port.close()
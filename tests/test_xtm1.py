@@ -0,0 +1,176 @@
+import io
+import json
+import pytest
+import os
+import sys
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from xtm1 import XTM1, GcodeTranslator, StatusWatcher
+
+class StatusHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # Allows keep-alive connections
+    client_ports = set()
+    uploads = []
+
+    def do_GET(self):
+        self.client_ports.add(self.client_address[1])
+        self._reply(json.dumps({'STATUS': 'P_IDLE'}).encode('utf-8'))
+
+    def do_POST(self):
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            body = b''
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                body += self.rfile.read(size)
+                self.rfile.readline()
+            self.uploads.append(('chunked', body))
+        else:
+            self.uploads.append(('length', self.rfile.read(int(self.headers['Content-Length']))))
+        self._reply(b'ok')
+
+    def _reply(self, body):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StatusHandler)
+    StatusHandler.client_ports = set()
+    StatusHandler.uploads = []
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_keep_alive(server):
+    with XTM1('127.0.0.1') as m1:
+        m1.PORT = server.server_address[1]
+        for _ in range(5):
+            assert m1.is_idle()
+    assert len(StatusHandler.client_ports) == 1 # All requests used the same connection
+
+def test_pool_size_after_changing_ports(server):
+    with XTM1('127.0.0.1', pool_size=3) as m1:
+        m1.PORT = m1.CAMERA_PORT = server.server_address[1]
+        assert m1.is_idle()
+        assert m1.session.get_adapter(f'http://127.0.0.1:{m1.PORT}/')._pool_maxsize == 3
+
+def test_timeouts():
+    m1 = XTM1('127.0.0.1', connect_timeout=1.5, read_timeout=20)
+    assert m1.timeout == (1.5, 20)
+    m1.close()
+
+@pytest.mark.parametrize('chunked', [False, True])
+@pytest.mark.parametrize('compression', [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_upload_gcode_file(server, tmp_path, chunked, compression):
+    gcode = b'G0 X1 Y2\nG1 X10 Y20 S255\n' * 20000
+    filename = tmp_path / 'job.gcode'
+    filename.write_bytes(gcode)
+    with XTM1('127.0.0.1', compression=compression, chunked_upload=chunked) as m1:
+        m1.PORT = server.server_address[1]
+        assert m1.upload_gcode_file(str(filename)) == b'ok'
+        stats = m1.last_upload
+    encoding, body = StatusHandler.uploads[-1]
+    assert encoding == ('chunked' if chunked else 'length')
+    translated = GcodeTranslator().translate_file_content(gcode)
+    assert zipfile.ZipFile(io.BytesIO(body)).read('gcodes.txt') == translated
+    assert stats.gcode_bytes == len(translated)
+    assert stats.wire_bytes == len(body)
+    if compression == zipfile.ZIP_DEFLATED:
+        assert stats.ratio < 0.05
+
+def test_upload_metrics(server, tmp_path):
+    from xtm1_metrics import metrics
+    metrics.reset()
+    metrics.enabled = True
+    try:
+        filename = tmp_path / 'job.gcode'
+        filename.write_bytes(b'G0 X1 Y2\nG1 X10 Y20 S255\n' * 100)
+        with XTM1('127.0.0.1') as m1:
+            m1.PORT = server.server_address[1]
+            m1.upload_gcode_file(str(filename))
+            stats = m1.last_upload
+        labels = {'device': '127.0.0.1'}
+        for phase in ('is_idle', 'set_tool_type', 'translate_zip', 'post'):
+            assert metrics.value('xtm1_upload_phase_seconds', phase=phase, **labels).count == 1
+        assert metrics.value('xtm1_http_request_seconds', method='GET', endpoint='/cnc/status', **labels).count == 1
+        assert metrics.value('xtm1_http_request_seconds', method='POST', endpoint='/cnc/data?action=upload', **labels).count == 1
+        assert metrics.value('xtm1_http_responses_total', method='POST', endpoint='/setprintToolType', status=200, **labels) == 1
+        assert metrics.value('xtm1_upload_bytes_total', kind='wire', **labels) == stats.wire_bytes
+    finally:
+        metrics.enabled = False
+        metrics.reset()
+
+def test_is_idle_uses_fresh_cached_status():
+    m1 = XTM1('127.0.0.1', connect_timeout=0.1)
+    m1.PORT = 9 # Nothing listens there, so a request would fail
+    m1.last_status = (time.monotonic(), {'STATUS': 'P_WORKING'})
+    assert not m1.is_idle(max_age=10)
+    m1.last_status = (time.monotonic() - 20, {'STATUS': 'P_IDLE'})
+    with pytest.raises(Exception):
+        m1.is_idle(max_age=10)
+    m1.close()
+
+class ScriptedM1:
+    "Returns the given states one after another, then stays in the last one."
+    IP = 'scripted'
+    def __init__(self, *states):
+        self.states = list(states)
+
+    def get_status(self):
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        return {'STATUS': state}
+
+def test_status_watcher_transitions():
+    watcher = StatusWatcher(ScriptedM1('P_IDLE', 'P_WORKING', 'P_WORKING', 'P_FINISH'), fast_interval=0.01, slow_interval=0.01)
+    transitions = []
+    watcher.subscribe(lambda old, new: transitions.append((old['STATUS'], new['STATUS'])))
+    finished = []
+    watcher.subscribe(lambda old, new: finished.append(new), from_state='P_WORKING', to_state='P_FINISH')
+    watcher.start()
+    try:
+        assert watcher.wait_for('P_FINISH', timeout=5)
+    finally:
+        watcher.stop()
+    assert transitions == [('P_IDLE', 'P_WORKING'), ('P_WORKING', 'P_FINISH')]
+    assert finished == [{'STATUS': 'P_FINISH'}]
+
+def test_status_watcher_failing_callback():
+    messages = []
+    watcher = StatusWatcher(ScriptedM1('P_IDLE', 'P_WORKING', 'P_FINISH'), fast_interval=0.01, slow_interval=0.01,
+                            log=messages.append)
+    def fail(old, new):
+        raise ValueError('broken subscriber')
+    watcher.subscribe(fail)
+    transitions = []
+    watcher.subscribe(lambda old, new: transitions.append(new['STATUS']))
+    watcher.start()
+    try:
+        assert watcher.wait_for('P_FINISH', timeout=5)
+    finally:
+        watcher.stop()
+    assert transitions == ['P_WORKING', 'P_FINISH']
+    assert len(messages) == 2 and 'broken subscriber' in messages[0]
+
+def test_status_watcher_interval():
+    watcher = StatusWatcher(ScriptedM1('P_WORKING', 'P_IDLE'), fast_interval=1, slow_interval=10, settle_seconds=0)
+    watcher.poll()
+    assert watcher.interval() == 1
+    watcher.poll()
+    assert watcher.interval() == 10
+    watcher.settle_seconds = 60
+    watcher.poke()
+    assert watcher.interval() == 1
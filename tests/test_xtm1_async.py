@@ -0,0 +1,186 @@
+import asyncio
+import io
+import json
+import pytest
+import socket
+import os
+import sys
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from xtm1_async import AsyncXTM1, HTTPConnectionPool
+
+class FakeM1Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    lock = Lock()
+    active = 0
+    max_active = 0
+    uploads = []
+
+    def reply(self, body: bytes, status=200, chunked=False):
+        with self.lock:
+            type(self).active += 1
+            type(self).max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            type(self).active -= 1
+        self.send_response(status)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for i in range(0, len(body), 3):
+                part = body[i:i+3]
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(part), part))
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/cnc/status':
+            self.reply(json.dumps({'STATUS': 'P_IDLE'}).encode('utf-8'))
+        elif self.path.startswith('/snap'):
+            self.reply(b'JPEG' * 10, chunked=True)
+        else:
+            self.reply(b'not found', status=404)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.path.startswith('/cnc/data?action=upload'):
+            self.uploads.append(body)
+        self.reply(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def port():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeM1Handler)
+    FakeM1Handler.max_active = 0
+    FakeM1Handler.uploads = []
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+def client(port, **kwargs) -> AsyncXTM1:
+    m1 = AsyncXTM1('127.0.0.1', **kwargs)
+    m1.PORT = m1.CAMERA_PORT = port
+    return m1
+
+def test_status_and_camera(port):
+    async def run():
+        async with client(port) as m1:
+            assert await m1.is_idle()
+            assert await m1.get_camera_image() == b'JPEG' * 10
+    asyncio.run(run())
+
+def test_bounded_concurrency(port):
+    async def run():
+        async with client(port, max_concurrency=2) as m1:
+            results = await asyncio.gather(*(m1.get_status() for _ in range(6)))
+            assert all(status['STATUS'] == 'P_IDLE' for status in results)
+    asyncio.run(run())
+    assert FakeM1Handler.max_active == 2
+
+def test_upload(port):
+    async def run():
+        async with client(port) as m1:
+            assert await m1.upload_gcode(b'G1 X1 Y1\n') == b'ok'
+    asyncio.run(run())
+    with zipfile.ZipFile(io.BytesIO(FakeM1Handler.uploads[0])) as zip_file:
+        assert b'G1 X1 Y1' in zip_file.read('gcodes.txt')
+
+def test_error_status(port):
+    async def run():
+        async with client(port) as m1:
+            with pytest.raises(RuntimeError, match='404'):
+                await m1.get_camera_calibration()
+    asyncio.run(run())
+
+async def start_closing_server(requests: list):
+    "A server that answers the first request on each connection and closes it after reading the second one."
+    async def handle(reader, writer):
+        for answered in (True, False):
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(head.lower().split(b'content-length:')[1].split(b'\r\n')[0])
+            requests.append(head.split(b' ')[0] + b' ' + await reader.readexactly(length))
+            if not answered:
+                break
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok')
+            await writer.drain()
+        writer.close()
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    return server, server.sockets[0].getsockname()[1]
+
+def test_retry_only_get_on_closed_connection():
+    async def run():
+        requests = []
+        server, port = await start_closing_server(requests)
+        async with server:
+            pool = HTTPConnectionPool('127.0.0.1', port)
+            assert await pool.request('GET', '/cnc/status') == (200, b'ok')
+            assert await pool.request('GET', '/cnc/status') == (200, b'ok') # Repeated on a new connection
+            assert requests == [b'GET ', b'GET ', b'GET ']
+            pool.close()
+            pool = HTTPConnectionPool('127.0.0.1', port)
+            assert await pool.request('POST', '/cnc/cmd', b'M18 S0') == (200, b'ok')
+            with pytest.raises((ConnectionError, asyncio.IncompleteReadError)):
+                await pool.request('POST', '/cnc/cmd', b'M18 S255')
+            assert requests[3:] == [b'POST M18 S0', b'POST M18 S255'] # Not sent twice
+            pool.close()
+    asyncio.run(run())
+
+def start_slow_server(reply_delay=0.0):
+    """A server that reads a request in pieces of up to 64 KB, 20 per second and replies after reply_delay.
+
+    The status line, headers and body of the reply each take reply_delay seconds.
+    """
+    server = socket.create_server(('127.0.0.1', 0))
+    received = []
+    def serve():
+        connection, _address = server.accept()
+        data = b''
+        while b'\r\n\r\n' not in data:
+            data += connection.recv(16384)
+        head, body = data.split(b'\r\n\r\n', 1)
+        length = int(head.lower().split(b'content-length:')[1].split(b'\r\n')[0])
+        while len(body) < length:
+            body += connection.recv(65536)
+            time.sleep(0.05)
+        received.append(body)
+        for part in (b'HTTP/1.1 200 OK\r\n', b'Content-Length: 2\r\n\r\n', b'ok'):
+            time.sleep(reply_delay)
+            connection.sendall(part)
+        connection.close()
+    Thread(target=serve, daemon=True).start()
+    return server, received
+
+def test_timeout_applies_to_each_step():
+    server, received = start_slow_server(reply_delay=0.3)
+    body = bytes(range(256)) * 4096 # 1 MB, takes about 1 s to send
+    async def run():
+        pool = HTTPConnectionPool('127.0.0.1', server.getsockname()[1], read_timeout=0.8)
+        try:
+            return await pool.request('POST', '/cnc/data?action=upload', body)
+        finally:
+            pool.close()
+    start = time.monotonic()
+    assert asyncio.run(run()) == (200, b'ok')
+    assert time.monotonic() - start > 1.6 and received == [body] # Twice the timeout in total
+    server.close()
+
+def test_timeout_when_stalled():
+    server = socket.create_server(('127.0.0.1', 0)) # Accepts, but never replies
+    async def run():
+        pool = HTTPConnectionPool('127.0.0.1', server.getsockname()[1], read_timeout=0.2)
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.request('GET', '/cnc/status')
+        pool.close()
+    asyncio.run(run())
+    server.close()
@@ -0,0 +1,71 @@
+import io
+import os
+import sys
+import zipfile
+import pytest
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from xtm1 import XTM1, create_translator
+from xtm1_cache import TranslationCache
+from test_xtm1 import StatusHandler, server
+
+@pytest.fixture
+def cache(tmp_path):
+    return TranslationCache(str(tmp_path / 'cache'), max_bytes=1000)
+
+def test_key_depends_on_settings():
+    key = TranslationCache.key
+    assert key('a', create_translator(), 0) == key('a', create_translator(), 0)
+    assert key('a', create_translator(), 0) != key('b', create_translator(), 0)
+    assert key('a', create_translator(), 0) != key('a', create_translator(3.0), 0)
+    assert key('a', create_translator(), 0) != key('a', create_translator(), 8)
+    translator = create_translator()
+    translator.material_height_zero_z = 19.0
+    assert key('a', create_translator(), 0) != key('a', translator, 0)
+
+def test_put_get_and_evict(cache):
+    assert cache.get('one') is None
+    for i, name in enumerate(('one', 'two', 'three')):
+        with cache.put(name) as f:
+            f.write(b'x' * 400)
+        os.utime(cache.path(name), (i, i)) # Distinct last use times
+    assert cache.get('one') is None # Least recently used, evicted when 'three' was added
+    assert open(cache.get('two'), 'rb').read() == b'x' * 400
+    assert cache.size() == 800
+
+def test_failed_put_leaves_no_entry(cache):
+    with pytest.raises(ValueError):
+        with cache.put('broken') as f:
+            f.write(b'partial')
+            raise ValueError()
+    assert cache.get('broken') is None
+    assert os.listdir(cache.directory) == []
+
+def test_repeated_upload_uses_cache(server, tmp_path):
+    cache = TranslationCache(str(tmp_path / 'cache'))
+    gcode = b'G0 X1 Y2 Z3\nG1 X10 Y20 S255\n' * 100
+    with XTM1('127.0.0.1', cache=cache) as m1:
+        m1.PORT = server.server_address[1]
+        m1.upload_gcode(gcode)
+        assert not m1.last_upload.cached
+        m1.upload_gcode(gcode)
+        assert m1.last_upload.cached
+        assert m1.last_upload.gcode_bytes == len(create_translator().translate_file_content(gcode))
+        m1.upload_gcode(gcode, material_thickness=2.0)
+        assert not m1.last_upload.cached
+    uploads = [zipfile.ZipFile(io.BytesIO(body)).read('gcodes.txt') for _encoding, body in StatusHandler.uploads if body]
+    assert uploads[0] == uploads[1] == create_translator().translate_file_content(gcode)
+    assert uploads[2] == create_translator(2.0).translate_file_content(gcode)
+    assert len(cache.entries()) == 2
+
+def test_upload_larger_than_cache(server, tmp_path):
+    cache = TranslationCache(str(tmp_path / 'cache'), max_bytes=1000)
+    gcode = b'G0 X1 Y2\nG1 X10 Y20 S255\n' * 100
+    with XTM1('127.0.0.1', cache=cache) as m1:
+        m1.PORT = server.server_address[1]
+        assert m1.upload_gcode(gcode) == b'ok'
+        assert m1.upload_gcode(gcode + b'G0 X0\n') == b'ok' # Evicts the first one, but not itself
+    assert len(cache.entries()) == 1 and cache.size() > cache.max_bytes
+    uploads = [zipfile.ZipFile(io.BytesIO(body)).read('gcodes.txt') for _encoding, body in StatusHandler.uploads if body]
+    assert uploads == [create_translator().translate_file_content(g) for g in (gcode, gcode + b'G0 X0\n')]
@@ -0,0 +1,128 @@
+import json
+import os
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+cv2 = pytest.importorskip('cv2')
+import xtm1_camera
+
+SIZE = (200, 150)
+
+@pytest.fixture
+def points():
+    # Slightly bent grid over a 660x500 camera image
+    return [[{'x': c * 16 + 5 * np.sin(r / 5), 'y': r * 16 + 3 * np.cos(c / 7)} for c in range(41)] for r in range(31)]
+
+@pytest.fixture(autouse=True)
+def empty_memory_cache():
+    xtm1_camera._remap_maps.clear()
+    yield
+    xtm1_camera._remap_maps.clear()
+
+def test_remap_maps_match_float_maps(points, tmp_path):
+    img = np.tile((np.arange(660) // 3).astype(np.uint8), (500, 1)) # Smooth gradient
+    float_map = xtm1_camera.compute_remap(points, SIZE)
+    assert float_map.shape == (SIZE[1], SIZE[0], 2)
+    expected = cv2.remap(img, float_map, None, cv2.INTER_CUBIC).astype(int)
+    map_xy, map_frac = xtm1_camera.get_remap_maps(points, SIZE, str(tmp_path))
+    assert map_xy.dtype == np.int16
+    actual = cv2.remap(img, map_xy, map_frac, cv2.INTER_CUBIC).astype(int)
+    assert np.abs(actual - expected)[2:-2, 2:-2].max() <= 1 # The border samples outside of the image
+
+def test_remap_maps_are_cached(points, tmp_path):
+    maps = xtm1_camera.get_remap_maps(points, SIZE, str(tmp_path))
+    assert xtm1_camera.get_remap_maps(points, SIZE, str(tmp_path)) is maps
+    assert len(os.listdir(tmp_path)) == 2
+    xtm1_camera._remap_maps.clear()
+    loaded = xtm1_camera.get_remap_maps(points, SIZE, str(tmp_path))
+    assert isinstance(loaded[0], np.memmap)
+    assert all(np.array_equal(a, b) for a, b in zip(maps, loaded))
+    other_size = xtm1_camera.get_remap_maps(points, (100, 75), str(tmp_path))
+    assert other_size[0].shape == (75, 100, 2)
+
+def test_remap_maps_without_disk_cache(points, tmp_path, monkeypatch):
+    monkeypatch.setattr(xtm1_camera, 'REMAP_CACHE_DIR', str(tmp_path / 'default'))
+    maps = xtm1_camera.get_remap_maps(points, SIZE, cache_dir=False)
+    assert xtm1_camera.get_remap_maps(points, SIZE, cache_dir=False) is maps
+    assert not os.path.exists(tmp_path / 'default')
+    xtm1_camera._remap_maps.clear()
+    xtm1_camera.get_remap_maps(points, SIZE)
+    assert len(os.listdir(tmp_path / 'default')) == 2
+
+def test_load_calibration_data_is_cached(points, tmp_path):
+    class FakeM1:
+        downloads = 0
+        def get_camera_calibration(self):
+            self.downloads += 1
+            return json.dumps({'points': points}).encode('utf-8')
+    m1 = FakeM1()
+    filename = str(tmp_path / 'calibration.json')
+    first = xtm1_camera.load_calibration_data(m1, filename)
+    assert first == json.loads(json.dumps(points))
+    assert xtm1_camera.load_calibration_data(m1, filename) is first
+    assert m1.downloads == 1
+    with open(filename, 'w') as f:
+        json.dump({'points': [[{'x': 1, 'y': 2}]]}, f)
+    os.utime(filename, ns=(0, 0)) # Make sure the modification time changed
+    assert xtm1_camera.load_calibration_data(m1, filename) == [[{'x': 1, 'y': 2}]]
+
+def jpeg(size=(640, 480)):
+    from PIL import Image
+    import io
+    buffer = io.BytesIO()
+    Image.fromarray(np.random.default_rng(0).integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+def test_decode_jpeg_at_reduced_scale():
+    img, scale = xtm1_camera.decode_jpeg(jpeg(), (150, 100))
+    assert img.size == (160, 120)
+    assert scale == 0.25
+    img, scale = xtm1_camera.decode_jpeg(jpeg(), (640, 480))
+    assert img.size == (640, 480) and scale == 1.0
+
+def test_latest_frame_drops_old_frames():
+    latest = xtm1_camera.LatestFrame()
+    assert latest.take(timeout=0) is None
+    assert latest.put('a', 1)
+    assert latest.put('b', 3)
+    assert not latest.put('c', 2) # Older than the frame already there
+    assert latest.take() == 'b'
+    assert latest.take(timeout=0) is None
+    assert latest.dropped == 2
+
+def test_pipeline(points, tmp_path, monkeypatch):
+    monkeypatch.setattr(xtm1_camera, 'REMAP_CACHE_DIR', str(tmp_path))
+    class FakeM1:
+        def get_camera_image(self):
+            return jpeg((660, 500))
+    pipeline = xtm1_camera.CameraPipeline(FakeM1(), SIZE, points)
+    pipeline.start()
+    try:
+        frames = [pipeline.take(timeout=10) for _ in range(3)]
+    finally:
+        pipeline.stop()
+    assert all(frame.size == SIZE for frame in frames)
+    assert pipeline.stats['fetch'].count >= 3
+    assert pipeline.stats['decode'].count >= 3
+    pipeline.frame_shown(0.001)
+    assert 'FPS shown' in pipeline.report()
+
+def test_pipeline_counts_decode_errors(points, tmp_path, monkeypatch):
+    monkeypatch.setattr(xtm1_camera, 'REMAP_CACHE_DIR', str(tmp_path))
+    class FakeM1:
+        calls = 0
+        def get_camera_image(self):
+            self.calls += 1
+            return b'not a JPEG' if self.calls == 1 else jpeg((660, 500))
+    pipeline = xtm1_camera.CameraPipeline(FakeM1(), SIZE, points, workers=1)
+    pipeline._stopping.wait = lambda timeout: False # Retry right away
+    pipeline.start()
+    try:
+        frame = pipeline.take(timeout=10)
+    finally:
+        pipeline.stop()
+    assert frame.size == SIZE
+    assert pipeline.errors == 1
@@ -0,0 +1,144 @@
+import asyncio
+import pytest
+import os
+import sys
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from fake_m1 import FakeM1
+from xtm1 import DeviceHTTPError, UnexpectedGcodeError
+from xtm1_async import AsyncXTM1
+from xtm1_fleet import Fleet
+
+class FakeClient:
+    "Stands in for AsyncXTM1. A job runs for one poll after it was uploaded."
+    def __init__(self, IP, tool_type=None):
+        self.IP = IP
+        self.tool_type = tool_type
+        self.uploads = []
+        self.polls_until_done = 0
+
+    async def get_status(self):
+        if self.polls_until_done > 0:
+            self.polls_until_done -= 1
+            return {'STATUS': 'P_WORKING'}
+        return {'STATUS': 'P_IDLE'}
+
+    async def upload_gcode(self, gcode, material_thickness=None, tool_type='Laser'):
+        self.tool_type = tool_type
+        self.uploads.append(gcode)
+        self.polls_until_done = 1
+        return b'ok'
+
+@pytest.fixture
+def fleet():
+    fleet = Fleet(poll_interval=0)
+    fleet.add_machine(FakeClient('m1', tool_type='Blade'))
+    fleet.add_machine(FakeClient('m2', tool_type='Laser'))
+    return fleet
+
+def test_prefers_matching_tool_type(fleet: Fleet):
+    fleet.submit(b'G1 X1', name='laser')
+    asyncio.run(fleet.step())
+    m1, m2 = fleet.machines
+    assert m1.client.uploads == [] and m2.client.uploads == [b'G1 X1']
+
+def test_runs_all_jobs(fleet: Fleet):
+    for i in range(5):
+        fleet.submit(b'G1 X%d' % i, name=str(i))
+    asyncio.run(fleet.run(until_empty=True))
+    assert len(fleet.finished) == 5
+    assert sum(m.jobs_done for m in fleet.machines) == 5
+    assert all(m.job is None for m in fleet.machines)
+    assert 'finished' in fleet.report()
+
+def test_failed_upload_requeues_job(fleet: Fleet):
+    async def not_idle(*args):
+        return False
+    for machine in fleet.machines:
+        machine.client.upload_gcode = not_idle
+    job = fleet.submit(b'G1 X1')
+    asyncio.run(fleet.step())
+    assert list(fleet.queue) == [job] and job.dispatched is None
+
+def test_network_error_requeues_job(fleet: Fleet):
+    async def unreachable(*args):
+        raise ConnectionResetError()
+    for machine in fleet.machines:
+        machine.client.upload_gcode = unreachable
+    job = fleet.submit(b'G1 X1')
+    asyncio.run(fleet.step())
+    assert list(fleet.queue) == [job] and fleet.failed == []
+
+def test_server_error_requeues_job(fleet: Fleet):
+    async def busy(*args):
+        raise DeviceHTTPError(503, 'POST /cnc/data?action=upload')
+    for machine in fleet.machines:
+        machine.client.upload_gcode = busy
+    job = fleet.submit(b'G1 X1')
+    asyncio.run(fleet.step())
+    assert list(fleet.queue) == [job] and fleet.failed == []
+
+def test_client_error_fails_job(fleet: Fleet):
+    fleet.log = lambda message: None
+    async def not_found(*args):
+        raise DeviceHTTPError(404, 'POST /cnc/data?action=upload')
+    for machine in fleet.machines:
+        machine.client.upload_gcode = not_found
+    job = fleet.submit(b'G1 X1')
+    asyncio.run(fleet.step())
+    assert fleet.failed == [job] and job.error.status == 404
+
+def test_retries_after_server_error():
+    with FakeM1(job_seconds=0.1) as fake:
+        fake.fail_next(1, '/cnc/data?action=upload', status=503)
+        client = AsyncXTM1(fake.IP)
+        client.PORT, client.CAMERA_PORT = fake.PORT, fake.CAMERA_PORT
+        fleet = Fleet(poll_interval=0.05)
+        fleet.add_machine(client)
+        job = fleet.submit(b'G1 X1 S100', name='job')
+        async def run():
+            async with client:
+                await asyncio.wait_for(fleet.run(until_empty=True), 10)
+        asyncio.run(run())
+        assert fleet.finished == [job] and fleet.failed == []
+        assert len(fake.uploads) == 1
+
+def test_bad_job_fails_without_retrying(fleet: Fleet):
+    fleet.log = lambda message: None
+    bad = fleet.submit(b'G2 X1 Y1 I1 J1', name='bad')
+    good = fleet.submit(b'G1 X1', name='good')
+    for machine in fleet.machines:
+        async def upload(gcode, *args, upload_gcode=machine.client.upload_gcode):
+            if gcode == bad.gcode:
+                raise UnexpectedGcodeError('Unknown G-code')
+            return await upload_gcode(gcode, *args)
+        machine.client.upload_gcode = upload
+    asyncio.run(asyncio.wait_for(fleet.run(until_empty=True), 5))
+    assert fleet.failed == [bad] and isinstance(bad.error, UnexpectedGcodeError)
+    assert fleet.finished == [good]
+    assert all(m.error is None for m in fleet.machines)
+    assert '1 failed' in fleet.report()
+
+def test_job_not_started_in_time_fails(fleet: Fleet):
+    fleet.log = lambda message: None
+    fleet.start_timeout = 0
+    async def waits_for_button(*args):
+        return b'ok'
+    for machine in fleet.machines:
+        machine.client.upload_gcode = waits_for_button
+    job = fleet.submit(b'G1 X1')
+    asyncio.run(asyncio.wait_for(fleet.run(until_empty=True), 5))
+    assert fleet.failed == [job] and isinstance(job.error, TimeoutError)
+    assert fleet.finished == [] and list(fleet.queue) == []
+    assert all(m.jobs_done == 0 and m.busy_seconds == 0 for m in fleet.machines)
+
+def test_idle_machines_are_polled_less_often(fleet: Fleet):
+    fleet.idle_poll_interval = 60
+    asyncio.run(fleet.step())
+    polled = [m.last_poll for m in fleet.machines]
+    asyncio.run(fleet.step())
+    assert [m.last_poll for m in fleet.machines] == polled
+    fleet.submit(b'G1 X1')
+    asyncio.run(fleet.step())
+    assert all(m.last_poll > p for m, p in zip(fleet.machines, polled))
@@ -0,0 +1,83 @@
+import io
+import os
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from gcode import GcodeFramer
+from gcode_moves import MoveTable
+from xtm1 import GcodeTranslator
+from xtm1_job import JobFile, create_job
+
+SOURCE = os.path.join(current_dir, 'test-gcode', 'lasse.gcode')
+
+@pytest.fixture(params=[1000, 16 * 1024 * 1024])
+def job(request, tmp_path):
+    with create_job(SOURCE, str(tmp_path / 'lasse.xtm1job'), chunk_size=request.param) as job:
+        yield job
+
+@pytest.fixture
+def gcode():
+    with open(SOURCE, 'rb') as f:
+        return f.read()
+
+def test_round_trip(job: JobFile, gcode):
+    expected = GcodeTranslator().translate_file_content(gcode)
+    assert job.translated() == expected
+    out = io.BytesIO()
+    job.write_translated(out)
+    assert out.getvalue() == expected
+    assert job.header['source']['size'] == len(gcode)
+
+def test_records(job: JobFile, gcode):
+    table = MoveTable.from_gcode(gcode)
+    for name, column in table.columns().items():
+        np.testing.assert_array_equal(job.table.columns()[name], column)
+    translator = GcodeTranslator()
+    for row in range(0, len(job), 97):
+        source_line = gcode[job.table.offset[row]:].split(b'\n')[0]
+        assert job.translated_line(row) == translator.process_line(source_line)
+
+def test_metadata(job: JobFile):
+    assert job.frame_gcode() == GcodeFramer().calculate_frame_file(SOURCE)
+    assert [name for name, _ms in job.estimate.layers] == ['start', 'Layer C03 Pass 1 of 2', 'Layer C03 Pass 2 of 2']
+    assert job.header['translator'] == GcodeTranslator().settings()
+    assert 'Bounds' in str(job)
+
+def test_retranslate(job: JobFile, gcode):
+    translator = GcodeTranslator()
+    translator.force_material_thickness = 2.5
+    out = io.BytesIO()
+    job.retranslate(out, 2.5)
+    assert out.getvalue() == translator.translate_file_content(gcode)
+    with pytest.raises(RuntimeError):
+        job.retranslate(io.BytesIO(), 20)
+
+@pytest.mark.parametrize('chunk_size', [8, 1024])
+def test_retranslate_unusual_z(tmp_path, chunk_size):
+    gcode = b'G90\nG0 X1 Y1 Z2 Z3\nG1 X2 S100 ; Z4\n  G1 Z1.5 X3\n; Z9\nG1 X1 Z0.25\n'
+    source = tmp_path / 'z.gcode'
+    source.write_bytes(gcode)
+    translator = GcodeTranslator()
+    translator.force_material_thickness = 2.5
+    out = io.BytesIO()
+    with create_job(str(source), chunk_size=chunk_size) as job:
+        job.retranslate(out, 2.5)
+    assert out.getvalue() == translator.translate_file_content(gcode)
+
+def test_already_translated(tmp_path, gcode):
+    translated = GcodeTranslator().translate_file_content(gcode)
+    source = tmp_path / 'job.xtm1.gcode'
+    source.write_bytes(translated)
+    with create_job(str(source)) as job:
+        assert job.translated() == translated
+        assert all(job.translated_offsets == job.table.offset)
+        with pytest.raises(ValueError):
+            job.retranslate(io.BytesIO(), 1)
+    assert os.path.exists(tmp_path / 'job.xtm1.xtm1job')
+
+def test_not_a_job_file():
+    with pytest.raises(ValueError):
+        JobFile(SOURCE)
@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+from socket import socketpair
+import pytest
+current_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from StreamLineReader import StreamLineReader
+from xtm1 import GcodeTranslator
+from xtm1_metrics import Metrics, metrics
+
+@pytest.fixture
+def enabled():
+    "The global registry, switched on and empty"
+    metrics.reset()
+    metrics.enabled = True
+    yield metrics
+    metrics.enabled = False
+    metrics.reset()
+
+def test_disabled():
+    registry = Metrics()
+    registry.count('a_total')
+    with registry.span('b_seconds'):
+        pass
+    assert registry.counters == {} and registry.histograms == {}
+    assert registry.span('b_seconds') is registry.span('c_seconds') # Shared no-op
+    assert registry.prometheus_text() == '' and registry.json_lines() == ''
+
+def test_prometheus_text():
+    registry = Metrics(enabled=True, buckets=(0.1, 1.0))
+    registry.describe('jobs_total', 'Jobs')
+    registry.count('jobs_total', source='tcp')
+    registry.count('jobs_total', 2, source='tcp')
+    registry.count('jobs_total', source='a "quoted"\nname')
+    for seconds in (0.05, 0.5, 5.0):
+        registry.observe('request_seconds', seconds, endpoint='/cnc/status')
+    assert registry.value('jobs_total', source='tcp') == 3
+    assert registry.prometheus_text() == '''# HELP jobs_total Jobs
+# TYPE jobs_total counter
+jobs_total{source="a \\"quoted\\"\\nname"} 1
+jobs_total{source="tcp"} 3
+# TYPE request_seconds histogram
+request_seconds_bucket{endpoint="/cnc/status",le="0.1"} 1
+request_seconds_bucket{endpoint="/cnc/status",le="1.0"} 2
+request_seconds_bucket{endpoint="/cnc/status",le="+Inf"} 3
+request_seconds_sum{endpoint="/cnc/status"} 5.55
+request_seconds_count{endpoint="/cnc/status"} 3
+'''
+
+def test_json_lines_and_write(tmp_path):
+    registry = Metrics(enabled=True, buckets=(1.0,))
+    registry.count('jobs_total', 2)
+    with registry.span('work_seconds', step='a'):
+        pass
+    lines = [json.loads(line) for line in registry.json_lines(timestamp=100).splitlines()]
+    assert lines[0] == {'time': 100, 'name': 'jobs_total', 'type': 'counter', 'labels': {}, 'value': 2}
+    assert lines[1]['labels'] == {'step': 'a'} and lines[1]['count'] == 1 and lines[1]['buckets'][-1] == ['+Inf', 1]
+    registry.write(str(tmp_path / 'metrics.prom'))
+    registry.write(str(tmp_path / 'metrics.jsonl'))
+    assert (tmp_path / 'metrics.prom').read_text() == registry.prometheus_text()
+    assert len((tmp_path / 'metrics.jsonl').read_text().splitlines()) == 2
+    assert sorted(os.listdir(tmp_path)) == ['metrics.jsonl', 'metrics.prom']
+
+def test_translator_and_stream_reader(enabled):
+    gcode = b'G0 X1 Y2\nG1 X10 Y20 S255\n' * 1000
+    GcodeTranslator().translate_file_content(gcode)
+    assert enabled.value('xtm1_translated_lines_total') == 2001 # The last, empty line counts too
+    assert enabled.value('xtm1_translated_bytes_total') == len(gcode)
+    assert enabled.value('xtm1_translate_seconds').count == 1
+
+    a, b = socketpair()
+    reader = StreamLineReader(a)
+    b.sendall(gcode)
+    b.close()
+    assert len(reader.readlines()) + sum(1 for _ in reader) == 2000
+    assert enabled.value('xtm1_stream_lines_total', channel='socket') == 2000
+    assert enabled.value('xtm1_stream_read_bytes_total', channel='socket') == len(gcode)
+    a.close()
+
+WORKER_SCRIPT = '''
+import multiprocessing
+import sys
+sys.path.insert(0, {root!r})
+import xtm1_metrics
+
+def exporting():
+    import xtm1_metrics
+    return xtm1_metrics.metrics._exporter is not None
+
+if __name__ == '__main__':
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        print(pool.apply(exporting))
+    xtm1_metrics.metrics.count('main_total')
+'''
+
+def test_export_only_from_main_process(tmp_path):
+    import subprocess
+    script = tmp_path / 'script.py'
+    script.write_text(WORKER_SCRIPT.format(root=os.path.join(current_dir, '..')))
+    filename = tmp_path / 'metrics.prom'
+    output = subprocess.run([sys.executable, str(script)], env=dict(os.environ, XTM1_METRICS=str(filename)),
+                            capture_output=True, text=True, timeout=60, check=True).stdout
+    assert output.strip() == 'False' # The worker does not export
+    assert 'main_total 1' in filename.read_text()
@@ -1,27 +1,91 @@
 from genericpath import exists
+import hashlib
 import io
+import itertools
+import os
 import requests
+import requests.adapters
 import zipfile
 import json
 import time
 import re
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterable, Iterator
+
+from xtm1_cache import file_digest
+from xtm1_metrics import metrics
+
+IDLE_STATES = ('P_IDLE', 'P_SLEEP', 'P_FINISH')
+UPLOAD_URL = '/cnc/data?action=upload&zip=true&id=-1'
 
 class XTM1:
-    def __init__(self, IP='201.234.3.1') -> None:
+    def __init__(self, IP='201.234.3.1', connect_timeout=10, read_timeout=10, pool_size=4,
+                 compression=zipfile.ZIP_STORED, compresslevel=None, chunked_upload=False, cache=None) -> None:
         self.IP = IP
         self.PORT = 8080
         self.CAMERA_PORT = 8329
+        self.timeout = (connect_timeout, read_timeout)
+        self.tool_type = None # Last tool type set with set_tool_type()
+        # Upload settings, e.g. compression=zipfile.ZIP_DEFLATED. See UploadStats for measuring the effect.
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.chunked_upload = chunked_upload
+        self.last_upload = None # UploadStats of the last upload
+        self.cache = cache # Optional xtm1_cache.TranslationCache for repeated uploads
+        self.optimizers = [] # See GcodeTranslator.optimizers
+        # The last status reply is kept, uploads use it instead of asking again if it is younger than this
+        self.status_max_age = 1.0
+        self.last_status = None # (time.monotonic() of the reply, status dict)
+        self.status_watcher = None
+        # One keep-alive session. The adapter keeps a connection pool per host and port, so the control
+        # and camera ports have their own, also if IP or the ports are changed after construction.
+        self.session = requests.Session()
+        self.session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=pool_size))
+
+    def close(self) -> None:
+        if self.status_watcher is not None:
+            self.status_watcher.stop()
+        self.session.close()
+
+    def __enter__(self) -> 'XTM1':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def get_status(self) -> dict:
         reply = self._get_request(f'/cnc/status').decode('utf-8')
-        return json.loads(reply)
-
-    def is_idle(self) -> bool:
-        status = self.get_status()
-        return status['STATUS'] in ('P_IDLE', 'P_SLEEP', 'P_FINISH')
+        status = json.loads(reply)
+        self.last_status = (time.monotonic(), status)
+        return status
+
+    def cached_status(self, max_age: float):
+        "The last status if it is at most max_age seconds old, otherwise None."
+        last_status = self.last_status
+        if last_status is not None and time.monotonic() - last_status[0] <= max_age:
+            return last_status[1]
+        return None
+
+    def is_idle(self, max_age=0.0) -> bool:
+        "Whether the machine is idle. A cached status is used if it is at most max_age seconds old."
+        status = self.cached_status(max_age) or self.get_status()
+        return status['STATUS'] in IDLE_STATES
+
+    def watch_status(self, **kwargs) -> 'StatusWatcher':
+        "Start polling the status in the background, see StatusWatcher."
+        if self.status_watcher is None:
+            self.status_watcher = StatusWatcher(self, **kwargs)
+            self.status_watcher.start()
+        return self.status_watcher
 
     def stop(self):
-        return self._get_request('/cnc/data?action=stop')
+        try:
+            return self._get_request('/cnc/data?action=stop')
+        finally:
+            self.last_status = None # The state changes
 
     def set_laserpointer(self, on: bool):
         return self.execute_gcode_command('M18 S255' if on else 'M18 S0')
@@ -43,61 +107,351 @@ class XTM1:
     def execute_gcode_command(self, gcode):
         timestamp = int(time.time() * 1000)
         gcode = gcode.replace(' ', '%20')
-        return self._get_request(f'/cnc/cmd?cmd={gcode}&t={timestamp}')
+        try:
+            return self._get_request(f'/cnc/cmd?cmd={gcode}&t={timestamp}')
+        finally:
+            self.last_status = None # The command may change the state
     
     def upload_gcode_file(self, filename, material_thickness=None):
+        "Upload a G-code file, translating and zipping it while it is read."
+        digest = file_digest(filename) if self.cache is not None else None
         with open(filename, 'rb') as f:
-            return self.upload_gcode(f.read(), material_thickness=material_thickness)
+            chunks = iter(lambda: f.read(GcodeTranslator.STREAM_CHUNK_SIZE), b'')
+            return self._upload_chunks(chunks, material_thickness=material_thickness, digest=digest)
 
     def upload_gcode(self, gcode, material_thickness=None, tool_type='Laser'):
-        if not self.is_idle():
+        size = GcodeTranslator.STREAM_CHUNK_SIZE
+        chunks = (gcode[i:i + size] for i in range(0, len(gcode), size))
+        digest = hashlib.sha256(gcode).hexdigest() if self.cache is not None else None
+        return self._upload_chunks(chunks, material_thickness, tool_type, digest)
+
+    def _upload_chunks(self, chunks: Iterable[bytes], material_thickness=None, tool_type='Laser', digest=None):
+        with metrics.span('xtm1_upload_phase_seconds', phase='is_idle', device=self.IP):
+            idle = self.is_idle(self.status_max_age)
+        if not idle:
             return False
         if tool_type != 'Laser':
             raise NotImplementedError('Only Laser G-code is currently supported, not ' + tool_type)
-        self.set_tool_type(tool_type)
+        with metrics.span('xtm1_upload_phase_seconds', phase='set_tool_type', device=self.IP):
+            self.set_tool_type(tool_type)
 
-        translator = GcodeTranslator()
         if material_thickness == 'auto':
             print('Measuring material thicknes... ', end='')
-            material_thickness = self.measure_thickness()
+            with metrics.span('xtm1_upload_phase_seconds', phase='measure_thickness', device=self.IP):
+                material_thickness = self.measure_thickness()
             print(material_thickness)
-            translator.force_material_thickness = material_thickness
-        elif material_thickness is not None:
-            translator.force_material_thickness = material_thickness
+        translator = create_translator(material_thickness, self.optimizers)
+
+        stats = UploadStats(self.compression, self.compresslevel, self.chunked_upload)
+        translated = stats.count_gcode(translator.translate_chunks(chunks))
+        if digest is not None:
+            # Uploads through the cache always send the stored zip file, even if chunked_upload is set
+            key = self.cache.key(digest, translator, self.compression, self.compresslevel)
+            zip_path = self.cache.get(key)
+            stats.chunked = False
+            stats.cached = zip_path is not None
+            if zip_path is None:
+                start = time.perf_counter()
+                with self.cache.put(key) as zip_file:
+                    write_zip(translated, zip_file, self.compression, self.compresslevel)
+                stats.prepare_seconds = time.perf_counter() - start
+                zip_path = self.cache.path(key)
+            with open(zip_path, 'rb') as zip_file:
+                if stats.cached:
+                    stats.gcode_bytes = zipfile.ZipFile(zip_file).infolist()[0].file_size
+                    zip_file.seek(0)
+                reply = self._post_zip_file(zip_file, stats)
+        elif self.chunked_upload:
+            # requests sends a generator body with chunked transfer encoding, so the zip
+            # is produced while it is sent. Translation time is part of the transfer time.
+            data = stats.count_wire(iter_zip(translated, self.compression, self.compresslevel))
+            start = time.perf_counter()
+            reply = self._post_request(UPLOAD_URL, data=data)
+            stats.transfer_seconds = time.perf_counter() - start
         else:
-            pass # Use the Z values present in G-code file, just invert them
-            
-        gcode = translator.translate_file_content(gcode)
-        #print('################ G-Code file contents: ###########')
-        #print(gcode.decode('utf-8'))
-
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'a', zipfile.ZIP_STORED, False) as zip_file:
-            zip_file.writestr('gcodes.txt', gcode)
-        zip_buffer.seek(0)
-        return self._post_request('/cnc/data?action=upload&zip=true&id=-1', data=zip_buffer)
+            with tempfile.TemporaryFile() as zip_file:
+                start = time.perf_counter()
+                write_zip(translated, zip_file, self.compression, self.compresslevel)
+                stats.prepare_seconds = time.perf_counter() - start
+                zip_file.seek(0)
+                reply = self._post_zip_file(zip_file, stats)
+        self.last_upload = stats
+        if metrics.enabled:
+            self._count_upload(stats)
+        if self.status_watcher is not None:
+            self.status_watcher.poke() # The machine is about to change its state
+        return reply
+
+    def _count_upload(self, stats: 'UploadStats') -> None:
+        # Translating and zipping happen during the POST for chunked uploads, before it otherwise
+        if stats.prepare_seconds:
+            metrics.observe('xtm1_upload_phase_seconds', stats.prepare_seconds, phase='translate_zip', device=self.IP)
+        metrics.observe('xtm1_upload_phase_seconds', stats.transfer_seconds, phase='post', device=self.IP)
+        metrics.count('xtm1_upload_bytes_total', stats.gcode_bytes, kind='gcode', device=self.IP)
+        metrics.count('xtm1_upload_bytes_total', stats.wire_bytes, kind='wire', device=self.IP)
+        metrics.count('xtm1_uploads_total', device=self.IP, cached=stats.cached, chunked=stats.chunked)
+
+    def _post_zip_file(self, zip_file: BinaryIO, stats: 'UploadStats') -> bytes:
+        stats.wire_bytes = os.fstat(zip_file.fileno()).st_size
+        start = time.perf_counter()
+        reply = self._post_request(UPLOAD_URL, data=zip_file) # Streamed from disk
+        stats.transfer_seconds = time.perf_counter() - start
+        return reply
 
     def set_tool_type(self, type='Laser'):
-        return self._post_request('/setprintToolType?type=' + type)
+        reply = self._post_request('/setprintToolType?type=' + type)
+        self.tool_type = type
+        return reply
 
     def _post_request(self, url, port=None, **kwargs) -> bytes:
         headers = { 'Content-Type': 'application/x-www-form-urlencoded' }
         if port is None: port = self.PORT
         full_url = f'http://{self.IP}:{port}{url}'
-        result = requests.post(full_url, headers=headers, timeout=10, **kwargs)
+        kwargs.setdefault('timeout', self.timeout)
+        endpoint = _endpoint(url)
+        try:
+            with metrics.span('xtm1_http_request_seconds', method='POST', endpoint=endpoint, device=self.IP):
+                result = self.session.post(full_url, headers=headers, **kwargs)
+        finally:
+            self.last_status = None # Uploads and settings change the state, so the next is_idle() has to ask
+        metrics.count('xtm1_http_responses_total', method='POST', endpoint=endpoint, device=self.IP, status=result.status_code)
         if result.status_code != 200:
-            raise RuntimeError(f'Device returned HTTP status {result.status_code} for POST {full_url}')
+            raise DeviceHTTPError(result.status_code, f'POST {full_url}')
         return result.content
 
     def _get_request(self, url, port=None, **kwargs) -> bytes:
         if port is None: port = self.PORT
         full_url = f'http://{self.IP}:{port}{url}'
-        result = requests.get(full_url, timeout=10, **kwargs)
+        kwargs.setdefault('timeout', self.timeout)
+        endpoint = _endpoint(url)
+        with metrics.span('xtm1_http_request_seconds', method='GET', endpoint=endpoint, device=self.IP):
+            result = self.session.get(full_url, **kwargs)
+        metrics.count('xtm1_http_responses_total', method='GET', endpoint=endpoint, device=self.IP, status=result.status_code)
         if result.status_code != 200:
-            raise RuntimeError(f'Device returned HTTP status {result.status_code} for GET {full_url}')
+            raise DeviceHTTPError(result.status_code, f'GET {full_url}')
         return result.content
 
 
+class DeviceHTTPError(RuntimeError):
+    "The device answered a request with an HTTP status other than 200."
+    def __init__(self, status: int, request: str) -> None:
+        super().__init__(f'Device returned HTTP status {status} for {request}')
+        self.status = status
+
+
+def _endpoint(url: str) -> str:
+    "Metrics label of a request: the path and, as the device has few paths, the action."
+    path, _, query = url.partition('?')
+    action = re.search(r'(?:^|&)action=([^&]*)', query)
+    return f'{path}?action={action.group(1)}' if action else path
+
+
+class StatusWatcher:
+    """Polls the status of an XTM1 in a background thread.
+
+    The interval adapts to the machine: fast_interval while a job is running and
+    shortly after the state changed, slow_interval while it is idle or asleep.
+    Callbacks subscribed with subscribe() are called (in the watcher thread) with
+    the old and new status dicts when the state changes, and wait_for() blocks
+    until the machine reaches a state. Exceptions of callbacks are logged, so one
+    failing subscriber neither stops the others nor the watcher.
+    """
+    SLOW_STATES = ('P_IDLE', 'P_SLEEP')
+
+    def __init__(self, m1: XTM1, fast_interval=0.25, slow_interval=5.0, settle_seconds=5.0, log=print) -> None:
+        self.m1 = m1
+        self.log = log
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.settle_seconds = settle_seconds # Keep polling fast this long after a state change
+        self.state = None
+        self.status = None
+        self.error = None
+        self.changed = None # time.monotonic() of the last state change
+        self.subscribers = []
+        self._condition = threading.Condition()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f'status-{self.m1.IP}', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poke(self) -> None:
+        "Poll now and then fast for a while, e.g. after starting a job."
+        self.changed = time.monotonic()
+        self._wakeup.set()
+
+    def subscribe(self, callback, from_state=None, to_state=None):
+        """Call callback(old_status, new_status) on state changes, optionally only from or to a state.
+
+        Returns a handle for unsubscribe().
+        """
+        handle = (callback, from_state, to_state)
+        self.subscribers.append(handle)
+        return handle
+
+    def unsubscribe(self, handle) -> None:
+        self.subscribers.remove(handle)
+
+    def wait_for(self, states, timeout=None) -> bool:
+        "Wait until the state is one of states. Returns False on timeout."
+        if isinstance(states, str):
+            states = (states,)
+        return self.wait_until(lambda state: state in states, timeout)
+
+    def wait_until(self, predicate, timeout=None) -> bool:
+        "Wait until predicate(state) is true. Returns False on timeout."
+        with self._condition:
+            return self._condition.wait_for(lambda: self.state is not None and predicate(self.state), timeout)
+
+    def interval(self) -> float:
+        if self.changed is not None and time.monotonic() - self.changed < self.settle_seconds:
+            return self.fast_interval
+        if self.error is not None or self.state in self.SLOW_STATES:
+            return self.slow_interval
+        return self.fast_interval
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self.poll()
+            self._wakeup.wait(self.interval())
+            self._wakeup.clear()
+
+    def poll(self) -> None:
+        try:
+            status = self.m1.get_status()
+        except Exception as e:
+            self.error = e
+            return
+        self.error = None
+        old_status = self.status
+        with self._condition:
+            self.status = status
+            old_state, self.state = self.state, status.get('STATUS')
+            self._condition.notify_all()
+        if old_status is None or old_state == self.state:
+            return
+        self.changed = time.monotonic()
+        for callback, from_state, to_state in list(self.subscribers):
+            if from_state in (None, old_state) and to_state in (None, self.state):
+                try:
+                    callback(old_status, status)
+                except Exception as e:
+                    self.log(f'{self.m1.IP}: status callback {callback!r} failed: {e!r}')
+
+
+def create_translator(material_thickness=None, optimizers=()) -> 'GcodeTranslator':
+    translator = GcodeTranslator()
+    translator.optimizers = list(optimizers)
+    if material_thickness is not None:
+        translator.force_material_thickness = material_thickness
+    else:
+        pass # Use the Z values present in G-code file, just invert them
+    return translator
+
+def zip_gcode(gcode: bytes, compression=zipfile.ZIP_STORED, compresslevel=None) -> bytes:
+    "Pack translated G-code into the zip file format expected by the upload endpoint."
+    zip_buffer = io.BytesIO()
+    write_zip([gcode], zip_buffer, compression, compresslevel)
+    return zip_buffer.getvalue()
+
+def _zip_info(compression) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo('gcodes.txt', date_time=time.localtime(time.time())[:6])
+    info.compress_type = compression
+    info.external_attr = 0o600 << 16
+    return info
+
+def write_zip(chunks: Iterable[bytes], zip_file: BinaryIO, compression=zipfile.ZIP_STORED, compresslevel=None) -> None:
+    "Write translated G-code chunks into an upload zip file without holding all of it in memory."
+    with zipfile.ZipFile(zip_file, 'w', compression, False, compresslevel) as archive:
+        with archive.open(_zip_info(compression), 'w') as entry:
+            for chunk in chunks:
+                entry.write(chunk)
+
+class _ChunkSink:
+    "Write-only file object that collects what zipfile writes, see iter_zip()."
+    def __init__(self) -> None:
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def iter_zip(chunks: Iterable[bytes], compression=zipfile.ZIP_STORED, compresslevel=None) -> Iterator[bytes]:
+    """Generate an upload zip file piece by piece from translated G-code chunks.
+
+    As the output cannot be seeked, the sizes follow the data in a data descriptor
+    instead of being in the local header like in the files written by write_zip().
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression, False, compresslevel) as archive:
+        with archive.open(_zip_info(compression), 'w') as entry:
+            for chunk in chunks:
+                entry.write(chunk)
+                data = sink.take()
+                if data:
+                    yield data
+    yield sink.take()
+
+class UploadStats:
+    "Sizes and timings of an upload, to compare compression settings."
+    def __init__(self, compression=zipfile.ZIP_STORED, compresslevel=None, chunked=False) -> None:
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.chunked = chunked
+        self.cached = False # Sent a zip from the translation cache
+        self.gcode_bytes = 0 # Translated G-code
+        self.wire_bytes = 0 # Zip file as sent
+        self.prepare_seconds = 0.0 # Translating and zipping, if done before the transfer
+        self.transfer_seconds = 0.0
+
+    def count_gcode(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            self.gcode_bytes += len(chunk)
+            yield chunk
+
+    def count_wire(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            self.wire_bytes += len(chunk)
+            yield chunk
+
+    @property
+    def ratio(self) -> float:
+        return self.wire_bytes / self.gcode_bytes if self.gcode_bytes else 1.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.wire_bytes / self.transfer_seconds if self.transfer_seconds else 0.0
+
+    def __str__(self) -> str:
+        method = 'deflated' if self.compression == zipfile.ZIP_DEFLATED else 'stored'
+        if self.compresslevel is not None:
+            method += f' level {self.compresslevel}'
+        if self.cached:
+            method += ', cached'
+        return (f'{self.gcode_bytes} bytes of G-code sent as {self.wire_bytes} bytes ({method}, {self.ratio:.1%}), '
+                f'prepared in {self.prepare_seconds:.2f} s, transferred in {self.transfer_seconds:.2f} s '
+                f'({self.bytes_per_second / 1024:.0f} KiB/s)')
+
+
 import re
 
 _whitespace_only_re = re.compile(rb'^[ \t]+$', re.MULTILINE)
@@ -238,6 +592,12 @@ class GcodeTranslator():
     }
 
 
+    VERSION = 3 # Increase when the output changes, to invalidate cached translations
+    HEADER_CHECK_SIZE = 1024 # is_already_processed() only looks at the start of a file
+    STREAM_CHUNK_SIZE = 1024 * 1024
+    PARALLEL_THRESHOLD = 32 * 1024 * 1024 # Smaller files are translated in one process, even if more are allowed
+    PARALLEL_CHUNK_SIZE = 8 * 1024 * 1024
+
     def __init__(self) -> None:
         self.material_height_zero_z = 17.0 # Actual Z coordinate for a material thickness of 0
         #self.material_height_zero_z = 19.0 # The real focus height seems a bit lower for my M1. Needs further investigation 
@@ -246,30 +606,55 @@ class GcodeTranslator():
         self.s_regex = re.compile(rb'(S[0-9]*)\.[0-9]+')
         self.z_regex = re.compile(rb'^(G0?[0123].*?Z)([-0-9]*(\.[0-9]+)?)(.*?)$')
         self.z_regex_multiline = re.compile(rb'^(G0?[0123].*?Z)([-0-9]*(\.[0-9]+)?)(.*?)$')
+        # Regexes for _translate_block(), which applies process_line() to a whole buffer at once.
+        # bytes.strip() and bytes.split() treat exactly these characters as whitespace (besides \n).
+        self.strip_regex_multiline = re.compile(rb'^[ \t\r\x0b\x0c]+|[ \t\r\x0b\x0c]+$', re.MULTILINE)
+        allowed = b'|'.join(re.escape(code) for code in sorted(self.allowed_gcodes, key=len, reverse=True))
+        # These match after a newline instead of using ^, because a literal prefix is much faster to search for.
+        self.not_allowed_regex_multiline = re.compile(
+            rb'\n(?!(?:' + allowed + rb')(?:[ \t\r\x0b\x0c]|$)|;|$)([^\n]*)', re.MULTILINE)
+        self.s_search_regex = re.compile(rb'S[0-9]*\.[0-9]')
+        self.s_line_regex_multiline = re.compile(rb'\n([^;\n][^\n]*?S[0-9]*\.[0-9][^\n]*)', re.MULTILINE)
         self.filtered_lines = set()
+        # Optional stages applied to the G-code before translating, e.g. gcode_optimize.GcodeSimplifier.
+        # Each has optimize_chunks(chunks) -> chunks.
+        self.optimizers = []
+        self.begin_stream()
 
     @staticmethod
     def s_replace(match):
         "Remove all fractional decimal places from laser power G1 Snnn parameters."
         return match.group(1)
 
-    def z_match_invert(self, match):
+    def settings(self) -> dict:
+        "Everything that changes the output besides the input, e.g. for cache keys."
+        return {
+            'version': self.VERSION,
+            'material_height_zero_z': self.material_height_zero_z,
+            'lowest_z_height': self.lowest_z_height,
+            'force_material_thickness': self.force_material_thickness,
+            'optimizers': [repr(optimizer) for optimizer in self.optimizers],
+        }
+
+    def translate_z(self, z: float, line=b'') -> float:
         "Invert the Z axis direction and apply the focus distance offset."
-        start, z, _decimal, rest = match.groups()
-
         if self.force_material_thickness is not None:
-            new_z = self.material_height_zero_z - self.force_material_thickness - float(z)
+            new_z = self.material_height_zero_z - self.force_material_thickness - z
         else:
-            new_z = self.material_height_zero_z - float(z)
+            new_z = self.material_height_zero_z - z
         if new_z < 0 or new_z > self.lowest_z_height: # Protect the machine from erroneous calculations
-            raise RuntimeError(f'Z={new_z} outside of allowed range [0...{self.lowest_z_height}]. Original G-code was {match.group(0)}')
-        return start + str(new_z).encode('utf-8') + rest
+            raise RuntimeError(f'Z={new_z} outside of allowed range [0...{self.lowest_z_height}]. Original G-code was {line}')
+        return new_z
+
+    def z_match_invert(self, match):
+        "Replace the Z value of a z_regex match by translate_z()."
+        start, z, _decimal, rest = match.groups()
+        return start + str(self.translate_z(float(z), match.group(0))).encode('utf-8') + rest
     
     def process_line(self, line: bytes) -> bytes:
         line = line.strip()
-        command, *comment = line.split(b';', maxsplit=1)
-        if len(command.strip()) == 0:
-            return line # Only whitespace, pass through unmodified
+        if not line or line[0] == 59: # 59 == ord(';')
+            return line # Only whitespace or comment, pass through unmodified
 
         command = line.split(maxsplit=1)[0]
         if command not in self.allowed_gcodes:
@@ -279,9 +664,11 @@ class GcodeTranslator():
             return b';--' + line # Disallowed line, comment out and mark as filtered
 
         # Lightburn can emit fractional laser power values like S123.4, which confuses the M1 firmware.
-        line = self.s_regex.sub(self.s_replace, line)
+        if b'S' in line:
+            line = self.s_regex.sub(self.s_replace, line)
         # Lightburn has no way to set an offset for material thickness, so we add that offset here.
-        line = self.z_regex.sub(self.z_match_invert, line)
+        if b'Z' in line:
+            line = self.z_regex.sub(self.z_match_invert, line)
         # Lightburn sometimes emits move commands with a feed rate of zero. This hangs the M1 firmware.
         line = line.replace(b' F0', b' F9600')
         # Lightburn emits gcodes like G1 X0.1 I S100, but the I confuses the M1.
@@ -289,31 +676,264 @@ class GcodeTranslator():
         return line
 
     def is_already_processed(self, gcode: bytes) -> bool:
-        return b'XTM1_HEADER_START' in gcode[0:1024]
+        return b'XTM1_HEADER_START' in gcode[0:self.HEADER_CHECK_SIZE]
 
     def translate_file_content(self, gcode: bytes) -> bytes:
         if self.is_already_processed(gcode):
             return gcode
-        new_lines = [
-            self.process_line(line) 
-            for line in gcode.split(b'\n')
-        ]
-        return self.START_GCODE + b'\n'.join(new_lines) + self.END_GCODE
+        if self.optimizers:
+            return b''.join(self.translate_chunks([gcode]))
+        return self.START_GCODE + self._translate_block(gcode) + self.END_GCODE
+
+    def _translate_block(self, block: bytes) -> bytes:
+        """Translate newline-separated lines. The result has the same number of lines as the input.
+
+        This applies the steps of process_line() to the whole block with multiline regexes,
+        which avoids the Python overhead per line. If anything unusual shows up (unknown
+        G-codes, invalid Z values, replacement patterns inside comments), the block is
+        translated again line by line, so results and exceptions are exactly the same.
+        """
+        if not metrics.enabled:
+            return self._translate_lines(block)
+        metrics.count('xtm1_translated_bytes_total', len(block))
+        metrics.count('xtm1_translated_lines_total', block.count(b'\n') + 1)
+        with metrics.span('xtm1_translate_seconds'):
+            return self._translate_lines(block)
+
+    def _translate_lines(self, block: bytes) -> bytes:
+        "The work of _translate_block(), without the metrics."
+        filtered = []
+        def filter_line(match):
+            line = match.group(1)
+            if line.split(maxsplit=1)[0] not in self.rejectable_gcodes and line not in self.rejectable_gcodes:
+                raise UnexpectedGcodeError(line)
+            filtered.append(line)
+            return b'\n;--' + line # Disallowed line, comment out and mark as filtered
+
+        result = b'\n' + block # So that every line, including the first one, starts after a newline
+        try:
+            if (b'\r' in result or b'\t' in result or b'\x0b' in result or b'\x0c' in result
+                    or b' \n' in result or b'\n ' in result or result.endswith(b' ')):
+                result = self.strip_regex_multiline.sub(b'', result)
+            result = self.not_allowed_regex_multiline.sub(filter_line, result)
+            if self.s_search_regex.search(result):
+                result = self.s_line_regex_multiline.sub(
+                    lambda match: b'\n' + self.s_regex.sub(self.s_replace, match.group(1)), result)
+            if b'Z' in result:
+                result = self._invert_z_lines(result)
+            if self._has_replacement_in_comment(result):
+                raise ValueError('F0 or I inside a comment, which process_line() would not replace')
+        except Exception:
+            return b'\n'.join([self.process_line(line) for line in block.split(b'\n')])
+        self.filtered_lines.update(filtered)
+        return result[1:].replace(b' F0', b' F9600').replace(b' I ', b' ')
+
+    def _invert_z_lines(self, block: bytes) -> bytes:
+        "Apply z_regex to every line of block that contains a Z. Usually there are only a few of them."
+        parts = []
+        done = 0
+        z = block.find(b'Z')
+        while z >= 0:
+            start = block.rfind(b'\n', 0, z) + 1
+            end = block.find(b'\n', z)
+            if end < 0:
+                end = len(block)
+            parts.append(block[done:start])
+            parts.append(self.z_regex.sub(self.z_match_invert, block[start:end]))
+            done = end
+            z = block.find(b'Z', end)
+        parts.append(block[done:])
+        return b''.join(parts)
+
+    @staticmethod
+    def _has_replacement_in_comment(block: bytes) -> bool:
+        "Check whether a comment line contains text that the F0 or I replacement would modify."
+        if b' F0' not in block and b' I ' not in block:
+            return False
+        start = block.find(b';')
+        while start >= 0:
+            end = block.find(b'\n', start)
+            if end < 0:
+                end = len(block)
+            if start == 0 or block[start - 1] == 10: # 10 == ord('\n'), so this is a comment line
+                comment = block[start:end]
+                if b' F0' in comment or b' I ' in comment:
+                    return True
+            start = block.find(b';', end)
+        return False
+
+    def begin_stream(self) -> None:
+        "Start an incremental translation. Feed data with feed() and end it with finish()."
+        self._stream_pending = bytearray()
+        self._stream_passthrough = None # Undecided until HEADER_CHECK_SIZE bytes have been seen
+
+    def feed(self, data: bytes) -> bytes:
+        """Translate the next piece of an input stream and return whatever output is ready.
+
+        Only complete lines are translated, the remainder is kept until more data arrives.
+        Concatenating all return values of feed() and finish() gives exactly the same
+        bytes as translate_file_content() on the whole input.
+        """
+        output = b''
+        if self._stream_passthrough is None:
+            self._stream_pending += data
+            if len(self._stream_pending) < self.HEADER_CHECK_SIZE:
+                return b''
+            output = self._decide_stream_mode()
+            data = b''
+        if self._stream_passthrough:
+            return output + data
+        pending = self._stream_pending
+        pending += data
+        newline = pending.rfind(b'\n')
+        if newline < 0:
+            return output
+        block = bytes(pending[:newline])
+        del pending[:newline + 1]
+        return output + self._translate_block(block) + b'\n'
+
+    def finish(self) -> bytes:
+        "Translate the remaining data of the stream started with begin_stream() and append the footer."
+        output = b''
+        if self._stream_passthrough is None:
+            output = self._decide_stream_mode()
+        if self._stream_passthrough:
+            return output
+        block = bytes(self._stream_pending)
+        self._stream_pending = bytearray()
+        return output + self._translate_block(block) + self.END_GCODE
+
+    def _decide_stream_mode(self) -> bytes:
+        self._stream_passthrough = self.is_already_processed(self._stream_pending)
+        if self._stream_passthrough:
+            head = bytes(self._stream_pending)
+            self._stream_pending = bytearray()
+            return head
+        return self.START_GCODE
+
+    def translate_chunks(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Translate an iterable of byte chunks (split anywhere) into translated byte chunks.
+
+        Input that is already translated passes through unchanged, also with optimizers.
+        """
+        chunks = iter(chunks)
+        head = b''
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= self.HEADER_CHECK_SIZE:
+                break
+        if self.is_already_processed(head):
+            if head:
+                yield head
+            yield from chunks
+            return
+        chunks = itertools.chain([head], chunks)
+        for optimizer in self.optimizers:
+            chunks = optimizer.optimize_chunks(chunks)
+        self.begin_stream()
+        for chunk in chunks:
+            output = self.feed(chunk)
+            if output:
+                yield output
+        yield self.finish()
+
+    def translate_stream(self, in_file: BinaryIO, out_file: BinaryIO) -> None:
+        "Translate from one binary file object to another using bounded memory."
+        chunks = iter(lambda: in_file.read(self.STREAM_CHUNK_SIZE), b'')
+        for output in self.translate_chunks(chunks):
+            out_file.write(output)
 
-    def translate_file(self, filename: str) -> str:
+    @staticmethod
+    def translated_filename(filename: str) -> str:
+        "Name of the translated file, e.g. job.xtm1.gcode for job.gcode."
         parts = filename.split('.')
         parts[-2] = parts[-2] + '.xtm1'
-        new_filename = '.'.join(parts)
+        return '.'.join(parts)
+
+    def translate_file(self, filename: str, processes=1) -> str:
+        """Translate filename into filename.xtm1.gcode and return the new name.
+
+        With processes > 1 (or None for all CPUs), files larger than PARALLEL_THRESHOLD
+        are translated in a process pool. The output is the same as with one process.
+        """
+        new_filename = self.translated_filename(filename)
 
         with open(filename, 'rb') as f:
-            gcode = f.read(1024)
-            if self.is_already_processed(gcode):
+            if self.is_already_processed(f.read(self.HEADER_CHECK_SIZE)):
                 return filename
-            gcode = gcode + f.read()
-        with open(new_filename, 'wb') as f:
-            f.write(self.translate_file_content(gcode))
+            f.seek(0)
+            # Optimizers work on the whole stream, so they can't be split across processes
+            parallel = processes != 1 and not self.optimizers and os.path.getsize(filename) >= self.PARALLEL_THRESHOLD
+            with open(new_filename, 'wb') as out:
+                try:
+                    if parallel:
+                        self._translate_file_parallel(filename, out, processes)
+                    else:
+                        self.translate_stream(f, out)
+                except Exception:
+                    out.close()
+                    os.unlink(new_filename) # Don't leave half-translated files behind
+                    raise
         return new_filename
 
+    def _translate_file_parallel(self, filename: str, out_file: BinaryIO, processes=None) -> None:
+        """Translate chunks of the file in worker processes and write the results in order.
+
+        Errors are raised for the first failing chunk in file order, so the reported
+        line is the same as in a serial translation.
+        """
+        ranges = self._split_file_at_lines(filename, self.PARALLEL_CHUNK_SIZE)
+        processes = processes or os.cpu_count() or 1
+        out_file.write(self.START_GCODE)
+        with ProcessPoolExecutor(processes) as executor:
+            pending = deque()
+            for start, end in ranges:
+                pending.append(executor.submit(_translate_file_range, self, filename, start, end))
+                if len(pending) >= 2 * processes: # Bound the amount of translated data waiting to be written
+                    self._write_parallel_result(pending.popleft(), out_file, pending)
+            while pending:
+                self._write_parallel_result(pending.popleft(), out_file, pending)
+        out_file.write(self.END_GCODE)
+
+    def _write_parallel_result(self, future, out_file: BinaryIO, pending) -> None:
+        try:
+            translated, filtered_lines = future.result()
+        except Exception:
+            for other in pending:
+                other.cancel()
+            raise
+        out_file.write(translated)
+        self.filtered_lines.update(filtered_lines)
+
+    @staticmethod
+    def _split_file_at_lines(filename: str, chunk_size: int) -> list:
+        "Return (start, end) byte ranges of about chunk_size which end after a newline (except the last one)."
+        size = os.path.getsize(filename)
+        ranges = []
+        start = 0
+        with open(filename, 'rb') as f:
+            while start + chunk_size < size:
+                f.seek(start + chunk_size)
+                rest_of_line = f.readline()
+                if not rest_of_line.endswith(b'\n'):
+                    break
+                end = f.tell()
+                ranges.append((start, end))
+                start = end
+        ranges.append((start, size))
+        return ranges
+
+
+def _translate_file_range(translator: 'GcodeTranslator', filename: str, start: int, end: int) -> tuple:
+    "Worker for GcodeTranslator._translate_file_parallel(), returns translated bytes and filtered lines."
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    translator.filtered_lines = set()
+    if data.endswith(b'\n'): # Not the last range, so the newline just separates it from the next one
+        return translator._translate_block(data[:-1]) + b'\n', translator.filtered_lines
+    return translator._translate_block(data), translator.filtered_lines
+
 if __name__ == '__main__':
     m1 = XTM1()
     print(m1.get_status())
@@ -0,0 +1,263 @@
+import asyncio
+import io
+import json
+import os
+import socket
+import tempfile
+import time
+import zipfile
+from typing import Iterable
+
+from xtm1 import IDLE_STATES, UPLOAD_URL, DeviceHTTPError, GcodeTranslator, create_translator, write_zip
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD')
+
+
+class HTTPConnectionPool:
+    """Minimal asyncio HTTP/1.1 client with keep-alive connections to one host and port.
+
+    The M1 only needs simple GET and POST requests, so this avoids depending on an
+    async HTTP library. Bodies are bytes or binary files, which are sent in pieces.
+    Responses may use Content-Length, chunked encoding or close the connection.
+    read_timeout limits each step (sending a piece, reading a line or the body), not
+    the whole request, so long uploads work as long as they make progress.
+    """
+    SEND_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, host: str, port: int, connect_timeout=10, read_timeout=10, max_idle=4) -> None:
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_idle = max_idle
+        self._idle = [] # (reader, writer) pairs that can be reused
+
+    async def request(self, method: str, url: str, body=b'', headers=None) -> tuple:
+        """Send a request and return (status code, response body).
+
+        If a reused connection fails, only GET requests are repeated on a new one: the device
+        may have received a POST before closing, and running an upload or command twice is worse
+        than an error.
+        """
+        connection = self._pop_idle()
+        if connection is not None:
+            try:
+                return await self._request_on(connection, method, url, body, headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if method not in IDEMPOTENT_METHODS:
+                    raise
+                # The device closed the idle connection, try again with a new one
+        connection = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.connect_timeout)
+        # With a small send buffer, drain() waits for the device instead of the kernel taking megabytes
+        connection[1].get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.SEND_CHUNK_SIZE)
+        return await self._request_on(connection, method, url, body, headers)
+
+    def _pop_idle(self):
+        "An idle connection that the device has not closed yet, or None."
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        return None
+
+    async def _request_on(self, connection, method, url, body, headers) -> tuple:
+        reader, writer = connection
+        try:
+            status, response, keep_alive = await self._exchange(reader, writer, method, url, body, headers or {})
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive and len(self._idle) < self.max_idle:
+            self._idle.append(connection)
+        else:
+            writer.close()
+        return status, response
+
+    async def _exchange(self, reader, writer, method, url, body, headers) -> tuple:
+        def timed(step):
+            return asyncio.wait_for(step, self.read_timeout)
+        if isinstance(body, (bytes, bytearray)):
+            length = len(body)
+            body = io.BytesIO(body)
+        else:
+            length = os.fstat(body.fileno()).st_size - body.tell()
+        lines = [f'{method} {url} HTTP/1.1', f'Host: {self.host}:{self.port}', f'Content-Length: {length}']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        for chunk in iter(lambda: body.read(self.SEND_CHUNK_SIZE), b''):
+            writer.write(chunk)
+            await timed(writer.drain())
+        await timed(writer.drain())
+
+        version, status, *_reason = (await timed(reader.readuntil(b'\r\n'))).decode('latin-1').split(maxsplit=2)
+        response_headers = {}
+        while True:
+            line = await timed(reader.readuntil(b'\r\n'))
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        connection_header = response_headers.get('connection', '').lower()
+        keep_alive = connection_header != 'close' if version == 'HTTP/1.1' else connection_header == 'keep-alive'
+        if 'chunked' in response_headers.get('transfer-encoding', '').lower():
+            response = await timed(self._read_chunked(reader))
+        elif 'content-length' in response_headers:
+            response = await timed(reader.readexactly(int(response_headers['content-length'])))
+        else:
+            response = await timed(reader.read()) # Body ends when the device closes the connection
+            keep_alive = False
+        return int(status), response, keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader) -> bytes:
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            if size == 0:
+                while await reader.readuntil(b'\r\n') != b'\r\n':
+                    pass # Skip trailers
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2) # \r\n after each chunk
+
+    def close(self) -> None:
+        for _reader, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+class AsyncXTM1:
+    """asyncio counterpart of XTM1.
+
+    All requests of one instance share a semaphore which limits the number of requests
+    in flight. Pass the same semaphore to several instances to limit the total load
+    across machines.
+    """
+    def __init__(self, IP='201.234.3.1', connect_timeout=10, read_timeout=10, max_concurrency=4, semaphore=None,
+                 compression=zipfile.ZIP_STORED, compresslevel=None) -> None:
+        self.IP = IP
+        self.PORT = 8080
+        self.CAMERA_PORT = 8329
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+        self.tool_type = None # Last tool type set with set_tool_type()
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.status_max_age = 1.0 # Uploads reuse a status reply up to this age, see XTM1
+        self.last_status = None # (time.monotonic() of the reply, status dict)
+        self._pools = {}
+
+    async def close(self) -> None:
+        for pool in self._pools.values():
+            pool.close()
+        self._pools.clear()
+
+    async def __aenter__(self) -> 'AsyncXTM1':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def get_status(self) -> dict:
+        reply = await self._get_request('/cnc/status')
+        status = json.loads(reply.decode('utf-8'))
+        self.last_status = (time.monotonic(), status)
+        return status
+
+    def cached_status(self, max_age: float):
+        last_status = self.last_status
+        if last_status is not None and time.monotonic() - last_status[0] <= max_age:
+            return last_status[1]
+        return None
+
+    async def is_idle(self, max_age=0.0) -> bool:
+        status = self.cached_status(max_age) or await self.get_status()
+        return status['STATUS'] in IDLE_STATES
+
+    async def stop(self):
+        try:
+            return await self._get_request('/cnc/data?action=stop')
+        finally:
+            self.last_status = None # The state changes
+
+    async def set_laserpointer(self, on: bool):
+        return await self.execute_gcode_command('M18 S255' if on else 'M18 S0')
+
+    async def measure_thickness(self) -> float:
+        reply = await self._get_request('/camera?focus=9007199254740991,9007199254740991,0,0', port=self.CAMERA_PORT)
+        return float(json.loads(reply)['measure'])
+
+    async def get_camera_image(self) -> bytes:
+        return await self._get_request('/snap?stream=0', port=self.CAMERA_PORT)
+
+    async def get_camera_calibration(self) -> bytes:
+        return await self._get_request('/file?action=download&filename=points.json')
+
+    async def set_light_brightness(self, brightness):
+        brightness = max(0, min(int(brightness), 255))
+        return await self.execute_gcode_command(f'M13 S{brightness}')
+
+    async def execute_gcode_command(self, gcode):
+        timestamp = int(time.time() * 1000)
+        gcode = gcode.replace(' ', '%20')
+        try:
+            return await self._get_request(f'/cnc/cmd?cmd={gcode}&t={timestamp}')
+        finally:
+            self.last_status = None # The command may change the state
+
+    async def upload_gcode_file(self, filename, material_thickness=None):
+        "Upload a G-code file, which is read, translated and zipped piece by piece like XTM1 does."
+        with open(filename, 'rb') as f:
+            chunks = iter(lambda: f.read(GcodeTranslator.STREAM_CHUNK_SIZE), b'')
+            return await self._upload_chunks(chunks, material_thickness)
+
+    async def upload_gcode(self, gcode, material_thickness=None, tool_type='Laser'):
+        size = GcodeTranslator.STREAM_CHUNK_SIZE
+        chunks = (gcode[i:i + size] for i in range(0, len(gcode), size))
+        return await self._upload_chunks(chunks, material_thickness, tool_type)
+
+    async def _upload_chunks(self, chunks: Iterable[bytes], material_thickness=None, tool_type='Laser'):
+        if not await self.is_idle(self.status_max_age):
+            return False
+        if tool_type != 'Laser':
+            raise NotImplementedError('Only Laser G-code is currently supported, not ' + tool_type)
+        await self.set_tool_type(tool_type)
+        if material_thickness == 'auto':
+            material_thickness = await self.measure_thickness()
+        translator = create_translator(material_thickness)
+        with tempfile.TemporaryFile() as zip_file:
+            # Reading, translating and zipping would block the event loop, so they run in a thread
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, write_zip, translator.translate_chunks(chunks), zip_file,
+                                       self.compression, self.compresslevel)
+            zip_file.seek(0)
+            return await self._post_request(UPLOAD_URL, data=zip_file) # Sent from disk
+
+    async def set_tool_type(self, type='Laser'):
+        reply = await self._post_request('/setprintToolType?type=' + type)
+        self.tool_type = type
+        return reply
+
+    async def _post_request(self, url, port=None, data=b'') -> bytes:
+        headers = { 'Content-Type': 'application/x-www-form-urlencoded' }
+        try:
+            return await self._request('POST', url, port, data, headers)
+        finally:
+            self.last_status = None # Uploads and settings change the state, so the next is_idle() has to ask
+
+    async def _get_request(self, url, port=None) -> bytes:
+        return await self._request('GET', url, port)
+
+    async def _request(self, method, url, port=None, data=b'', headers=None) -> bytes:
+        if port is None: port = self.PORT
+        pool = self._pools.get(port)
+        if pool is None:
+            pool = self._pools[port] = HTTPConnectionPool(self.IP, port, self.connect_timeout, self.read_timeout)
+        async with self.semaphore:
+            status, content = await pool.request(method, url, data, headers)
+        if status != 200:
+            raise DeviceHTTPError(status, f'{method} http://{self.IP}:{port}{url}')
+        return content
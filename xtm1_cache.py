@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'xtm1')
+
+
+def file_digest(filename: str, chunk_size=1024 * 1024) -> str:
+    "SHA-256 of a file, read in chunks."
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranslationCache:
+    """On-disk cache of ready-to-send upload zips, with least-recently-used eviction.
+
+    Entries are keyed by the hash of the untranslated G-code together with everything
+    else that changes the zip: the translator version and settings and the zip
+    compression. The modification time of an entry is its last use.
+    """
+    SUFFIX = '.zip'
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024) -> None:
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(content_digest: str, translator, compression, compresslevel=None) -> str:
+        settings = translator.settings()
+        settings.update(content=content_digest, compression=compression, compresslevel=compresslevel)
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key: str):
+        "Return the path of the cached zip for key and mark it as used, or None."
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    @contextmanager
+    def put(self, key: str):
+        """Context manager giving a binary file to write the zip for key to.
+
+        The entry only becomes visible when the block finishes without an exception.
+        It is never evicted right away, even if it is larger than max_bytes on its own,
+        because the caller is about to read it.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                yield f
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.evict(keep=self.path(key))
+
+    def entries(self) -> list:
+        "(last use, size, path) of all entries, least recently used first."
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def size(self) -> int:
+        return sum(size for _mtime, size, _path in self.entries())
+
+    def evict(self, keep=None) -> None:
+        "Delete least recently used entries, except the one at path keep, until the cache fits into max_bytes."
+        entries = self.entries()
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass # Already evicted by another process
+            total -= size
+
+    def clear(self) -> None:
+        for _mtime, _size, path in self.entries():
+            os.unlink(path)
@@ -1,10 +1,12 @@
+import hashlib
 import io
 import json
 import os
+import tempfile
 import tkinter as tk
-from queue import Queue
-from threading import Thread
-from time import sleep, time
+from itertools import count
+from threading import Condition, Event, Lock, Thread
+from time import perf_counter
 
 import cv2
 import numpy as np
@@ -12,20 +14,81 @@ from PIL import Image, ImageTk
 from scipy import interpolate
 
 from xtm1 import XTM1
+from xtm1_cache import default_cache_dir
 
 
-def undistort(img, calibration_points, target_size) -> Image.Image:
+REMAP_CACHE_DIR = os.path.join(default_cache_dir(), 'remap')
+
+_remap_maps = {} # (calibration hash, size) -> maps for cv2.remap
+_calibration_data = {} # filename -> (modification time, points)
+
+
+def calibration_hash(calibration_points) -> str:
+    return hashlib.sha256(json.dumps(calibration_points, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def compute_remap(calibration_points, target_size, source_scale=1.0) -> np.ndarray:
+    """Source pixel coordinates for each pixel of the undistorted image, as float32 (h, w, 2).
+
+    The calibration points are a 41x31 grid of positions in the full size camera image,
+    which is interpolated to the target size. source_scale is the size of the image
+    that is actually remapped relative to the full size, see decode_jpeg().
+    """
     w, h = target_size
     xs = np.linspace(0, 40, w, dtype='float32')
     ys = np.linspace(0, 30, h, dtype='float32')
-    sample_xy = [[[x,y] for x in xs] for y in ys]
+    sample_xy = np.stack(np.meshgrid(xs, ys), axis=-1)
     grid_x, grid_y = np.arange(41), np.arange(31)
     distorted = np.array([[[p['x'], p['y']] for p in row] for row in calibration_points])
     distorted = np.swapaxes(distorted, 0, 1)
-    x_inter = interpolate.interpn((grid_x, grid_y), distorted, sample_xy)
-    x_inter = np.asarray(x_inter, dtype='float32')
-    img2 = cv2.remap(np.asarray(img), x_inter, None, cv2.INTER_CUBIC)
-    return Image.fromarray(img2)
+    if source_scale != 1.0:
+        distorted = (distorted + 0.5) * source_scale - 0.5
+    return interpolate.interpn((grid_x, grid_y), distorted, sample_xy).astype('float32')
+
+
+def get_remap_maps(calibration_points, target_size, cache_dir=None, source_scale=1.0) -> tuple:
+    """Fixed-point maps for cv2.remap, computed once per calibration and size.
+
+    The maps are kept in memory and in .npy files in cache_dir, which are memory-mapped
+    when loaded again. cache_dir None uses REMAP_CACHE_DIR, False (or REMAP_CACHE_DIR
+    set to None) keeps the maps only in memory.
+    """
+    if cache_dir is None:
+        cache_dir = REMAP_CACHE_DIR
+    cache_dir = cache_dir or None
+    key = (calibration_hash(calibration_points), tuple(target_size), source_scale)
+    maps = _remap_maps.get(key)
+    if maps is not None:
+        return maps
+    if cache_dir is not None:
+        base = os.path.join(cache_dir, f'{key[0]}-{target_size[0]}x{target_size[1]}')
+        if source_scale != 1.0:
+            base += f'-{source_scale:g}'
+        try:
+            maps = np.load(base + '-xy.npy', mmap_mode='r'), np.load(base + '-frac.npy', mmap_mode='r')
+        except (OSError, ValueError):
+            maps = None
+    if maps is None:
+        maps = cv2.convertMaps(compute_remap(calibration_points, target_size, source_scale), None, cv2.CV_16SC2)
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            for suffix, array in zip(('-xy.npy', '-frac.npy'), maps):
+                # A unique name, as other threads and processes may write the same maps at the same time
+                fd, temp_name = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, array)
+                os.replace(temp_name, base + suffix)
+    _remap_maps[key] = maps
+    return maps
+
+
+def undistort_array(img: np.ndarray, calibration_points, target_size, source_scale=1.0) -> np.ndarray:
+    map_xy, map_frac = get_remap_maps(calibration_points, target_size, source_scale=source_scale)
+    return cv2.remap(img, map_xy, map_frac, cv2.INTER_CUBIC)
+
+
+def undistort(img, calibration_points, target_size) -> Image.Image:
+    return Image.fromarray(undistort_array(np.asarray(img), calibration_points, target_size))
 
 
 def get_undistorted_camera_image(m1: XTM1, size) -> Image.Image:
@@ -35,60 +98,187 @@ def get_undistorted_camera_image(m1: XTM1, size) -> Image.Image:
     return undistorted
 
 
-def load_calibration_data(m1: XTM1) -> list:
+def load_calibration_data(m1: XTM1, filename='camera-calibration.json') -> list:
+    "Calibration points from filename, which is downloaded from the M1 if it does not exist."
     try:
-        with open('camera-calibration.json', 'rb') as f:
-            data = f.read()
-    except IOError:
+        mtime = os.stat(filename).st_mtime_ns
+    except OSError:
         data = m1.get_camera_calibration()
-        with open('camera-calibration.json', 'wb') as f:
+        with open(filename, 'wb') as f:
             f.write(data)
-    json_obj = json.loads(data)
-    return json_obj['points']
+        mtime = os.stat(filename).st_mtime_ns
+    cached = _calibration_data.get(filename)
+    if cached is None or cached[0] != mtime:
+        with open(filename, 'rb') as f:
+            cached = _calibration_data[filename] = (mtime, json.loads(f.read())['points'])
+    return cached[1]
+
+
+
+def decode_jpeg(data: bytes, size) -> tuple:
+    """Decode a JPEG image at the smallest DCT scale (1/2, 1/4 or 1/8) that is still at least size.
+
+    Returns the image and its scale relative to the full image size.
+    """
+    img = Image.open(io.BytesIO(data))
+    full_width = img.size[0]
+    img.draft('RGB', size)
+    img.load()
+    return img, img.size[0] / full_width
+
+
+class LatestFrame:
+    "Holds the newest frame only. Older frames are dropped instead of blocking the producers."
+    def __init__(self) -> None:
+        self.condition = Condition()
+        self.frame = None
+        self.sequence = -1
+        self.dropped = 0
+
+    def put(self, frame, sequence: int) -> bool:
+        "Store frame unless a newer one is already there. Returns whether it was stored."
+        with self.condition:
+            if sequence <= self.sequence:
+                self.dropped += 1
+                return False
+            if self.frame is not None:
+                self.dropped += 1 # Never displayed
+            self.frame = frame
+            self.sequence = sequence
+            self.condition.notify_all()
+            return True
 
+    def take(self, timeout=None):
+        "Remove and return the newest frame, waiting up to timeout seconds for one. None if there is none."
+        with self.condition:
+            if self.frame is None:
+                self.condition.wait(timeout)
+            frame, self.frame = self.frame, None
+            return frame
+
+
+class StageStats:
+    "Number of frames and time spent in one stage of the camera pipeline."
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.count = 0
+        self.seconds = 0.0
+        self.start = perf_counter()
+
+    def add(self, seconds: float) -> None:
+        with self.lock:
+            self.count += 1
+            self.seconds += seconds
+
+    @property
+    def fps(self) -> float:
+        elapsed = perf_counter() - self.start
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def latency_ms(self) -> float:
+        return 1000 * self.seconds / self.count if self.count else 0.0
+
+
+class CameraPipeline:
+    """Fetches, decodes and undistorts camera images in worker threads.
+
+    Each worker fetches a snapshot and then decodes it, so with several workers
+    the next request is already in flight while a frame is being decoded. Frames
+    are numbered in the order their requests were started and only the newest
+    one is kept for display.
+    """
+    def __init__(self, m1: XTM1, size=(1164, 874), calibration_points=None, workers=2) -> None:
+        self.m1 = m1
+        self.size = tuple(size)
+        self.calibration_points = calibration_points
+        self.workers = workers
+        self.latest = LatestFrame()
+        self.stats = {stage: StageStats() for stage in ('fetch', 'decode', 'display', 'latency')}
+        self.errors = 0
+        self._sequence = count()
+        self._sequence_lock = Lock()
+        self._threads = []
+        self._stopping = Event()
+        self._frame_started = None
+
+    def start(self) -> None:
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = Thread(target=self._work, name=f'camera-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def process(self, data: bytes) -> Image.Image:
+        "Decode a JPEG snapshot into a display frame."
+        img, scale = decode_jpeg(data, self.size)
+        if self.calibration_points is None:
+            return img.resize(self.size)
+        return Image.fromarray(undistort_array(np.asarray(img), self.calibration_points, self.size, scale))
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            with self._sequence_lock:
+                sequence = next(self._sequence)
+            started = perf_counter()
+            try:
+                data = self.m1.get_camera_image()
+                fetched = perf_counter()
+                self.stats['fetch'].add(fetched - started)
+                frame = self.process(data)
+            except Exception as e:
+                self.errors += 1
+                print('Error getting or decoding image, waiting 1 second before retrying: ' + str(type(e).__name__))
+                self._stopping.wait(1)
+                continue
+            self.stats['decode'].add(perf_counter() - fetched)
+            self.latest.put((frame, started), sequence)
+
+    def take(self, timeout=None):
+        "The newest frame, or None. Call frame_shown() after displaying it."
+        item = self.latest.take(timeout)
+        if item is None:
+            return None
+        frame, started = item
+        self._frame_started = started
+        return frame
+
+    def frame_shown(self, display_seconds: float) -> None:
+        self.stats['display'].add(display_seconds)
+        self.stats['latency'].add(perf_counter() - self._frame_started)
+
+    def report(self) -> str:
+        fetch, decode, display, latency = (self.stats[stage] for stage in ('fetch', 'decode', 'display', 'latency'))
+        return (f'{display.fps:0.1f} FPS shown, {fetch.fps:0.1f} fetched, {self.latest.dropped} dropped, '
+                f'fetch {fetch.latency_ms:0.0f} ms, decode {decode.latency_ms:0.0f} ms, '
+                f'display {display.latency_ms:0.0f} ms, latency {latency.latency_ms:0.0f} ms')
 
 
 def camera_stream(m1: XTM1, calibration_str=None, size=(1164, 874)):
-    points = load_calibration_data(m1)
+    points = load_calibration_data(m1) if calibration_str else None
+    pipeline = CameraPipeline(m1, size, points)
     root = tk.Tk()
     canvas = tk.Canvas(root, width = size[0], height = size[1])
     canvas.pack()
-    image_id = None
-    image = None
-    image_queue = Queue(1)
-    done = False
-    frame_i = 0
-    def get_image():
-        nonlocal done
-        while not done:
-            try:
-                data = m1.get_camera_image()
-            except Exception as e:
-                print('Error getting image, waiting 1 second before retrying: ' + str(type(e).__name__))
-                sleep(1)
-            else:
-                img = Image.open(io.BytesIO(data))
-                if calibration_str:
-                    img = undistort(img, points, size)
-                    image_queue.put(img)
-                else:
-                    image_queue.put(img.resize(size))
-    get_image_thread: Thread = Thread(target=get_image)
-    get_image_thread.start()
-    start_time = time()
+    photo = ImageTk.PhotoImage('RGB', size)
+    canvas.create_image(0, 0, anchor=tk.NW, image=photo)
     def update_image():
-        nonlocal image_id, image, frame_i
-        if not image_queue.empty():
-            image = ImageTk.PhotoImage(image_queue.get())
-            if image_id is not None: canvas.delete(image_id)
-            image_id = canvas.create_image(0, 0, anchor=tk.NW, image=image)
-            frame_i += 1
-            fps = frame_i / (time() - start_time)
-            root.title(f'Camera, {fps:0.2f} FPS, Frame {frame_i}')
-        root.after(20, update_image)
+        frame = pipeline.take(timeout=0)
+        if frame is not None:
+            started = perf_counter()
+            photo.paste(frame) # Reusing one PhotoImage is cheaper than creating a new one per frame
+            pipeline.frame_shown(perf_counter() - started)
+            root.title('Camera, ' + pipeline.report())
+        root.after(5, update_image)
+    pipeline.start()
     root.after(100, update_image)
     root.mainloop()
-    done = True
-    get_image_thread.join()
+    pipeline.stop()
+    print(pipeline.report())
     return 'Camera stream stopped'
-
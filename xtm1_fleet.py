@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import os
+import time
+from collections import deque
+
+from xtm1 import IDLE_STATES, DeviceHTTPError
+from xtm1_async import AsyncXTM1
+
+
+class Job:
+    def __init__(self, gcode: bytes, name='', material_thickness=None, tool_type='Laser') -> None:
+        self.gcode = gcode
+        self.name = name
+        self.material_thickness = material_thickness
+        self.tool_type = tool_type
+        self.submitted = time.monotonic()
+        self.dispatched = None
+        self.finished = None
+        self.machine = None
+        self.error = None # Why the job failed, see Fleet.failed
+
+    @property
+    def wait_seconds(self) -> float:
+        "Time spent in the queue before being sent to a machine."
+        return (self.dispatched or time.monotonic()) - self.submitted
+
+
+class Machine:
+    """A machine of the fleet, with its last known status and statistics.
+
+    After a job was uploaded, the machine counts as busy until its status has left
+    the idle states and returned to one of them (or until start_timeout passes
+    without the job being started, which fails the job).
+    """
+    def __init__(self, client: AsyncXTM1, name=None) -> None:
+        self.client = client
+        self.name = name or client.IP
+        self.status = None
+        self.error = None
+        self.job = None
+        self.job_started = False
+        self.jobs_done = 0
+        self.bytes_sent = 0
+        self.busy_seconds = 0.0
+        self.created = time.monotonic()
+        self.last_poll = None
+
+    @property
+    def tool_type(self):
+        return getattr(self.client, 'tool_type', None)
+
+    @property
+    def is_available(self) -> bool:
+        return self.job is None and self.error is None and self.status in IDLE_STATES
+
+    def jobs_per_hour(self) -> float:
+        hours = (time.monotonic() - self.created) / 3600
+        return self.jobs_done / hours if hours > 0 else 0.0
+
+
+def _is_retryable(error: Exception) -> bool:
+    "Network errors and HTTP 5xx (e.g. busy or just rebooted) may go away, other errors would happen again."
+    if isinstance(error, DeviceHTTPError):
+        return error.status >= 500
+    return isinstance(error, (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError))
+
+
+class Fleet:
+    """Dispatches queued jobs to whichever machine of the fleet is idle.
+
+    Call run() (or step() repeatedly) in an event loop. Jobs are taken in order,
+    each going to an idle machine that already has the job's tool type set, if
+    there is one. Machines are polled every poll_interval while they run a job or
+    jobs are waiting, otherwise only every idle_poll_interval.
+
+    Jobs that a machine refuses (not idle) or that fail because of network errors or
+    HTTP 5xx responses are put back into the queue. Jobs that fail for other reasons, e.g. G-code that cannot
+    be translated, would fail again, so they go to the failed list. So do jobs that
+    were uploaded but not started within start_timeout.
+    """
+    def __init__(self, poll_interval=1.0, start_timeout=600.0, idle_poll_interval=10.0, log=print) -> None:
+        self.machines = []
+        self.queue = deque()
+        self.finished = []
+        self.failed = []
+        self.log = log
+        self.poll_interval = poll_interval
+        self.idle_poll_interval = idle_poll_interval
+        self.start_timeout = start_timeout
+
+    def add_machine(self, client, name=None) -> Machine:
+        "Add a machine by IP address or AsyncXTM1 client."
+        if isinstance(client, str):
+            client = AsyncXTM1(client)
+        machine = Machine(client, name)
+        self.machines.append(machine)
+        return machine
+
+    def submit(self, gcode: bytes, name='', material_thickness=None, tool_type='Laser') -> Job:
+        job = Job(gcode, name, material_thickness, tool_type)
+        self.queue.append(job)
+        return job
+
+    async def run(self, until_empty=False) -> None:
+        "Poll and dispatch forever, or until all jobs are finished if until_empty is set."
+        while not (until_empty and not self.queue and all(m.job is None for m in self.machines)):
+            await self.step()
+            await asyncio.sleep(self.poll_interval)
+
+    async def step(self) -> None:
+        await asyncio.gather(*(self._poll(machine) for machine in self.machines if self._needs_poll(machine)))
+        await asyncio.gather(*(self._dispatch(job, machine) for job, machine in self._assign_jobs()))
+
+    def _needs_poll(self, machine: Machine) -> bool:
+        if machine.job is not None or self.queue or machine.last_poll is None:
+            return True
+        return time.monotonic() - machine.last_poll >= self.idle_poll_interval
+
+    async def _poll(self, machine: Machine) -> None:
+        machine.last_poll = time.monotonic()
+        try:
+            status = await machine.client.get_status()
+        except Exception as e:
+            machine.error = e
+            return
+        machine.error = None
+        machine.status = status.get('STATUS')
+        job = machine.job
+        if job is None:
+            return
+        if machine.status not in IDLE_STATES:
+            machine.job_started = True
+        elif machine.job_started:
+            job.finished = time.monotonic()
+            machine.busy_seconds += job.finished - job.dispatched
+            machine.jobs_done += 1
+            machine.job = None
+            self.finished.append(job)
+        elif time.monotonic() - job.dispatched > self.start_timeout:
+            # Not requeued, since the machine may still have it and start it later
+            machine.job = None
+            job.error = TimeoutError(f'Job was not started within {self.start_timeout} s')
+            self.failed.append(job)
+            self.log(f'{job.name or "job"}: not started on {machine.name}')
+
+    def _assign_jobs(self) -> list:
+        available = [machine for machine in self.machines if machine.is_available]
+        assignments = []
+        while self.queue and available:
+            job = self.queue.popleft()
+            matching = [machine for machine in available if machine.tool_type == job.tool_type]
+            machine = (matching or available)[0]
+            available.remove(machine)
+            machine.job = job
+            machine.job_started = False
+            assignments.append((job, machine))
+        return assignments
+
+    async def _dispatch(self, job: Job, machine: Machine) -> None:
+        job.dispatched = time.monotonic()
+        job.machine = machine
+        try:
+            result = await machine.client.upload_gcode(job.gcode, job.material_thickness, job.tool_type)
+        except Exception as e:
+            if not _is_retryable(e):
+                machine.job = None
+                job.error = e
+                self.failed.append(job)
+                self.log(f'{job.name or "job"}: failed on {machine.name}: {e!r}')
+                return
+            result = False
+            machine.error = e
+        if result is False: # Machine was not idle after all or not reachable, so put the job back to the front
+            machine.job = None
+            job.dispatched = None
+            job.machine = None
+            self.queue.appendleft(job)
+            return
+        machine.bytes_sent += len(job.gcode)
+
+    def report(self) -> str:
+        lines = []
+        for m in self.machines:
+            state = f'error {m.error!r}' if m.error else m.status
+            job = f'job {m.job.name!r}' if m.job else 'no job'
+            lines.append(f'{m.name}: {state}, {job}, {m.jobs_done} done ({m.jobs_per_hour():.1f}/h), '
+                         f'busy {m.busy_seconds:.0f} s, {m.bytes_sent} bytes sent')
+        waits = [job.wait_seconds for job in self.finished] + [job.wait_seconds for job in self.queue]
+        average_wait = sum(waits) / len(waits) if waits else 0.0
+        lines.append(f'{len(self.queue)} jobs queued, {len(self.finished)} finished, {len(self.failed)} failed, '
+                     f'average queue wait {average_wait:.1f} s')
+        return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Send G-code files to whichever xTool M1 is idle.')
+    parser.add_argument('--ip', action='append', required=True, help='IP address of a machine (can be repeated)')
+    parser.add_argument('--interval', type=float, default=2.0, help='Status poll interval in seconds')
+    parser.add_argument('files', nargs='+', help='G-code files to send')
+    args = parser.parse_args()
+
+    async def main():
+        fleet = Fleet(poll_interval=args.interval)
+        for ip in args.ip:
+            fleet.add_machine(ip)
+        for filename in args.files:
+            with open(filename, 'rb') as f:
+                fleet.submit(f.read(), name=os.path.basename(filename))
+        runner = asyncio.create_task(fleet.run(until_empty=True))
+        while not runner.done():
+            print(fleet.report() + '\n')
+            await asyncio.wait([runner], timeout=10)
+        print(fleet.report())
+
+    asyncio.run(main())
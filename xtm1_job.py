@@ -0,0 +1,294 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import BinaryIO, Iterator
+
+import numpy as np
+
+from gcode import GcodeFramer
+from gcode_estimate import JobEstimator, KinematicModel, TimeEstimate, layer_offsets
+from gcode_moves import MoveTable, read_lines
+from xtm1 import GcodeTranslator
+
+MAGIC = b'XTM1JOB\0'
+FORMAT_VERSION = 2
+SUFFIX = '.xtm1job'
+# One record per row of the MoveTable of the source, see MoveTable for the columns.
+# translated_offset is the offset of the line in the translated text. source_Z is the
+# Z value that the translator replaced in the line (NaN if none), which can differ from
+# Z, e.g. with several Z words or a Z in a comment. It is float64, because retranslate()
+# needs exactly the value that the translator parsed.
+RECORD_DTYPE = np.dtype([('offset', '<i8'), ('translated_offset', '<i8'), ('Z', '<f8'), ('source_Z', '<f8'),
+                         ('X', '<f4'), ('Y', '<f4'), ('F', '<f4'), ('S', '<f4'), ('P', '<f4'),
+                         ('code', '<i2'), ('relative', '?')], align=True)
+_preamble = struct.Struct('<8sIQQ') # Magic, format version, header offset and length
+_ALIGNMENT = 64 # Of the sections: preamble, translated text, records, JSON header
+
+
+class JobFile:
+    """A translated and parsed job, opened with mmap.
+
+    Opening only reads the small JSON header, so it takes the same time for any job size.
+    The records (parsed moves) and the translated text are only paged in where they are used.
+    Views of records and table keep the file mapped, so drop them before close().
+    """
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_offset, header_length = _preamble.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f'{filename} is not a job file')
+        if version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f'{filename} has format version {version}, but only {FORMAT_VERSION} is supported')
+        self.header = json.loads(self._mmap[header_offset:header_offset + header_length])
+        self._text_start, text_length = self.header['text']
+        self._text_end = self._text_start + text_length
+        records_offset, rows = self.header['records']
+        self.records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=rows, offset=records_offset)
+
+    def __enter__(self) -> 'JobFile':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.records = None
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __str__(self) -> str:
+        source = self.header['source']
+        bounds = self.bounds
+        lines = [f'{self.filename}: {len(self)} rows from {source["filename"]} ({source["size"]} bytes)']
+        if bounds is not None:
+            (Xmin, Xmax), (Ymin, Ymax) = bounds
+            lines.append(f'Bounds: X{Xmin:.7} Y{Ymin:.7} to X{Xmax:.7} Y{Ymax:.7}')
+        lines.append(str(self.estimate))
+        return '\n'.join(lines)
+
+    @property
+    def table(self) -> MoveTable:
+        "The parsed moves of the source, as views of the records."
+        records = self.records
+        return MoveTable(records['code'], records['relative'], records['offset'],
+                         **{letter: records[letter] for letter in MoveTable.parameters})
+
+    @property
+    def translated_offsets(self) -> np.ndarray:
+        "Offset of the line of each row in the translated text."
+        return self.records['translated_offset']
+
+    @property
+    def translated_size(self) -> int:
+        return self._text_end - self._text_start
+
+    @property
+    def bounds(self):
+        "((Xmin, Xmax), (Ymin, Ymax)) of the area where the laser is active, or None."
+        bounds = self.header['bounds']
+        return None if bounds is None else tuple(tuple(axis) for axis in bounds)
+
+    @property
+    def estimate(self) -> TimeEstimate:
+        estimate = self.header['estimate']
+        return TimeEstimate(estimate['total_ms'], [tuple(layer) for layer in estimate['layers']],
+                            estimate['moves'], estimate['distance'])
+
+    def frame_gcode(self) -> bytes:
+        "G-code that moves around the bounds, like GcodeFramer.calculate_frame_file()."
+        framer = GcodeFramer()
+        if self.bounds is not None:
+            framer.Xminmax, framer.Yminmax = self.bounds
+        return framer.frame_gcode()
+
+    def translator(self) -> GcodeTranslator:
+        "A translator with the settings that the job was translated with."
+        translator = GcodeTranslator()
+        settings = self.header['translator']
+        translator.material_height_zero_z = settings['material_height_zero_z']
+        translator.lowest_z_height = settings['lowest_z_height']
+        translator.force_material_thickness = settings['force_material_thickness']
+        return translator
+
+    def translated_line(self, row: int) -> bytes:
+        start = self._text_start + int(self.records['translated_offset'][row])
+        end = self._mmap.find(b'\n', start, self._text_end)
+        return self._mmap[start:end if end >= 0 else self._text_end]
+
+    def iter_translated(self, chunk_size=1024 * 1024) -> Iterator[bytes]:
+        "The translated text (the output of GcodeTranslator) in chunks."
+        for start in range(self._text_start, self._text_end, chunk_size):
+            yield self._mmap[start:min(start + chunk_size, self._text_end)]
+
+    def translated(self) -> bytes:
+        return self._mmap[self._text_start:self._text_end]
+
+    def write_translated(self, out_file: BinaryIO) -> None:
+        for chunk in self.iter_translated():
+            out_file.write(chunk)
+
+    def retranslate(self, out_file: BinaryIO, material_thickness: float) -> None:
+        """Write the translation for another material thickness.
+
+        Only the lines with Z coordinates differ, so these are rewritten from the stored Z
+        values and everything in between is copied from the translated text. The result is
+        the same as translating the source again with force_material_thickness set.
+        """
+        if self.header['already_processed']:
+            raise ValueError(f'{self.header["source"]["filename"]} was already translated, its Z values are final')
+        translator = self.translator()
+        translator.force_material_thickness = material_thickness
+        records = self.records
+        position = self._text_start
+        for row in np.flatnonzero(~np.isnan(records['source_Z'])):
+            start = self._text_start + int(records['translated_offset'][row])
+            end = self._mmap.find(b'\n', start, self._text_end)
+            end = end if end >= 0 else self._text_end
+            self._copy_text(position, start, out_file)
+            line = self._mmap[start:end]
+            match = translator.z_regex.match(line)
+            if match:
+                new_z = translator.translate_z(float(records['source_Z'][row]), line)
+                line = match.group(1) + str(new_z).encode('utf-8') + match.group(4)
+            out_file.write(line)
+            position = end
+        self._copy_text(position, self._text_end, out_file)
+
+    def _copy_text(self, start: int, end: int, out_file: BinaryIO, chunk_size=1024 * 1024) -> None:
+        for offset in range(start, end, chunk_size):
+            out_file.write(self._mmap[offset:min(offset + chunk_size, end)])
+
+
+class _LineStarts:
+    "Hands out the offsets of consecutive line starts in a region of a buffer, scanning it in chunks."
+    def __init__(self, data, start: int, end: int, chunk_size: int) -> None:
+        self.data = data
+        self.start = start
+        self.position = start # Scanned up to here
+        self.end = end
+        self.chunk_size = chunk_size
+        self.pending = np.array([start], dtype=np.int64) if start < end else np.empty(0, dtype=np.int64)
+
+    def take(self, count: int) -> np.ndarray:
+        "The next count line starts, relative to the start of the region. Missing lines (at the end) are -1."
+        while len(self.pending) < count and self.position < self.end:
+            size = min(self.chunk_size, self.end - self.position)
+            buf = np.frombuffer(self.data, dtype=np.uint8, count=size, offset=self.position)
+            starts = np.flatnonzero(buf == 10) + 1 + self.position
+            self.pending = np.concatenate((self.pending, starts[starts < self.end]))
+            self.position += size
+        taken, self.pending = self.pending[:count], self.pending[count:]
+        return np.concatenate((taken - self.start, np.full(count - len(taken), -1, dtype=np.int64)))
+
+
+def _find_source_z(translator: GcodeTranslator, data: bytes, base: int, line_starts: np.ndarray,
+                   row_offsets: np.ndarray, source_z: np.ndarray) -> None:
+    "Set source_z of the rows whose line has a Z that the translator replaces, to the value it parses."
+    buf = np.frombuffer(data, dtype=np.uint8)
+    z_lines = np.unique(np.searchsorted(line_starts, np.flatnonzero(buf == 90) + base, side='right') - 1) # 90 == ord('Z')
+    if len(z_lines) == 0:
+        return
+    line_ends = np.append(line_starts[1:] - 1, base + len(data))
+    rows = np.searchsorted(row_offsets, line_starts[z_lines])
+    for line, row in zip(z_lines, rows):
+        if row >= len(row_offsets) or row_offsets[row] >= line_ends[line]:
+            continue # Not a row of the table
+        match = translator.z_regex.match(data[line_starts[line] - base:line_ends[line] - base].strip())
+        if match:
+            source_z[row] = float(match.group(2))
+
+
+def job_filename(source_filename: str) -> str:
+    "Name of the job file for a G-code file, e.g. job.xtm1job for job.gcode."
+    return os.path.splitext(source_filename)[0] + SUFFIX
+
+
+def create_job(source_filename: str, filename=None, translator: GcodeTranslator = None,
+               model: KinematicModel = None, chunk_size=16 * 1024 * 1024) -> JobFile:
+    """Translate and parse a G-code file into a job file and open it.
+
+    The source is read twice in pieces of about chunk_size bytes: once for the translation,
+    which is written into the job file, and once for parsing the moves, which are matched
+    with the lines of the translation. Bounds and the time estimate go into the header.
+    """
+    translator = translator or GcodeTranslator()
+    if translator.optimizers:
+        raise ValueError('Job files need the translation to have the same lines as the source, which optimizers change')
+    filename = filename or job_filename(source_filename)
+    with open(source_filename, 'rb') as f:
+        already_processed = translator.is_already_processed(f.read(translator.HEADER_CHECK_SIZE))
+    # Translated lines follow the lines of the source after the header that the translator adds
+    header_lines = 0 if already_processed else translator.START_GCODE.count(b'\n')
+    digest = hashlib.sha256()
+    def source_chunks():
+        for _base, data in read_lines(source_filename, chunk_size):
+            digest.update(data)
+            yield data
+
+    temp_filename = filename + '.tmp'
+    try:
+        with open(temp_filename, 'w+b') as out:
+            out.write(bytes(_ALIGNMENT))
+            for output in translator.translate_chunks(source_chunks()):
+                out.write(output)
+            text_length = out.tell() - _ALIGNMENT
+            out.write(bytes(-out.tell() % _ALIGNMENT))
+            records_offset = out.tell()
+            out.flush()
+
+            framer = GcodeFramer()
+            estimator = JobEstimator(model)
+            rows = 0
+            with mmap.mmap(out.fileno(), 0, access=mmap.ACCESS_READ) as text:
+                translated_lines = _LineStarts(text, _ALIGNMENT, _ALIGNMENT + text_length, chunk_size)
+                translated_lines.take(header_lines)
+                for base, data, table in MoveTable.iter_file(source_filename, np.float64, chunk_size):
+                    buf = np.frombuffer(data, dtype=np.uint8)
+                    line_starts = np.concatenate(([0], np.flatnonzero(buf[:-1] == 10) + 1)) + base
+                    translated = translated_lines.take(len(line_starts))
+                    records = np.zeros(len(table), dtype=RECORD_DTYPE)
+                    for name, column in table.columns().items():
+                        records[name] = column
+                    records['translated_offset'] = translated[np.searchsorted(line_starts, table.offset)]
+                    records['source_Z'] = np.nan
+                    if not already_processed:
+                        _find_source_z(translator, data, base, line_starts, table.offset, records['source_Z'])
+                    out.write(records.tobytes())
+                    rows += len(table)
+                    framer.calculate_frame_table(table)
+                    offsets, names = layer_offsets(data)
+                    estimator.add(table, (offsets + base, names))
+            out.write(bytes(-out.tell() % _ALIGNMENT))
+
+            estimate = estimator.result()
+            has_bounds = framer.Xminmax[0] <= framer.Xminmax[1]
+            header = {
+                'source': {'filename': source_filename, 'size': os.path.getsize(source_filename), 'sha256': digest.hexdigest()},
+                'translator': translator.settings(),
+                'already_processed': already_processed,
+                'text': [_ALIGNMENT, text_length],
+                'records': [records_offset, rows],
+                'bounds': [framer.Xminmax, framer.Yminmax] if has_bounds else None,
+                'estimate': {'total_ms': estimate.total_ms, 'layers': estimate.layers,
+                             'moves': estimate.moves, 'distance': estimate.distance},
+                'model': repr(estimator.model),
+            }
+            header_data = json.dumps(header).encode('utf-8')
+            header_offset = out.tell()
+            out.write(header_data)
+            out.seek(0)
+            out.write(_preamble.pack(MAGIC, FORMAT_VERSION, header_offset, len(header_data)))
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.unlink(temp_filename)
+        raise
+    return JobFile(filename)
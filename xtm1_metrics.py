@@ -0,0 +1,218 @@
+"""Counters and timing spans of the hot paths, exported as a Prometheus text file or JSON lines.
+
+Metrics are off by default; call sites then only check metrics.enabled (or get a shared
+no-op span). Set the environment variable XTM1_METRICS to a file name to switch them on
+for any of the scripts: the file is rewritten every XTM1_METRICS_INTERVAL seconds (default 10)
+and at exit, as JSON lines if the name ends with .jsonl and in Prometheus text format otherwise
+(e.g. for the textfile collector of node_exporter). Child processes do not export.
+"""
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_NO_SPAN = nullcontext()
+
+
+class Histogram:
+    "Counts of observations in cumulative buckets, like a Prometheus histogram."
+    def __init__(self, buckets=DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets) + (math.inf,)
+        self.counts = [0] * len(self.buckets) # Not cumulative, see cumulative()
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list:
+        "(upper bound, number of observations <= bound) for all buckets"
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class Span:
+    "Times a with block and observes the seconds in a histogram, also when the block raises."
+    def __init__(self, metrics: 'Metrics', name: str, labels: dict) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> 'Span':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+class Metrics:
+    """A registry of counters and histograms with labels.
+
+    Names follow the Prometheus conventions: counters end with _total, durations are in
+    seconds. Updates are thread-safe.
+    """
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS) -> None:
+        self.enabled = enabled
+        self.buckets = buckets
+        self.counters = {} # (name, sorted label items) -> value
+        self.histograms = {} # (name, sorted label items) -> Histogram
+        self.help = {} # name -> description
+        self._lock = threading.Lock()
+        self._exporter = None
+
+    def count(self, name: str, value=1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def span(self, name: str, **labels):
+        "Context manager that observes the duration of the block in the histogram name."
+        if not self.enabled:
+            return _NO_SPAN
+        return Span(self, name, labels)
+
+    def describe(self, name: str, text: str) -> None:
+        "Set the HELP text of a metric in the Prometheus export."
+        self.help[name] = text
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def value(self, name: str, **labels):
+        "The value of a counter or the Histogram, or None if nothing was recorded."
+        key = (name, tuple(sorted(labels.items())))
+        return self.counters.get(key, self.histograms.get(key))
+
+    def _snapshot(self) -> tuple:
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((key, (histogram.cumulative(), histogram.sum, histogram.count))
+                                for key, histogram in self.histograms.items())
+        return counters, histograms
+
+    def prometheus_text(self) -> str:
+        "All metrics in the Prometheus text exposition format."
+        counters, histograms = self._snapshot()
+        lines = []
+        def header(name, kind):
+            if name in self.help:
+                lines.append(f'# HELP {name} {self.help[name]}')
+            lines.append(f'# TYPE {name} {kind}')
+        last_name = None
+        for (name, labels), value in counters:
+            if name != last_name:
+                header(name, 'counter')
+                last_name = name
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        for (name, labels), (buckets, total, count) in histograms:
+            if name != last_name:
+                header(name, 'histogram')
+                last_name = name
+            for bound, cumulative in buckets:
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", _format_value(bound)),))} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(total)}')
+            lines.append(f'{name}_count{_format_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def json_lines(self, timestamp=None) -> str:
+        "One JSON object per series and line, all with the same timestamp (seconds since the epoch)."
+        timestamp = time.time() if timestamp is None else timestamp
+        counters, histograms = self._snapshot()
+        lines = [json.dumps({'time': timestamp, 'name': name, 'type': 'counter', 'labels': dict(labels), 'value': value})
+                 for (name, labels), value in counters]
+        lines += [json.dumps({'time': timestamp, 'name': name, 'type': 'histogram', 'labels': dict(labels),
+                              'sum': total, 'count': count,
+                              'buckets': [[_format_value(bound), cumulative] for bound, cumulative in buckets]})
+                  for (name, labels), (buckets, total, count) in histograms]
+        return ''.join(line + '\n' for line in lines)
+
+    def write(self, filename: str) -> None:
+        """Replace filename with the current metrics, as JSON lines if it ends with .jsonl, otherwise as Prometheus text.
+
+        The file is replaced atomically, so collectors never read a half-written file.
+        """
+        text = self.json_lines() if filename.endswith('.jsonl') else self.prometheus_text()
+        temp_filename = f'{filename}.{os.getpid()}.tmp'
+        with open(temp_filename, 'w') as f:
+            f.write(text)
+        os.replace(temp_filename, filename)
+
+    def export(self, filename: str, interval=10.0) -> None:
+        "Enable the metrics and write them to filename every interval seconds and at exit."
+        self.enabled = True
+        if self._exporter is not None:
+            return
+        stop = threading.Event()
+        def run():
+            while not stop.wait(interval):
+                self.write(filename)
+        self._exporter = threading.Thread(target=run, name='metrics-export', daemon=True)
+        self._exporter.start()
+        def at_exit():
+            stop.set()
+            self.write(filename)
+        atexit.register(at_exit)
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _name, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _value), value in zip(labels, escaped)) + '}'
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# The registry that the toolkit reports to
+metrics = Metrics()
+metrics.describe('xtm1_http_request_seconds', 'Duration of HTTP requests to the M1 by endpoint')
+metrics.describe('xtm1_http_responses_total', 'HTTP responses from the M1 by endpoint and status')
+metrics.describe('xtm1_upload_phase_seconds', 'Duration of the phases of uploads')
+metrics.describe('xtm1_upload_bytes_total', 'Bytes of uploaded G-code and of the zip files sent')
+metrics.describe('xtm1_translate_seconds', 'Duration of translating blocks of G-code')
+metrics.describe('xtm1_translated_bytes_total', 'Bytes of G-code translated')
+metrics.describe('xtm1_translated_lines_total', 'Lines of G-code translated')
+metrics.describe('xtm1_stream_read_bytes_total', 'Bytes read by StreamLineReader')
+metrics.describe('xtm1_stream_lines_total', 'Lines returned by StreamLineReader')
+metrics.describe('xtm1_lightburn_lines_total', 'Lines of jobs received from LightBurn')
+metrics.describe('xtm1_lightburn_jobs_total', 'Jobs received from LightBurn')
+metrics.describe('xtm1_lightburn_receive_seconds_total', 'Time spent receiving jobs from LightBurn')
+
+# Child processes (e.g. the workers of translate_file(processes=...)) inherit the environment, but only the
+# process that started the export writes the file. Otherwise the children would overwrite it with their metrics.
+if os.environ.get('XTM1_METRICS') and os.environ.get('XTM1_METRICS_PID', str(os.getpid())) == str(os.getpid()):
+    os.environ['XTM1_METRICS_PID'] = str(os.getpid())
+    metrics.export(os.environ['XTM1_METRICS'], float(os.environ.get('XTM1_METRICS_INTERVAL', 10)))